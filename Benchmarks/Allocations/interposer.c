@@ -0,0 +1,169 @@
+// a heap allocation tracker, for use with `LD_PRELOAD`. it counts the allocations made by
+// the process it is loaded into, and the number of bytes requested, and tracks the peak
+// size of the live heap. when the process exits, it appends a line of the form
+//
+//      <allocations> <bytes> <peak>
+//
+// to the file named by the `ALLOCATIONS_OUTPUT` environment variable, or to standard
+// error if it is not set. `realloc` counts as an allocation, since it may move the block.
+//
+// the interposer forwards to the `__libc_*` entry points, so it only works with glibc.
+#define _GNU_SOURCE
+#include <errno.h>
+#include <fcntl.h>
+#include <malloc.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <unistd.h>
+
+extern void* __libc_malloc(size_t);
+extern void* __libc_calloc(size_t, size_t);
+extern void* __libc_realloc(void*, size_t);
+extern void* __libc_memalign(size_t, size_t);
+extern void  __libc_free(void*);
+
+static uint64_t allocations = 0;
+static uint64_t bytes       = 0;
+// the live heap is measured in usable bytes, because that is all we can recover when a
+// block is freed
+static int64_t  live        = 0;
+static int64_t  peak        = 0;
+
+static void record(void* const block, size_t const requested, size_t const released)
+{
+    __atomic_fetch_add(&allocations, 1, __ATOMIC_RELAXED);
+    __atomic_fetch_add(&bytes, requested, __ATOMIC_RELAXED);
+
+    int64_t const current = __atomic_add_fetch(&live,
+        (int64_t) malloc_usable_size(block) - (int64_t) released, __ATOMIC_RELAXED);
+    int64_t maximum = __atomic_load_n(&peak, __ATOMIC_RELAXED);
+    while (current > maximum &&
+        !__atomic_compare_exchange_n(&peak, &maximum, current, 1, __ATOMIC_RELAXED, __ATOMIC_RELAXED))
+    {
+    }
+}
+static void release(size_t const released)
+{
+    __atomic_sub_fetch(&live, (int64_t) released, __ATOMIC_RELAXED);
+}
+
+void* malloc(size_t const count)
+{
+    void* const block = __libc_malloc(count);
+    if (block != NULL)
+    {
+        record(block, count, 0);
+    }
+    return block;
+}
+void* calloc(size_t const count, size_t const stride)
+{
+    void* const block = __libc_calloc(count, stride);
+    if (block != NULL)
+    {
+        record(block, count * stride, 0);
+    }
+    return block;
+}
+void* realloc(void* const old, size_t const count)
+{
+    // the old block may be gone after the call, so measure it first
+    size_t const released = old != NULL ? malloc_usable_size(old) : 0;
+    void* const block = __libc_realloc(old, count);
+    if (block != NULL)
+    {
+        record(block, count, released);
+    }
+    else if (count == 0)
+    {
+        release(released);
+    }
+    return block;
+}
+void* memalign(size_t const alignment, size_t const count)
+{
+    void* const block = __libc_memalign(alignment, count);
+    if (block != NULL)
+    {
+        record(block, count, 0);
+    }
+    return block;
+}
+void* aligned_alloc(size_t const alignment, size_t const count)
+{
+    return memalign(alignment, count);
+}
+int posix_memalign(void** const result, size_t const alignment, size_t const count)
+{
+    if (alignment % sizeof(void*) != 0 || (alignment & (alignment - 1)) != 0)
+    {
+        return EINVAL;
+    }
+    void* const block = memalign(alignment, count);
+    if (block == NULL)
+    {
+        return ENOMEM;
+    }
+    *result = block;
+    return 0;
+}
+void free(void* const block)
+{
+    if (block == NULL)
+    {
+        return;
+    }
+    release(malloc_usable_size(block));
+    __libc_free(block);
+}
+
+// formats without `printf`, which may allocate
+static char* format(char* end, uint64_t value)
+{
+    do
+    {
+        *--end  = '0' + value % 10;
+        value  /= 10;
+    }
+    while (value != 0);
+    return end;
+}
+
+__attribute__((destructor))
+static void report(void)
+{
+    uint64_t const values[3] =
+    {
+        __atomic_load_n(&allocations, __ATOMIC_RELAXED),
+        __atomic_load_n(&bytes, __ATOMIC_RELAXED),
+        (uint64_t) __atomic_load_n(&peak, __ATOMIC_RELAXED),
+    };
+
+    char line[64];
+    char* const end = line + sizeof(line);
+    char* start     = end;
+    *--start        = '\n';
+    for (int i = 2; i >= 0; --i)
+    {
+        start = format(start, values[i]);
+        if (i > 0)
+        {
+            *--start = ' ';
+        }
+    }
+
+    char const* const path = getenv("ALLOCATIONS_OUTPUT");
+    // a process that starts other processes appends its line after theirs, because it
+    // exits last
+    int const descriptor = path != NULL ? open(path, O_WRONLY | O_CREAT | O_APPEND, 0644) : 2;
+    if (descriptor == -1)
+    {
+        return;
+    }
+    ssize_t const written = write(descriptor, start, end - start);
+    (void) written;
+    if (descriptor != 2)
+    {
+        close(descriptor);
+    }
+}
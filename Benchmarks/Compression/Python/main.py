@@ -0,0 +1,41 @@
+# compresses the filtered scanlines of a png file with zlib, to isolate the cost of
+# deflating the image data. the scanlines keep whatever filters the input file used.
+import sys, time, struct, zlib
+
+def idat(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    chunks  = []
+    i       = 8
+    while i < len(data):
+        length, type = struct.unpack('>I4s', data[i : i + 8])
+        if type == b'IDAT':
+            chunks.append(data[i + 8 : i + 8 + length])
+        i += length + 12
+    return b''.join(chunks)
+
+def main(arguments):
+    if len(arguments) != 4:
+        print('usage: {0} <compression-level:0 ... 9> <image> <trials>'.format(arguments[0]))
+        return -1
+
+    level       = int(arguments[1])
+    if not 0 <= level <= 9:
+        print('fatal error: \'{0}\' is not a valid integer from 0 to 9'.format(arguments[1]))
+        return -1
+
+    scanlines   = zlib.decompress(idat(arguments[2]))
+    times       = []
+    for trial in range(int(arguments[3])):
+        # sleep for 0.1s between runs to emulate a “cold” start
+        time.sleep(0.1)
+        start       = time.process_time()
+        compressed  = zlib.compress(scanlines, level)
+        stop        = time.process_time()
+        times.append(1000 * (stop - start))
+
+    print('{0}, {1}'.format(' '.join(map(str, times)), len(compressed)))
+    return 0
+
+sys.exit(main(sys.argv))
@@ -1,6 +1,7 @@
 // This Source Code Form is subject to the terms of the Mozilla Public
 // License, v. 2.0. If a copy of the MPL was not distributed with this
 // file, You can obtain one at https://mozilla.org/MPL/2.0/.
+import LZ77
 import PNG
 
 #if os(macOS)
@@ -8,6 +9,9 @@ import func Darwin.nanosleep
 import struct Darwin.timespec
 import func Darwin.clock
 import var Darwin.CLOCKS_PER_SEC
+import func Darwin.getrusage
+import struct Darwin.rusage
+import var Darwin.RUSAGE_SELF
 func clock() -> Int
 {
     .init(Darwin.clock())
@@ -18,11 +22,26 @@ import func Glibc.nanosleep
 import struct Glibc.timespec
 import func Glibc.clock
 import var Glibc.CLOCKS_PER_SEC
+import func Glibc.getrusage
+import struct Glibc.rusage
+import var Glibc.RUSAGE_SELF
 func clock() -> Int
 {
     Glibc.clock()
 }
 
+#endif
+
+#if os(macOS) || os(Linux)
+import struct Dispatch.DispatchTime
+
+/// Returns the current wall-clock time, in the same units as ``clock``.
+func wall() -> Int
+{
+    let ticks:UInt64 = .init(CLOCKS_PER_SEC)
+    return .init(DispatchTime.now().uptimeNanoseconds / (1_000_000_000 / ticks))
+}
+
 #else
     #warning("clock() function not imported for this platform, internal benchmarks not built (please open an issue at https://github.com/tayloraswift/swift-png/issues)")
 #endif
@@ -39,6 +58,14 @@ enum Benchmark
             private(set)
             var buffer:[UInt8] = []
         }
+        /// A destination that discards everything written to it, so that the encoded
+        /// image does not count towards the memory usage of the benchmark.
+        struct Sink
+        {
+            private(set)
+            var count:Int = 0,
+                last:UInt8 = 0
+        }
     }
 }
 extension Benchmark.Encode.Blob:PNG.BytestreamDestination
@@ -50,10 +77,23 @@ extension Benchmark.Encode.Blob:PNG.BytestreamDestination
         return ()
     }
 }
+extension Benchmark.Encode.Sink:PNG.BytestreamDestination
+{
+    mutating
+    func write(_ data:[UInt8]) -> Void?
+    {
+        self.count += data.count
+        self.last = data.last ?? self.last
+        return ()
+    }
+}
 extension Benchmark.Encode
 {
     static
-    func rgba8(level:Int, path:String, trials:Int) -> ([(time:Int, hash:Int)], Int)
+    func rgba8(search:LZ77.DeflatorSearch, path:String, trials:Int,
+        destination:String? = nil,
+        threads:Int? = nil,
+        wallclock:Bool = false) -> ([(time:Int, hash:Int)], Int)
     {
         guard let image:PNG.Image = try? .decompress(path: path)
         else
@@ -68,13 +108,171 @@ extension Benchmark.Encode
             nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
             var blob:Blob   = .init()
             do
+            {
+                // `clock()` adds up the processor time of every thread, and does not
+                // include time spent waiting for the file system, so multithreaded
+                // encoding and encoding to a file are measured in wall-clock time instead
+                let now:() -> Int = wallclock || threads != nil || destination != nil ?
+                    wall : clock
+                let start:Int = now()
+
+                if  let destination:String = destination
+                {
+                    guard let _:Void = try image.compress(path: destination, search: search,
+                        threads: threads ?? 1)
+                    else
+                    {
+                        fatalError("could not open file '\(destination)'")
+                    }
+                }
+                else
+                {
+                    try image.compress(stream: &blob, search: search, threads: threads ?? 1)
+                }
+
+                let stop:Int = now()
+
+                guard   let destination:String = destination
+                else
+                {
+                    return (stop - start, blob.buffer.count, .init(blob.buffer.last ?? 0))
+                }
+                guard   let size:Int = System.File.Source.open(path: destination,
+                            { $0.count }) ?? nil
+                else
+                {
+                    fatalError("could not read file '\(destination)'")
+                }
+                return (stop - start, size, 0)
+            }
+            catch let error
+            {
+                fatalError("\(error)")
+            }
+        }
+
+        return (results.map{ (time: $0.time, hash: $0.hash) }, results.map(\.size).min() ?? 0)
+    }
+}
+extension Benchmark.Encode
+{
+    /// Encodes the same image `count` times in a row, as if it were a batch of `count`
+    /// different images, and returns the total processor time of each trial. If
+    /// `reusing` is true, every image in the batch shares one set of
+    /// ``PNG.EncodingBuffers``.
+    static
+    func batch(search:LZ77.DeflatorSearch, path:String, trials:Int, count:Int,
+        reusing:Bool) -> ([(time:Int, hash:Int)], Int)
+    {
+        guard let image:PNG.Image = try? .decompress(path: path)
+        else
+        {
+            fatalError("failed to decode test image '\(path)'")
+        }
+
+        let results:[(time:Int, size:Int, hash:Int)] = (0 ..< trials).map
+        {
+            _ in
+            // sleep for 0.1s between runs to emulate a “cold” start
+            nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
+            var buffers:PNG.EncodingBuffers = .init()
+            var blobs:[Blob] = .init(repeating: .init(), count: count)
+            do
             {
                 let start:Int = clock()
+                for i:Int in blobs.indices
+                {
+                    if  reusing
+                    {
+                        try image.compress(stream: &blobs[i], search: search,
+                            reusing: &buffers)
+                    }
+                    else
+                    {
+                        try image.compress(stream: &blobs[i], search: search)
+                    }
+                }
+                let stop:Int = clock()
 
-                try image.compress(stream: &blob, level: level)
+                let buffer:[UInt8] = blobs.last?.buffer ?? []
+                return (stop - start, buffer.count, .init(buffer.last ?? 0))
+            }
+            catch let error
+            {
+                fatalError("\(error)")
+            }
+        }
+
+        return (results.map{ (time: $0.time, hash: $0.hash) }, results.map(\.size).min() ?? 0)
+    }
+}
+extension Benchmark.Encode
+{
+    /// Encodes a tall image made of `tiles` copies of the image at `path`, stacked on top
+    /// of each other, and returns the processor time of each trial. If `strip` is nil, the
+    /// tall image is assembled in memory and encoded all at once. Otherwise, it is encoded
+    /// with a ``PNG.EncodingContext``, in strips of `strip` rows, and never exists in
+    /// memory all at once. The timings include assembling the image or the strips.
+    static
+    func tiled(search:LZ77.DeflatorSearch, path:String, trials:Int, tiles:Int,
+        strip:Int?) -> ([(time:Int, hash:Int)], Int)
+    {
+        guard let image:PNG.Image = try? .decompress(path: path)
+        else
+        {
+            fatalError("failed to decode test image '\(path)'")
+        }
+
+        let layout:PNG.Layout = .init(format: image.layout.format)
+        let pixels:[PNG.RGBA<UInt16>] = image.unpack(as: PNG.RGBA<UInt16>.self)
+        let size:(x:Int, y:Int) = (image.size.x, image.size.y * tiles)
+
+        let results:[(time:Int, size:Int, hash:Int)] = (0 ..< trials).map
+        {
+            _ in
+            // sleep for 0.1s between runs to emulate a “cold” start
+            nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
+            var sink:Sink = .init()
+            do
+            {
+                let start:Int = clock()
+
+                if  let strip:Int = strip
+                {
+                    var context:PNG.EncodingContext = try .init(stream: &sink,
+                        size: size,
+                        layout: layout,
+                        search: search)
+                    var rows:[PNG.RGBA<UInt16>] = []
+                    for y:Int in stride(from: 0, to: size.y, by: strip)
+                    {
+                        let count:Int = min(strip, size.y - y)
+                        rows.removeAll(keepingCapacity: true)
+                        for row:Int in y ..< y + count
+                        {
+                            let source:Int = row % image.size.y
+                            rows += pixels[source * size.x ..< (source + 1) * size.x]
+                        }
+
+                        try context.push(strip: .init(packing: rows,
+                                size: (x: size.x, y: count),
+                                layout: layout),
+                            stream: &sink)
+                    }
+                    try context.finish(stream: &sink)
+                }
+                else
+                {
+                    let tall:PNG.Image = .init(
+                        packing: [PNG.RGBA<UInt16>].init(
+                            repeatElement(pixels, count: tiles).joined()),
+                        size: size,
+                        layout: layout)
+                    try tall.compress(stream: &sink, search: search)
+                }
 
                 let stop:Int = clock()
-                return (stop - start, blob.buffer.count, .init(blob.buffer.last ?? 0))
+                return (stop - start, sink.count, .init(sink.last))
             }
             catch let error
             {
@@ -86,39 +284,228 @@ extension Benchmark.Encode
     }
 }
 
+extension LZ77.DeflatorSearch
+{
+    /// Parses a compression level (`0` through `13`), or an explicit search specification
+    /// of the form `greedy-<attempts>-<goal>`, `lazy-<attempts>-<goal>`, or
+    /// `full-<attempts>-<goal>-<iterations>`. An attempt count of `max` means unlimited.
+    init?(parsing string:String)
+    {
+        if  let level:Int = .init(string)
+        {
+            guard 0 ... 13 ~= level
+            else
+            {
+                return nil
+            }
+            self.init(level: level)
+            return
+        }
+
+        let components:[Substring] = string.split(separator: "-",
+            omittingEmptySubsequences: false)
+
+        guard   components.count >= 3,
+                let attempts:Int = components[1] == "max" ? Int.max : Int.init(components[1]),
+                let goal:Int = Int.init(components[2]),
+                attempts > 0,
+                3 ... 258 ~= goal
+        else
+        {
+            return nil
+        }
+
+        switch (components[0], components.count)
+        {
+        case ("greedy", 3):
+            self = .greedy(attempts: attempts, goal: goal)
+
+        case ("lazy", 3):
+            self = .lazy(attempts: attempts, goal: goal)
+
+        case ("full", 4):
+            guard   let iterations:Int = Int.init(components[3]),
+                    iterations > 0
+            else
+            {
+                return nil
+            }
+            self = .full(attempts: attempts, goal: goal, iterations: iterations)
+
+        default:
+            return nil
+        }
+    }
+}
+
+/// Removes the option `flag` and its value from `arguments`, and returns the value, which
+/// must be a positive integer.
+func option(_ flag:String, in arguments:inout [String], name:String) -> Int?
+{
+    guard let index:Int = arguments.firstIndex(of: flag)
+    else
+    {
+        return nil
+    }
+    guard   index + 1 < arguments.endIndex,
+            let value:Int = .init(arguments[index + 1]),
+            value > 0
+    else
+    {
+        fatalError("\(name) must be a positive integer")
+    }
+
+    arguments.removeSubrange(index ... index + 1)
+    return value
+}
+
+/// Returns the peak resident set size of this process, in KiB.
+func peak() -> Int
+{
+    var usage:rusage = .init()
+    getrusage(RUSAGE_SELF, &usage)
+    #if os(macOS)
+    return .init(usage.ru_maxrss) >> 10
+    #else
+    return .init(usage.ru_maxrss)
+    #endif
+}
+
 func main() throws
 {
-    guard   CommandLine.arguments.count == 4,
-            let level:Int   = Int.init(CommandLine.arguments[1]),
-            let trials:Int  = Int.init(CommandLine.arguments[3])
+    var arguments:[String] = CommandLine.arguments
+    // `-j <threads>` compresses the image data on multiple threads, and measures
+    // wall-clock time instead of processor time
+    let threads:Int? = option("-j", in: &arguments, name: "thread count")
+    // `-n <images>` encodes the image that many times per trial, and reports the average
+    // time per image. `-r` makes every image in the batch reuse the same buffers
+    let batch:Int? = option("-n", in: &arguments, name: "batch size")
+    let reusing:Bool
+    if  let index:Int = arguments.firstIndex(of: "-r")
+    {
+        reusing = true
+        arguments.remove(at: index)
+    }
+    else
+    {
+        reusing = false
+    }
+    // `-w` measures wall-clock time instead of processor time. encoding to a destination
+    // file is always measured in wall-clock time
+    let wallclock:Bool
+    if  let index:Int = arguments.firstIndex(of: "-w")
+    {
+        wallclock = true
+        arguments.remove(at: index)
+    }
+    else
+    {
+        wallclock = false
+    }
+    // `-v <tiles>` encodes a copy of the image that is `tiles` times as tall, and also
+    // reports the peak memory usage of the process. `-s <rows>` encodes it in strips of
+    // that many rows, without assembling the whole image in memory
+    let tiles:Int? = option("-v", in: &arguments, name: "tile count")
+    let strip:Int? = option("-s", in: &arguments, name: "strip height")
+
+    guard   4 ... 5 ~= arguments.count,
+            let trials:Int  = Int.init(arguments[3])
 
     else
     {
-        fatalError("usage: \(CommandLine.arguments.first ?? "") <compression-level:0 ... 9> <image> <trials>")
+        fatalError("usage: \(arguments.first ?? "") <compression-level:0 ... 13 | search> <image> <trials> [destination] [-j <threads>] [-n <images> [-r]] [-v <tiles>] [-s <rows>] [-w]")
     }
 
-    let path:String = CommandLine.arguments[2]
+    let path:String = arguments[2]
+    // if a destination path is given, the image is encoded to that file instead of memory
+    let destination:String? = arguments.count == 5 ? arguments[4] : nil
 
-    guard 0 ... 13 ~= level
+    guard let search:LZ77.DeflatorSearch = .init(parsing: arguments[1])
     else
     {
-        fatalError("compression level must be an integer from 0 to 13")
+        fatalError("""
+            compression level must be an integer from 0 to 13, or a search specification \
+            of the form 'greedy-<attempts>-<goal>', 'lazy-<attempts>-<goal>', or \
+            'full-<attempts>-<goal>-<iterations>'
+            """)
     }
 
-    #if INTERNAL_BENCHMARKS
-    let (results, size):([(time:Int, hash:Int)], Int) =
-        __Entrypoint.Benchmark.Encode.rgba8(level: level, path: path, trials: trials)
-    #else
-    let (results, size):([(time:Int, hash:Int)], Int) =
-                     Benchmark.Encode.rgba8(level: level, path: path, trials: trials)
-    #endif
+    let results:[(time:Int, hash:Int)]
+    let size:Int
+    if  let batch:Int = batch
+    {
+        guard   destination == nil,
+                threads == nil,
+                tiles == nil,
+                strip == nil
+        else
+        {
+            fatalError("batch mode cannot be combined with a destination, a thread count, or tiling")
+        }
+
+        #if INTERNAL_BENCHMARKS
+        (results, size) = __Entrypoint.Benchmark.Encode.batch(search: search, path: path,
+            trials: trials,
+            count: batch,
+            reusing: reusing)
+        #else
+        (results, size) =              Benchmark.Encode.batch(search: search, path: path,
+            trials: trials,
+            count: batch,
+            reusing: reusing)
+        #endif
+    }
+    else if tiles != nil || strip != nil
+    {
+        guard   destination == nil,
+                threads == nil
+        else
+        {
+            fatalError("tiled mode cannot be combined with a destination or a thread count")
+        }
+
+        #if INTERNAL_BENCHMARKS
+        (results, size) = __Entrypoint.Benchmark.Encode.tiled(search: search, path: path,
+            trials: trials,
+            tiles: tiles ?? 1,
+            strip: strip)
+        #else
+        (results, size) =              Benchmark.Encode.tiled(search: search, path: path,
+            trials: trials,
+            tiles: tiles ?? 1,
+            strip: strip)
+        #endif
+    }
+    else
+    {
+        #if INTERNAL_BENCHMARKS
+        (results, size) = __Entrypoint.Benchmark.Encode.rgba8(search: search, path: path,
+            trials: trials,
+            destination: destination,
+            threads: threads,
+            wallclock: wallclock)
+        #else
+        (results, size) =              Benchmark.Encode.rgba8(search: search, path: path,
+            trials: trials,
+            destination: destination,
+            threads: threads,
+            wallclock: wallclock)
+        #endif
+    }
 
     let string:String = results.map
     {
-        "\(1000.0 * .init($0.time) / .init(CLOCKS_PER_SEC))"
+        "\(1000.0 * .init($0.time) / .init(CLOCKS_PER_SEC) / .init(batch ?? 1))"
     }.joined(separator: " ")
 
-    print("\(string), \(size)")
+    if  tiles != nil || strip != nil
+    {
+        print("\(string), \(size), \(peak())")
+    }
+    else
+    {
+        print("\(string), \(size)")
+    }
 }
 
 try main()
@@ -0,0 +1,36 @@
+# decompresses the IDAT stream of a png file with zlib, without defiltering or converting
+# its pixels, to isolate the cost of inflating the image data
+import sys, time, struct, zlib
+
+def idat(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    chunks  = []
+    i       = 8
+    while i < len(data):
+        length, type = struct.unpack('>I4s', data[i : i + 8])
+        if type == b'IDAT':
+            chunks.append(data[i + 8 : i + 8 + length])
+        i += length + 12
+    return b''.join(chunks)
+
+def main(arguments):
+    if len(arguments) != 3:
+        print('usage: {0} <image> <trials>'.format(arguments[0]))
+        return -1
+
+    stream = idat(arguments[1])
+    times  = []
+    for trial in range(int(arguments[2])):
+        # sleep for 0.1s between runs to emulate a “cold” start
+        time.sleep(0.1)
+        start = time.process_time()
+        zlib.decompress(stream)
+        stop  = time.process_time()
+        times.append(1000 * (stop - start))
+
+    print(' '.join(map(str, times)))
+    return 0
+
+sys.exit(main(sys.argv))
@@ -23,6 +23,18 @@ func clock() -> Int
     Glibc.clock()
 }
 
+#endif
+
+#if os(macOS) || os(Linux)
+import struct Dispatch.DispatchTime
+
+/// Returns the current wall-clock time, in the same units as ``clock``.
+func wall() -> Int
+{
+    let ticks:UInt64 = .init(CLOCKS_PER_SEC)
+    return .init(DispatchTime.now().uptimeNanoseconds / (1_000_000_000 / ticks))
+}
+
 #else
     #warning("clock() function not imported for this platform, internal benchmarks not built (please open an issue at https://github.com/tayloraswift/swift-png/issues)")
 #endif
@@ -34,6 +46,17 @@ enum Benchmark
 {
     enum Decode
     {
+        /// Where the benchmark reads the encoded image from.
+        enum Source:String
+        {
+            /// A buffer that is loaded into memory before the timer starts.
+            case blob
+            /// A file path, read with ``System.File.Source``.
+            case path
+            /// A file path, mapped into memory with ``System.File.Map``.
+            case map
+        }
+
         struct Blob
         {
             private
@@ -83,7 +106,8 @@ extension Benchmark.Decode.Blob:PNG.BytestreamSource
 extension Benchmark.Decode
 {
     static
-    func rgba8(path:String, trials:Int) -> [(time:Int, hash:Int)]
+    func rgba8(path:String, trials:Int, source:Source = .blob,
+        wallclock:Bool = false) -> [(time:Int, hash:Int)]
     {
         guard var blob:Blob = .load(path: path)
         else
@@ -91,6 +115,9 @@ extension Benchmark.Decode
             fatalError("could not read file '\(path)'")
         }
 
+        //  processor time does not include time spent waiting for the file system, so
+        //  the modes that read from a file are always measured in wall-clock time
+        let now:() -> Int = wallclock || source != .blob ? wall : clock
         return (0 ..< trials).map
         {
             _ in
@@ -100,12 +127,34 @@ extension Benchmark.Decode
 
             do
             {
-                let start:Int = clock()
+                let start:Int = now()
+
+                let image:PNG.Image
+                switch source
+                {
+                case .blob:
+                    image = try .decompress(stream: &blob)
+
+                case .path:
+                    guard let decoded:PNG.Image = try .decompress(path: path)
+                    else
+                    {
+                        fatalError("could not read file '\(path)'")
+                    }
+                    image = decoded
 
-                let image:PNG.Image  = try .decompress(stream: &blob)
+                case .map:
+                    guard let decoded:PNG.Image = try System.File.Map.open(path: path,
+                        { try PNG.Image.decompress(stream: &$0) })
+                    else
+                    {
+                        fatalError("could not map file '\(path)'")
+                    }
+                    image = decoded
+                }
                 let pixels:[PNG.RGBA<UInt8>]    = image.unpack(as: PNG.RGBA<UInt8>.self)
 
-                let stop:Int = clock()
+                let stop:Int = now()
                 return (stop - start, .init(pixels.last?.r ?? 0))
             }
             catch let error
@@ -115,26 +164,156 @@ extension Benchmark.Decode
         }
     }
 }
+extension Benchmark.Decode
+{
+    /// Decodes the same image `count` times in a row, as if it were a batch of `count`
+    /// different images, and returns the total processor time of each trial. If
+    /// `reusing` is true, every image in the batch shares one set of
+    /// ``PNG.DecodingBuffers``.
+    static
+    func batch(path:String, trials:Int, count:Int, reusing:Bool) -> [(time:Int, hash:Int)]
+    {
+        guard let blob:Blob = .load(path: path)
+        else
+        {
+            fatalError("could not read file '\(path)'")
+        }
+
+        return (0 ..< trials).map
+        {
+            _ in
+            // sleep for 0.1s between runs to emulate a “cold” start
+            nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
+            var buffers:PNG.DecodingBuffers = .init()
+            var blobs:[Blob] = .init(repeating: blob, count: count)
+            var hash:Int = 0
+            do
+            {
+                let start:Int = clock()
+                for i:Int in blobs.indices
+                {
+                    let image:PNG.Image
+                    if  reusing
+                    {
+                        image = try .decompress(stream: &blobs[i], reusing: &buffers)
+                    }
+                    else
+                    {
+                        image = try .decompress(stream: &blobs[i])
+                    }
+                    let pixels:[PNG.RGBA<UInt8>] = image.unpack(as: PNG.RGBA<UInt8>.self)
+                    hash ^= .init(pixels.last?.r ?? 0)
+                }
+                let stop:Int = clock()
+                return (stop - start, hash)
+            }
+            catch let error
+            {
+                fatalError("\(error)")
+            }
+        }
+    }
+}
 
 func main() throws
 {
-    guard   CommandLine.arguments.count == 3,
-            let trials:Int  = Int.init(CommandLine.arguments[2])
+    var arguments:[String] = CommandLine.arguments
+    // `-n <images>` decodes the image that many times per trial, and reports the average
+    // time per image. `-r` makes every image in the batch reuse the same buffers
+    var batch:Int? = nil
+    if  let index:Int = arguments.firstIndex(of: "-n")
+    {
+        guard   index + 1 < arguments.endIndex,
+                let count:Int = .init(arguments[index + 1]),
+                count > 0
+        else
+        {
+            fatalError("batch size must be a positive integer")
+        }
+
+        batch = count
+        arguments.removeSubrange(index ... index + 1)
+    }
+    let reusing:Bool
+    if  let index:Int = arguments.firstIndex(of: "-r")
+    {
+        reusing = true
+        arguments.remove(at: index)
+    }
+    else
+    {
+        reusing = false
+    }
+    // `-w` measures wall-clock time instead of processor time. the `path` and `map`
+    // sources are always measured in wall-clock time
+    let wallclock:Bool
+    if  let index:Int = arguments.firstIndex(of: "-w")
+    {
+        wallclock = true
+        arguments.remove(at: index)
+    }
+    else
+    {
+        wallclock = false
+    }
+
+    guard   3 ... 4 ~= arguments.count,
+            let trials:Int  = Int.init(arguments[2])
 
     else
     {
-        fatalError("usage: \(CommandLine.arguments.first ?? "") <image> <trials>")
+        fatalError("usage: \(arguments.first ?? "") <image> <trials> [blob | path | map] [-n <images> [-r]] [-w]")
     }
 
-    let path:String = CommandLine.arguments[1]
+    let path:String = arguments[1]
+    let mode:String = arguments.count == 4 ? arguments[3] : "blob"
 
-    #if INTERNAL_BENCHMARKS
-    let times:[Int] = __Entrypoint.Benchmark.Decode.rgba8(path: path, trials: trials).map(\.time)
-    #else
-    let times:[Int] =              Benchmark.Decode.rgba8(path: path, trials: trials).map(\.time)
-    #endif
+    let times:[Int]
+    if  let batch:Int = batch
+    {
+        guard mode == "blob"
+        else
+        {
+            fatalError("batch mode can only read images from 'blob' sources")
+        }
+
+        #if INTERNAL_BENCHMARKS
+        times = __Entrypoint.Benchmark.Decode.batch(path: path, trials: trials,
+            count: batch,
+            reusing: reusing).map(\.time)
+        #else
+        times =              Benchmark.Decode.batch(path: path, trials: trials,
+            count: batch,
+            reusing: reusing).map(\.time)
+        #endif
+    }
+    else
+    {
+        #if INTERNAL_BENCHMARKS
+        guard let source:__Entrypoint.Benchmark.Decode.Source = .init(rawValue: mode)
+        else
+        {
+            fatalError("image source must be one of 'blob', 'path', or 'map'")
+        }
+        times = __Entrypoint.Benchmark.Decode.rgba8(path: path, trials: trials,
+            source: source,
+            wallclock: wallclock).map(\.time)
+        #else
+        guard let source:Benchmark.Decode.Source = .init(rawValue: mode)
+        else
+        {
+            fatalError("image source must be one of 'blob', 'path', or 'map'")
+        }
+        times =              Benchmark.Decode.rgba8(path: path, trials: trials,
+            source: source,
+            wallclock: wallclock).map(\.time)
+        #endif
+    }
 
-    print(times.map{ "\(1000.0 * .init($0) / .init(CLOCKS_PER_SEC))" }.joined(separator: " "))
+    print(times.map
+    {
+        "\(1000.0 * .init($0) / .init(CLOCKS_PER_SEC) / .init(batch ?? 1))"
+    }.joined(separator: " "))
 }
 
 try main()
@@ -69,6 +69,7 @@ let package:Package = .init(name: "swift-png",
 
         .executableTarget(name: "PNGCompressionBenchmarks",
             dependencies: [
+                .target(name: "LZ77"),
                 .target(name: "PNG"),
             ],
             path: "Benchmarks/Compression/Swift"),
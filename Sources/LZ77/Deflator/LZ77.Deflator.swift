@@ -13,12 +13,40 @@ extension LZ77
         public
         init(format:LZ77.Format = .zlib, level:Int, exponent:Int = 15, hint:Int = 1 << 12)
         {
-            self.buffers = .init(format: format, level: level, exponent: exponent, hint: hint)
+            self.init(format: format, search: .init(level: level), exponent: exponent,
+                hint: hint)
+        }
+
+        /// Creates a deflator with explicit match search parameters, instead of the
+        /// predefined parameters for a compression level.
+        public
+        init(format:LZ77.Format = .zlib, search:LZ77.DeflatorSearch, exponent:Int = 15,
+            hint:Int = 1 << 12)
+        {
+            self.buffers = .init(format: format, search: search, exponent: exponent,
+                hint: hint)
         }
     }
 }
 extension LZ77.Deflator
 {
+    /// Discards any input and output buffered in this deflator, and starts a new stream,
+    /// reusing the match window, hash table, and output buffers that were allocated for
+    /// the previous stream.
+    ///
+    /// A deflator that has been reset produces exactly the same output as a newly-created
+    /// deflator with the same parameters. Resetting is much cheaper than creating a new
+    /// deflator when compressing many short streams.
+    ///
+    /// -   Parameter format:
+    ///     The format of the new stream. The window size and search parameters are the
+    ///     same as they were for the previous stream.
+    public mutating
+    func reset(format:LZ77.Format = .zlib)
+    {
+        self.buffers.reset(format: format)
+    }
+
     public mutating
     func push(_ data:ArraySlice<UInt8>, last:Bool = false)
     {
@@ -26,6 +26,15 @@ extension LZ77.DeflatorBuffers
 }
 extension LZ77.DeflatorBuffers.Stream
 {
+    mutating
+    func reset()
+    {
+        self.matches.reset()
+        self.window.reset()
+        self.output.reset()
+        self.input.reset()
+    }
+
     mutating
     func compressBlocks(final:Bool)
     {
@@ -60,6 +69,61 @@ extension LZ77.DeflatorBuffers.Stream
         self.writeBlock(finalType: finalType)
     }
 
+    /// Feeds the first `count` bytes of the input buffer through the window, without
+    /// emitting anything, so that the rest of the input can refer back to them.
+    mutating
+    func prime(count:Int)
+    {
+        //  the window trails the input by 3 bytes, so this consumes 3 bytes beyond the
+        //  dictionary, which are still in the pipeline afterwards.
+        precondition(count >= 3 && self.input.count >= count + 3,
+            "dictionary must be at least 3 bytes long, and followed by at least 3 bytes")
+
+        while self.window.endIndex < 0
+        {
+            self.window.initialize(with: self.input.dequeue())
+        }
+        for _:Int in 0 ..< count
+        {
+            self.window.update(with: self.input.dequeue())
+        }
+    }
+
+    /// Compresses all of the remaining input. If `last` is false, the output ends with a
+    /// non-final block followed by a sync flush, so that it ends on a byte boundary and
+    /// another stream segment can be appended to it.
+    mutating
+    func compressSegment(last:Bool)
+    {
+        if  self.window.endIndex < 0, self.input.count < 3
+        {
+            precondition(last, "only the last segment can be shorter than 3 bytes")
+            self.writeBlock(finalType: .bytes(count: self.input.count))
+            return
+        }
+
+        while let _:Void = self.compress(all: true)
+        {
+            self.writeBlock()
+        }
+
+        self.writeBlock(final: last)
+
+        guard !last
+        else
+        {
+            return
+        }
+        //                 this is an uncompressed block (type = 0)
+        //                ~v
+        self.output.append(0b00_0, count: 3)
+        //                   ^
+        //                   this is not a final block (final = 0)
+        self.output.pad(to: UInt8.self)
+        self.output.append(0x0000, count: 16)
+        self.output.append(0xffff, count: 16)
+    }
+
     private mutating
     func compress(all:Bool) -> Void?
     {
@@ -4,7 +4,7 @@ extension LZ77
     struct DeflatorBuffers<Format> where Format:LZ77.FormatType
     {
         var stream:Stream
-        let format:Format
+        var format:Format
 
         private
         init(format:Format, stream:Stream)
@@ -17,13 +17,11 @@ extension LZ77
 extension LZ77.DeflatorBuffers
 {
     private
-    init(format:Format, exponent:Int, level:Int, hint:Int)
+    init(format:Format, exponent:Int, search:LZ77.DeflatorSearch, hint:Int)
     {
         precondition(8 ..< 16 ~= exponent,
             "exponent cannot be less than 8 or greater than 15")
 
-        let search:LZ77.DeflatorSearch = .init(level: level)
-
         let matches:LZ77.DeflatorMatches
         // match buffer is either a vector of terms, or a directed-graph
         switch search
@@ -42,7 +40,7 @@ extension LZ77.DeflatorBuffers
 }
 extension LZ77.DeflatorBuffers<LZ77.Format>
 {
-    init(format:LZ77.Format, level:Int, exponent:Int, hint:Int)
+    init(format:LZ77.Format, search:LZ77.DeflatorSearch, exponent:Int, hint:Int)
     {
         let header:LZ77.StreamHeader
 
@@ -54,7 +52,7 @@ extension LZ77.DeflatorBuffers<LZ77.Format>
 
         self.init(format: format,
             exponent: header.exponent,
-            level: level,
+            search: search,
             hint: hint)
 
         switch format
@@ -64,6 +62,25 @@ extension LZ77.DeflatorBuffers<LZ77.Format>
         }
     }
 
+    /// Restarts this deflator with a new stream, which may have a different `format`. The
+    /// window size and search parameters are unchanged.
+    mutating
+    func reset(format:LZ77.Format)
+    {
+        self.format = format
+        self.stream.reset()
+
+        switch format
+        {
+        case .zlib:
+            let header:LZ77.StreamHeader = .init(exponent: self.stream.window.exponent)
+            header.write(&self.stream.output)
+
+        case .ios:
+            break
+        }
+    }
+
     mutating
     func push(_ data:ArraySlice<UInt8>, last:Bool)
     {
@@ -92,14 +109,55 @@ extension LZ77.DeflatorBuffers<LZ77.Format>
         self.stream.writeBigEndianUInt32(checksum)
     }
 }
+extension LZ77.DeflatorBuffers<LZ77.Format>
+{
+    /// Compresses one segment of a stream, without a stream header or a checksum. The
+    /// `dictionary` is the input that precedes the segment in the stream, if any.
+    static
+    func segment(_ data:ArraySlice<UInt8>,
+        dictionary:ArraySlice<UInt8>,
+        last:Bool,
+        search:LZ77.DeflatorSearch,
+        exponent:Int,
+        hint:Int) -> [[UInt8]]
+    {
+        var buffers:Self = .init(format: .zlib,
+            exponent: exponent,
+            search: search,
+            hint: hint)
+
+        //  priming the window consumes 3 bytes of the segment itself
+        let primed:Bool = dictionary.count >= 3 && data.count >= 3
+        if  primed
+        {
+            buffers.stream.input.enqueue(contentsOf: dictionary)
+        }
+
+        buffers.stream.input.enqueue(contentsOf: data)
+
+        if  primed
+        {
+            buffers.stream.prime(count: dictionary.count)
+        }
+
+        buffers.stream.compressSegment(last: last)
+
+        var blocks:[[UInt8]] = []
+        while let block:[UInt8] = buffers.pull()
+        {
+            blocks.append(block)
+        }
+        return blocks
+    }
+}
 //  TODO: this currently only supports one member.
 extension LZ77.DeflatorBuffers<Gzip.Format>
 {
-    init(format:Gzip.Format, level:Int, exponent:Int, hint:Int)
+    init(format:Gzip.Format, search:LZ77.DeflatorSearch, exponent:Int, hint:Int)
     {
         self.init(format: format,
             exponent: exponent,
-            level: level,
+            search: search,
             hint: hint)
 
         let header:Gzip.StreamHeader = .init(
@@ -37,6 +37,16 @@ extension LZ77.DeflatorIn
         self.endIndex - self.startIndex
     }
 
+    /// Discards all buffered input and restarts the checksum, without releasing the
+    /// allocated storage.
+    mutating
+    func reset()
+    {
+        self.startIndex = 4
+        self.endIndex = 4
+        self.integral = .init()
+    }
+
     mutating
     func exclude()
     {
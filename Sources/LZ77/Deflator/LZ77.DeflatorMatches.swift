@@ -73,6 +73,17 @@ extension LZ77.DeflatorMatches
         self.depths     = .init()
     }
 
+    /// Discards all stored terms or vertices, and forgets the entropy model learned from
+    /// previous blocks, without releasing the allocated storage.
+    mutating
+    func reset()
+    {
+        self.limit      = min(2048, self.capacity)
+        self.count      = 0
+
+        self.depths     = .init()
+    }
+
     var startIndex:Int
     {
         0
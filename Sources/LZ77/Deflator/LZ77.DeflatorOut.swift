@@ -34,6 +34,15 @@ extension LZ77.DeflatorOut
         self.count >> 3
     }
 
+    /// Discards all buffered output, without releasing the allocated storage.
+    mutating
+    func reset()
+    {
+        self.count = 0
+        self.queue.removeAll(keepingCapacity: true)
+        self.queued = 0
+    }
+
     private static
     func atoms(bytes:Int) -> Int
     {
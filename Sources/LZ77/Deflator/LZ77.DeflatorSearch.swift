@@ -1,15 +1,31 @@
 extension LZ77
 {
-    @frozen @usableFromInline
-    enum DeflatorSearch
+    /// A set of match search parameters for a deflator.
+    ///
+    /// The compression levels accepted by ``Deflator`` and ``Gzip/Deflator`` are shorthands
+    /// for predefined search parameters. You only need to construct search parameters
+    /// explicitly when evaluating settings that the predefined levels do not cover.
+    @frozen public
+    enum DeflatorSearch:Equatable, Sendable
     {
+        /// Emits the longest match found at each position, examining at most `attempts`
+        /// candidates, and stopping early once a match of length `goal` is found.
         case greedy(attempts:Int, goal:Int)
+        /// Like ``greedy(attempts:goal:)``, but defers each match by one position if
+        /// a longer match starts at the next byte.
         case lazy(attempts:Int, goal:Int)
+        /// Records all candidate matches in a graph, and selects the cheapest path
+        /// through it after refining the entropy coding model `iterations` times.
         case full(attempts:Int, goal:Int, iterations:Int)
     }
 }
 extension LZ77.DeflatorSearch
 {
+    /// Returns the search parameters for the given compression level.
+    ///
+    /// Levels below `0` are the same as level `0`, and levels above `13` are the same
+    /// as level `13`.
+    public
     init(level:Int)
     {
         switch level
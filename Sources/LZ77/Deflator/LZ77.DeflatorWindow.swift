@@ -31,6 +31,22 @@ extension LZ77.DeflatorWindow
         self.head       = .init(exponent: exponent)
     }
 
+    /// Empties the window, without releasing the allocated storage.
+    mutating
+    func reset()
+    {
+        self.endIndex   = -3
+        self.w          = 0
+        self.v          = 0
+
+        self.head.clear()
+    }
+
+    var exponent:Int
+    {
+        self.mask.nonzeroBitCount
+    }
+
     private
     subscript(modular:Int) -> Element
     {
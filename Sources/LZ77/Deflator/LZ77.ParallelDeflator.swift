@@ -0,0 +1,269 @@
+//  This Source Code Form is subject to the terms of the Mozilla Public
+//  License, v. 2.0. If a copy of the MPL was not distributed with this
+//  file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+#if canImport(Dispatch)
+import Dispatch
+#endif
+
+extension LZ77
+{
+    /// A deflator that splits its input into segments, and compresses the segments on
+    /// multiple threads at once.
+    ///
+    /// Every segment except the last one ends with a sync flush, which aligns it to a byte
+    /// boundary, so the compressed segments concatenate into a single stream. Each segment
+    /// is primed with the input that precedes it, so matches can still refer back across
+    /// segment boundaries. The output is slightly larger than the output of a ``Deflator``
+    /// with the same search parameters, because the entropy coding tables restart at every
+    /// segment boundary.
+    ///
+    /// This type buffers up to `threads` segments of input at a time, and compresses them
+    /// all at once when the buffer fills up, or when the input ends.
+    @frozen public
+    struct ParallelDeflator
+    {
+        private
+        let format:LZ77.Format,
+            search:LZ77.DeflatorSearch
+        private
+        let exponent:Int,
+            hint:Int,
+            threads:Int,
+            segment:Int
+
+        /// Input that has not been compressed yet.
+        private
+        var input:[UInt8]
+        /// The most recently compressed input, up to one window long.
+        private
+        var dictionary:[UInt8]
+        private
+        var integral:LZ77.MRC32
+        /// The stream header, if it has not been emitted yet.
+        private
+        var header:[UInt8]
+        private
+        var queue:[[UInt8]],
+            queued:Int
+
+        public
+        init(format:LZ77.Format = .zlib, level:Int, exponent:Int = 15, hint:Int = 1 << 12,
+            threads:Int, segment:Int = 1 << 17)
+        {
+            self.init(format: format, search: .init(level: level), exponent: exponent,
+                hint: hint,
+                threads: threads,
+                segment: segment)
+        }
+
+        /// Creates a parallel deflator.
+        ///
+        /// -   Parameter threads:
+        ///     The number of segments to compress at the same time. It must be positive.
+        /// -   Parameter segment:
+        ///     The number of input bytes in each segment. Segments are never shorter than
+        ///     the window size, 2<sup>`exponent`</sup> bytes. The last segment of the
+        ///     stream may be longer than this.
+        public
+        init(format:LZ77.Format = .zlib, search:LZ77.DeflatorSearch, exponent:Int = 15,
+            hint:Int = 1 << 12,
+            threads:Int,
+            segment:Int = 1 << 17)
+        {
+            precondition(8 ..< 16 ~= exponent,
+                "exponent cannot be less than 8 or greater than 15")
+            precondition(threads > 0,
+                "thread count must be positive")
+
+            let header:LZ77.StreamHeader
+            var output:LZ77.DeflatorOut = .init(hint: 16)
+
+            switch format
+            {
+            case .zlib:
+                header = .init(exponent: exponent)
+                header.write(&output)
+
+            case .ios:
+                header = .init(exponent: 15)
+            }
+
+            self.format = format
+            self.search = search
+            self.exponent = header.exponent
+            self.hint = hint
+            self.threads = threads
+            self.segment = max(segment, 1 << header.exponent)
+
+            self.input = []
+            self.dictionary = []
+            self.integral = .init()
+            self.header = output.pull()
+            self.queue = []
+            self.queued = 0
+        }
+    }
+}
+extension LZ77.ParallelDeflator
+{
+    public mutating
+    func push(_ data:ArraySlice<UInt8>, last:Bool = false)
+    {
+        self.input.append(contentsOf: data)
+
+        //  always leave some input behind, because only the last segment can be final
+        let batch:Int = self.segment * self.threads
+        while self.input.count > batch
+        {
+            self.compress(batch, last: false)
+        }
+
+        if  last
+        {
+            self.compress(self.input.count, last: true)
+        }
+    }
+
+    /// Returns a block of compressed data from this deflator, if available. Unlike
+    /// ``Deflator/pull()``, this method never returns an incomplete block, because
+    /// this deflator does not compress any input until it has a full batch.
+    public mutating
+    func pull() -> [UInt8]?
+    {
+        self.pop()
+    }
+
+    /// Removes and returns a complete block of compressed data from this deflator, if
+    /// available.
+    public mutating
+    func pop() -> [UInt8]?
+    {
+        guard self.queued > 0
+        else
+        {
+            return nil
+        }
+
+        let data:[UInt8] = self.queue[self.queue.endIndex - self.queued]
+        self.queued -= 1
+        if  self.queued <= 0
+        {
+            self.queue.removeAll(keepingCapacity: true)
+        }
+        return data
+    }
+}
+extension LZ77.ParallelDeflator
+{
+    private mutating
+    func compress(_ count:Int, last:Bool)
+    {
+        //  the last segment absorbs the remainder, so that no segment is shorter than
+        //  `self.segment`, except when the entire stream is
+        let segments:[Range<Int>] = (0 ..< max(1, count / self.segment)).map
+        {
+            $0 * self.segment ..< ($0 + 1) * self.segment
+        }
+        let input:ArraySlice<UInt8> = self.input[..<count]
+        let window:Int = 1 << self.exponent
+
+        let (search, exponent, hint):(LZ77.DeflatorSearch, Int, Int) =
+            (self.search, self.exponent, self.hint)
+        let dictionary:[UInt8] = self.dictionary
+
+        var results:[(blocks:[[UInt8]], integral:LZ77.MRC32)] = .init(
+            repeating: ([], .init()),
+            count: segments.count)
+
+        results.withUnsafeMutableBufferPointer
+        {
+            let buffer:UnsafeMutableBufferPointer<(blocks:[[UInt8]], integral:LZ77.MRC32)> = $0
+            let work:(Int) -> () =
+            {
+                (i:Int) in
+
+                let data:ArraySlice<UInt8> = i == segments.endIndex - 1 ?
+                    input[segments[i].lowerBound...] :
+                    input[segments[i]]
+
+                var integral:LZ77.MRC32 = .init()
+                data.withUnsafeBufferPointer
+                {
+                    if  let base:UnsafePointer<UInt8> = $0.baseAddress
+                    {
+                        integral.update(from: base, count: $0.count)
+                    }
+                }
+
+                buffer[i] = (LZ77.DeflatorBuffers<LZ77.Format>.segment(data,
+                        dictionary: i == 0 ?
+                            dictionary[...] :
+                            input[segments[i - 1]].suffix(window),
+                        last: last && i == segments.endIndex - 1,
+                        search: search,
+                        exponent: exponent,
+                        hint: hint),
+                    integral)
+            }
+
+            #if canImport(Dispatch)
+            DispatchQueue.concurrentPerform(iterations: buffer.count, execute: work)
+            #else
+            for i:Int in buffer.indices
+            {
+                work(i)
+            }
+            #endif
+        }
+
+        for (i, result):(Int, (blocks:[[UInt8]], integral:LZ77.MRC32)) in results.enumerated()
+        {
+            let length:Int = i == segments.endIndex - 1 ?
+                input.endIndex - segments[i].lowerBound :
+                segments[i].count
+
+            self.integral.combine(with: result.integral, count: length)
+            self.queue.append(contentsOf: result.blocks)
+            self.queued += result.blocks.count
+        }
+
+        self.dictionary = .init(input.suffix(window))
+        self.input.removeFirst(count)
+
+        //  prepend the stream header to the first block, and append the checksum to the
+        //  last block, so that they do not end up in blocks of their own
+        if !self.header.isEmpty, self.queued > 0
+        {
+            self.queue[self.queue.endIndex - self.queued].insert(
+                contentsOf: self.header, at: 0)
+            self.header = []
+        }
+
+        guard last,
+        case .zlib = self.format
+        else
+        {
+            return
+        }
+
+        // checksum is written big-endian
+        let checksum:UInt32 = self.integral.checksum
+        let bytes:[UInt8] = [
+            .init(truncatingIfNeeded: checksum >> 24),
+            .init(truncatingIfNeeded: checksum >> 16),
+            .init(truncatingIfNeeded: checksum >>  8),
+            .init(truncatingIfNeeded: checksum      ),
+        ]
+        if  self.queued > 0
+        {
+            self.queue[self.queue.endIndex - 1].append(contentsOf: bytes)
+        }
+        else
+        {
+            self.queue.append(self.header + bytes)
+            self.queued += 1
+            self.header = []
+        }
+    }
+}
@@ -56,6 +56,17 @@ extension F14.HashTable
         }
     }
 
+    /// Removes all keys from this table, without releasing the allocated storage.
+    func clear()
+    {
+        let districts:Int = self.mask >> 7 + 1
+        self.withUnsafeMutableAlignedBytes
+        {
+            (buffer:UnsafeMutableRawPointer) -> () in
+            buffer.initializeMemory(as: UInt8.self, repeating: 0, count: districts << 7)
+        }
+    }
+
     func find(_ key:UInt32) -> UInt16?
     {
         self.withUnsafeMutableAlignedBytes
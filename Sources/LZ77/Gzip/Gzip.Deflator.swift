@@ -9,7 +9,16 @@ extension Gzip
         public
         init(level:Int, exponent:Int = 15, hint:Int = 1 << 12)
         {
-            self.buffers = .init(format: .gzip, level: level, exponent: exponent, hint: hint)
+            self.init(search: .init(level: level), exponent: exponent, hint: hint)
+        }
+
+        /// Creates a deflator with explicit match search parameters, instead of the
+        /// predefined parameters for a compression level.
+        public
+        init(search:LZ77.DeflatorSearch, exponent:Int = 15, hint:Int = 1 << 12)
+        {
+            self.buffers = .init(format: .gzip, search: search, exponent: exponent,
+                hint: hint)
         }
     }
 }
@@ -21,6 +21,18 @@ extension LZ77.Inflator
         self.buffers = .init(format: format)
         self.state = .initial
     }
+
+    /// Discards any input and output buffered in this inflator, and starts a new stream,
+    /// reusing the buffers that were allocated for the previous stream.
+    ///
+    /// -   Parameter format:
+    ///     The format of the new stream.
+    public mutating
+    func reset(format:LZ77.Format = .zlib)
+    {
+        self.buffers.reset(format: format)
+        self.state = .initial
+    }
 }
 extension LZ77.Inflator
 {
@@ -54,6 +66,17 @@ extension LZ77.Inflator
     {
         self.buffers.stream.pull(count)
     }
+    /// Removes exactly `buffer.count` bytes of decompressed data from the inflator, and
+    /// copies them into `buffer`, which keeps its storage. Returns nil, and removes
+    /// nothing, if fewer bytes than that are available.
+    public mutating
+    func pull(into buffer:inout [UInt8]) -> Void?
+    {
+        buffer.withUnsafeMutableBufferPointer
+        {
+            self.buffers.stream.pull(into: $0)
+        }
+    }
     public mutating
     func pull() -> [UInt8]
     {
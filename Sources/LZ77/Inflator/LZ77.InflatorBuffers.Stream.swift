@@ -35,6 +35,14 @@ extension LZ77.InflatorBuffers
 }
 extension LZ77.InflatorBuffers.Stream
 {
+    mutating
+    func reset()
+    {
+        self.output.reset()
+        self.input.reset()
+        self.b = 0
+    }
+
     mutating
     func push(_ data:ArraySlice<UInt8>)
     {
@@ -47,6 +55,12 @@ extension LZ77.InflatorBuffers.Stream
         return self.output.release(bytes: count)
     }
     mutating
+    func pull(into buffer:UnsafeMutableBufferPointer<UInt8>) -> Void?
+    {
+        self.output.exclude()
+        return self.output.release(into: buffer)
+    }
+    mutating
     func pull() -> [UInt8]
     {
         self.output.exclude()
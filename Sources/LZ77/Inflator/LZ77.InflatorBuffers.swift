@@ -8,7 +8,7 @@ extension LZ77
         var buffer:[Int]
         var stream:Stream
 
-        let format:Format
+        var format:Format
 
         init(format:Format)
         {
@@ -79,6 +79,14 @@ extension LZ77.InflatorBuffers
 }
 extension LZ77.InflatorBuffers<LZ77.Format>
 {
+    /// Restarts these buffers with a new stream, which may have a different `format`.
+    mutating
+    func reset(format:LZ77.Format)
+    {
+        self.format = format
+        self.stream.reset()
+    }
+
     mutating
     func advance(state:LZ77.InflatorState) throws -> LZ77.InflatorState?
     {
@@ -33,6 +33,14 @@ extension LZ77.InflatorIn
         self.bytes << 3
     }
 
+    /// Discards all buffered input, without releasing the allocated storage. The bit
+    /// pointer into this buffer must also be reset to zero.
+    mutating
+    func reset()
+    {
+        self.bytes = 0
+    }
+
     // calculates number of atoms given byte count
     @inline(__always)
     private static
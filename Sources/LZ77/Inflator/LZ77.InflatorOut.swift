@@ -37,6 +37,18 @@ extension LZ77
 }
 extension LZ77.InflatorOut
 {
+    /// Discards all buffered output and restarts the checksum, without releasing the
+    /// allocated storage.
+    mutating
+    func reset()
+    {
+        self.window         = 0
+        self.startIndex     = 0
+        self.currentIndex   = 0
+        self.endIndex       = 0
+        self.integral       = .init()
+    }
+
     mutating
     func exclude()
     {
@@ -92,6 +104,29 @@ extension LZ77.InflatorOut
         }
     }
 
+    /// Copies exactly `buffer.count` bytes into `buffer`, like ``release(bytes:)``, but
+    /// without allocating an array.
+    mutating
+    func release(into buffer:UnsafeMutableBufferPointer<UInt8>) -> Void?
+    {
+        self.storage.withUnsafeMutablePointerToElements
+        {
+            let count:Int = buffer.count
+            guard self.endIndex >= self.currentIndex + count
+            else
+            {
+                return nil
+            }
+
+            buffer.baseAddress?.update(from: $0 + self.currentIndex, count: count)
+
+            let limit:Int       = Swift.max(self.endIndex - self.window, self.startIndex)
+            self.currentIndex  += count
+            self.startIndex     = Swift.min(self.currentIndex, limit)
+            return ()
+        }
+    }
+
     // releases everything
     mutating
     func release() -> [UInt8]
@@ -49,3 +49,21 @@ extension LZ77.MRC32:LZ77.StreamIntegral
     @inlinable
     var checksum:UInt32 { self.double << 16 | self.single }
 }
+extension LZ77.MRC32
+{
+    /// Appends the checksum of another sequence of `count` bytes to this checksum, as if
+    /// the bytes had been integrated after the bytes already integrated into this one.
+    @inlinable mutating
+    func combine(with next:Self, count:Int)
+    {
+        let remainder:Int   = count % 65521
+        let single:Int      = .init(self.single),
+            double:Int      = .init(self.double)
+
+        // both checksums start from `single = 1`, so one of the two initial values has
+        // to be subtracted out of the combined sums
+        self.single = .init((single + .init(next.single) + 65521 - 1) % 65521)
+        self.double = .init((double + .init(next.double) + remainder * single
+            + 65521 - remainder) % 65521)
+    }
+}
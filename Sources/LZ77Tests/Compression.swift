@@ -47,4 +47,138 @@ enum Compression
 
         #expect(input == output)
     }
+
+    @Test(arguments: [
+            LZ77.DeflatorSearch.greedy(attempts: 3, goal: 12),
+            LZ77.DeflatorSearch.lazy(attempts: 50, goal: 258),
+            LZ77.DeflatorSearch.full(attempts: .max, goal: 3, iterations: 1),
+        ],
+        [5, 200, 5000])
+    static func LZ77Search(_ search:LZ77.DeflatorSearch, _ count:Int) throws
+    {
+        //  repetitive input, so that the match search actually finds matches
+        let input:[UInt8] = (0 ..< count).map{ _ in .random(in: 0 ... 3) }
+
+        var deflator:LZ77.Deflator = .init(search: search, exponent: 8, hint: 16)
+            deflator.push(input[...], last: true)
+
+        var compressed:[UInt8] = []
+        while let part:[UInt8] = deflator.pull()
+        {
+            compressed += part
+        }
+
+        var inflator:LZ77.Inflator = .init()
+        try inflator.push(compressed[...])
+
+        let output:[UInt8] = inflator.pull()
+
+        #expect(input == output)
+    }
+
+    @Test(arguments: [1, 3], [5, 200, 5000, 50000])
+    static func LZ77Parallel(_ threads:Int, _ count:Int) throws
+    {
+        //  the smallest possible segments, so that the input spans many of them
+        let input:[UInt8] = (0 ..< count).map{ _ in .random(in: 0 ... 3) }
+
+        var deflator:LZ77.ParallelDeflator = .init(level: 7, exponent: 8, hint: 16,
+            threads: threads,
+            segment: 256)
+        var compressed:[UInt8] = []
+        for chunk:Int in stride(from: 0, to: count, by: 1000)
+        {
+            deflator.push(input[chunk ..< min(chunk + 1000, count)])
+            while let part:[UInt8] = deflator.pop()
+            {
+                compressed += part
+            }
+        }
+        deflator.push([], last: true)
+        while let part:[UInt8] = deflator.pull()
+        {
+            compressed += part
+        }
+
+        var inflator:LZ77.Inflator = .init()
+        try inflator.push(compressed[...])
+
+        let output:[UInt8] = inflator.pull()
+
+        #expect(input == output)
+    }
+
+    @Test(arguments: [
+            LZ77.DeflatorSearch.greedy(attempts: 3, goal: 12),
+            LZ77.DeflatorSearch.lazy(attempts: 50, goal: 258),
+            LZ77.DeflatorSearch.full(attempts: .max, goal: 3, iterations: 1),
+        ])
+    static func LZ77Reset(_ search:LZ77.DeflatorSearch) throws
+    {
+        var deflator:LZ77.Deflator = .init(search: search, exponent: 8, hint: 16)
+        var inflator:LZ77.Inflator = .init()
+
+        for count:Int in [5000, 200, 5, 5000]
+        {
+            let input:[UInt8] = (0 ..< count).map{ _ in .random(in: 0 ... 3) }
+
+            var fresh:LZ77.Deflator = .init(search: search, exponent: 8, hint: 16)
+                fresh.push(input[...], last: true)
+
+            var expected:[UInt8] = []
+            while let part:[UInt8] = fresh.pull()
+            {
+                expected += part
+            }
+
+            deflator.reset()
+            deflator.push(input[...], last: true)
+
+            var compressed:[UInt8] = []
+            while let part:[UInt8] = deflator.pull()
+            {
+                compressed += part
+            }
+
+            //  a reset deflator must not remember anything from the previous stream
+            #expect(compressed == expected)
+
+            inflator.reset()
+            try inflator.push(compressed[...])
+
+            let output:[UInt8] = inflator.pull()
+
+            #expect(input == output)
+        }
+    }
+
+    @Test(arguments: [1, 7, 64, 1000])
+    static func LZ77PullInto(_ stride:Int) throws
+    {
+        let input:[UInt8] = (0 ..< 5000).map{ _ in .random(in: 0 ... 3) }
+
+        var deflator:LZ77.Deflator = .init(level: 7, exponent: 8, hint: 16)
+            deflator.push(input[...], last: true)
+
+        var compressed:[UInt8] = []
+        while let part:[UInt8] = deflator.pull()
+        {
+            compressed += part
+        }
+
+        var inflator:LZ77.Inflator = .init()
+        try inflator.push(compressed[...])
+
+        //  the same buffer is refilled for every pull
+        var buffer:[UInt8] = .init(repeating: 0, count: stride)
+        var output:[UInt8] = []
+        while let _:Void = inflator.pull(into: &buffer)
+        {
+            output += buffer
+        }
+        //  a failed pull leaves the remaining bytes in the inflator
+        output += inflator.pull()
+
+        #expect(input == output)
+    }
 }
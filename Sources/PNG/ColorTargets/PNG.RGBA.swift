@@ -323,11 +323,23 @@ extension PNG.RGBA:PNG.Color
             }
 
         case    .rgb8(palette: _, fill: _, key: nil):
+            if  let pixels:[Self] = Self.unpack(vectorized: interleaved,
+                    depth: 8,
+                    components: 3)
+            {
+                return pixels
+            }
             return PNG.convolve(interleaved, of: UInt8.self, depth: depth)
             {
                 (c:(T, T, T), _)    in .init(c.0, c.1, c.2)
             }
         case    .rgb16(palette: _, fill: _, key: nil):
+            if  let pixels:[Self] = Self.unpack(vectorized: interleaved,
+                    depth: 16,
+                    components: 3)
+            {
+                return pixels
+            }
             return PNG.convolve(interleaved, of: UInt16.self, depth: depth)
             {
                 (c:(T, T, T), _)    in .init(c.0, c.1, c.2)
@@ -352,11 +364,23 @@ extension PNG.RGBA:PNG.Color
             }
 
         case    .rgba8(palette: _, fill: _):
+            if  let pixels:[Self] = Self.unpack(vectorized: interleaved,
+                    depth: 8,
+                    components: 4)
+            {
+                return pixels
+            }
             return PNG.convolve(interleaved, of: UInt8.self, depth: depth)
             {
                 (c:(T, T, T, T)) in .init(c.0, c.1, c.2, c.3)
             }
         case    .rgba16(palette: _, fill: _):
+            if  let pixels:[Self] = Self.unpack(vectorized: interleaved,
+                    depth: 16,
+                    components: 4)
+            {
+                return pixels
+            }
             return PNG.convolve(interleaved, of: UInt16.self, depth: depth)
             {
                 (c:(T, T, T, T)) in .init(c.0, c.1, c.2, c.3)
@@ -477,3 +501,91 @@ extension PNG.RGBA:PNG.Color
         }
     }
 }
+extension PNG.RGBA
+{
+    /// Unpacks 8- or 16-bit RGB or RGBA samples four pixels at a time, if `T` is
+    /// ``UInt8`` or ``UInt16``. Returns nil for every other `T`, or if vectorized
+    /// decoding was disabled at compile time.
+    ///
+    /// This relies on ``RGBA`` being laid out as four consecutive `T` components, in
+    /// declaration order.
+    static
+    func unpack(vectorized interleaved:[UInt8], depth:Int, components:Int) -> [Self]?
+    {
+        #if SCALAR_DECODING
+        return nil
+        #else
+        guard T.self == UInt8.self || T.self == UInt16.self
+        else
+        {
+            return nil
+        }
+
+        let stride:Int = components * (depth >> 3)
+        let count:Int = interleaved.count / stride
+        return interleaved.withUnsafeBytes
+        {
+            (samples:UnsafeRawBufferPointer) -> [Self] in
+
+            .init(unsafeUninitializedCapacity: count)
+            {
+                guard   let source:UnsafeRawPointer = samples.baseAddress,
+                        let destination:UnsafeMutablePointer<Self> = $0.baseAddress
+                else
+                {
+                    $1 = 0
+                    return
+                }
+
+                // one 16-byte load per four 8-bit pixels, one 32-byte load per four
+                // 16-bit pixels
+                let load:Int = depth << 1
+                let output:UnsafeMutableRawPointer = .init(destination)
+                var i:Int = 0
+                while i * stride + load <= samples.count
+                {
+                    let lanes:SIMD16<UInt16> = .init(rgba: source + i * stride,
+                        depth: depth,
+                        components: components)
+                    if  T.self == UInt8.self
+                    {
+                        output.storeBytes(of: SIMD16<UInt8>.init(
+                                truncatingIfNeeded: lanes &>> 8),
+                            toByteOffset: i << 2,
+                            as: SIMD16<UInt8>.self)
+                    }
+                    else
+                    {
+                        output.storeBytes(of: lanes,
+                            toByteOffset: i << 3,
+                            as: SIMD16<UInt16>.self)
+                    }
+                    i += 4
+                }
+
+                func sample(_ offset:Int) -> T
+                {
+                    let value:UInt16 = depth == 8 ?
+                        .init(samples[offset]) &* 257 :
+                        .init(samples[offset]) << 8 | .init(samples[offset + 1])
+                    return .init(truncatingIfNeeded: value &>> (16 - T.bitWidth))
+                }
+
+                let width:Int = depth >> 3
+                while i < count
+                {
+                    let base:Int = i * stride
+                    (destination + i).initialize(to: .init(
+                        sample(base),
+                        sample(base + width),
+                        sample(base + width * 2),
+                        components == 4 ? sample(base + width * 3) : .max))
+                    i += 1
+                }
+
+                $1 = count
+            }
+        }
+        #endif
+    }
+}
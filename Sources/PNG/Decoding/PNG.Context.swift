@@ -1,3 +1,5 @@
+import LZ77
+
 extension PNG
 {
     /// A decoding context.
@@ -12,7 +14,7 @@ extension PNG
         public private(set)
         var image:PNG.Image
 
-        private
+        private(set)
         var decoder:PNG.Decoder
     }
 }
@@ -57,6 +59,22 @@ extension PNG.Context
         palette:PNG.Palette?, background:PNG.Background?, transparency:PNG.Transparency?,
         metadata:PNG.Metadata,
         uninitialized:Bool = true)
+    {
+        self.init(standard: standard, header: header,
+            palette: palette,
+            background: background,
+            transparency: transparency,
+            metadata: metadata,
+            uninitialized: uninitialized,
+            decoder: nil)
+    }
+    /// Creates a fresh decoding context, which resets and reuses the given `decoder` if
+    /// it is not nil.
+    init?(standard:PNG.Standard, header:PNG.Header,
+        palette:PNG.Palette?, background:PNG.Background?, transparency:PNG.Transparency?,
+        metadata:PNG.Metadata,
+        uninitialized:Bool = true,
+        decoder:PNG.Decoder?)
     {
         guard let image:PNG.Image = PNG.Image.init(
             standard:       standard,
@@ -72,8 +90,17 @@ extension PNG.Context
         }
 
         self.image      = image
-        self.decoder    = .init(standard: standard, interlaced: image.layout.interlaced)
+        if  var decoder:PNG.Decoder = decoder
+        {
+            decoder.reset(standard: standard, interlaced: image.layout.interlaced)
+            self.decoder = decoder
+        }
+        else
+        {
+            self.decoder = .init(standard: standard, interlaced: image.layout.interlaced)
+        }
     }
+
     /// Decompresses the contents of an ``Chunk/IDAT`` chunk, and updates
     /// the image state with the newly-decompressed image data.
     /// -   Parameter data:
@@ -14,14 +14,21 @@ extension PNG
         (base: (0, 1), exponent: (0, 1)),
     ]
 
+    @usableFromInline
     struct Decoder
     {
         private
-        var row:(index:Int, reference:[UInt8])?,
+        var row:Int?,
             pass:Int?
+        /// The previous scanline, and storage for the next scanline. They are kept
+        /// between calls to ``push(_:size:pixel:delegate:)``, and between images if the
+        /// decoder is reset, so that decoding does not allocate an array for every
+        /// scanline.
+        private
+        var scanlines:(last:[UInt8], next:[UInt8])
         private(set)
         var `continue`:Void?
-        private
+        private(set)
         var inflator:LZ77.Inflator
     }
 }
@@ -31,16 +38,59 @@ extension PNG.Decoder
     {
         self.row        = nil
         self.pass       = interlaced ? 0 : nil
+        self.scanlines  = ([], [])
         self.continue   = ()
+        self.inflator   = .init(format: Self.format(standard: standard))
+    }
+
+    /// Prepares this decoder for another image, keeping the scanline buffers and the
+    /// inflator buffers it allocated for the previous image.
+    mutating
+    func reset(standard:PNG.Standard, interlaced:Bool)
+    {
+        self.row        = nil
+        self.pass       = interlaced ? 0 : nil
+        self.continue   = ()
+        self.inflator.reset(format: Self.format(standard: standard))
+    }
 
-        let format:LZ77.Format
+    private static
+    func format(standard:PNG.Standard) -> LZ77.Format
+    {
         switch standard
         {
-        case .common:   format = .zlib
-        case .ios:      format = .ios
+        case .common:   return .zlib
+        case .ios:      return .ios
+        }
+    }
+
+    /// Sizes the scanline buffers for a pass whose scanlines (including the filter byte)
+    /// are `count` bytes long, and returns the row to resume the pass from.
+    private mutating
+    func resume(last:inout [UInt8], next:inout [UInt8], count:Int) -> Int
+    {
+        //  the contents of `next` are overwritten before they are read
+        if  next.count < count
+        {
+            next.append(contentsOf: repeatElement(0, count: count - next.count))
+        }
+        else
+        {
+            next.removeLast(next.count - count)
         }
 
-        self.inflator   = .init(format: format)
+        if  let row:Int = self.row
+        {
+            self.row = nil
+            return row
+        }
+        else
+        {
+            //  the first scanline of a pass is filtered against a row of zeros
+            last.removeAll(keepingCapacity: true)
+            last.append(contentsOf: repeatElement(0, count: count))
+            return 0
+        }
     }
 
     mutating
@@ -56,6 +106,15 @@ extension PNG.Decoder
 
         self.continue = try self.inflator.push(data[...])
 
+        //  move the scanline buffers out of `self`, so that they are uniquely referenced
+        var last:[UInt8] = self.scanlines.last,
+            next:[UInt8] = self.scanlines.next
+        self.scanlines = ([], [])
+        defer
+        {
+            self.scanlines = (last, next)
+        }
+
         let delay:Int   = (pixel.volume + 7) >> 3
         if let pass:Int = self.pass
         {
@@ -80,62 +139,57 @@ extension PNG.Decoder
                 }
 
                 let pitch:Int = (subimage.x * pixel.volume + 7) >> 3
-                var (start, last):(Int, [UInt8]) = self.row ??
-                    (0, .init(repeating: 0, count: pitch + 1))
-                self.row = nil
+                let start:Int = self.resume(last: &last, next: &next, count: pitch + 1)
                 for y:Int in start ..< subimage.y
                 {
-                    guard var scanline:[UInt8] = self.inflator.pull(last.count)
+                    guard let _:Void = self.inflator.pull(into: &next)
                     else
                     {
-                        self.row  = (y, last)
+                        self.row  = y
                         self.pass = z
                         return self.continue
                     }
 
                     #if DUMP_FILTERED_SCANLINES
-                    print("< scanline(\(scanline[0]))[\(scanline.dropFirst().prefix(8).map(String.init(_:)).joined(separator: ", ")) ... ]")
+                    print("< scanline(\(next[0]))[\(next.dropFirst().prefix(8).map(String.init(_:)).joined(separator: ", ")) ... ]")
                     #endif
 
-                    Self.defilter(&scanline, last: last, delay: delay)
+                    Self.defilter(&next, last: last, delay: delay)
 
                     let base:(x:Int, y:Int) = (base.x, base.y + y * stride.y)
-                    try scanline.dropFirst().withUnsafeBufferPointer
+                    try next.dropFirst().withUnsafeBufferPointer
                     {
                         try delegate($0, base, stride)
                     }
 
-                    last = scanline
+                    swap(&last, &next)
                 }
             }
         }
         else
         {
             let pitch:Int = (size.x * pixel.volume + 7) >> 3
-
-            var (start, last):(Int, [UInt8]) = self.row ??
-                (0, .init(repeating: 0, count: pitch + 1))
-            self.row = nil
+            let start:Int = self.resume(last: &last, next: &next, count: pitch + 1)
             for y:Int in start ..< size.y
             {
-                guard var scanline:[UInt8] = self.inflator.pull(last.count)
+                guard let _:Void = self.inflator.pull(into: &next)
                 else
                 {
-                    self.row  = (y, last)
+                    self.row  = y
                     return self.continue
                 }
 
                 #if DUMP_FILTERED_SCANLINES
-                print("< scanline(\(scanline[0]))[\(scanline.dropFirst().prefix(8).map(String.init(_:)).joined(separator: ", ")) ... ]")
+                print("< scanline(\(next[0]))[\(next.dropFirst().prefix(8).map(String.init(_:)).joined(separator: ", ")) ... ]")
                 #endif
 
-                Self.defilter(&scanline, last: last, delay: delay)
-                try scanline.dropFirst().withUnsafeBufferPointer
+                Self.defilter(&next, last: last, delay: delay)
+                try next.dropFirst().withUnsafeBufferPointer
                 {
                     try delegate($0, (0, y), (1, 1))
                 }
 
-                last = scanline
+                swap(&last, &next)
             }
         }
 
@@ -150,6 +204,66 @@ extension PNG.Decoder
 
     static
     func defilter(_ line:inout [UInt8], last:[UInt8], delay:Int)
+    {
+        #if SCALAR_DECODING
+        Self.defilterScalar(&line, last: last, delay: delay)
+        #else
+        precondition(line.count == last.count,
+            "scanline and previous scanline must have the same length")
+
+        let filter:UInt8 = line[line.startIndex]
+        line.withUnsafeMutableBufferPointer
+        {
+            (line:inout UnsafeMutableBufferPointer<UInt8>) in
+
+            last.withUnsafeBufferPointer
+            {
+                guard   let current:UnsafeMutablePointer<UInt8> = line.baseAddress,
+                        let previous:UnsafePointer<UInt8> = $0.baseAddress
+                else
+                {
+                    return
+                }
+
+                // skip the filter byte
+                let x:UnsafeMutablePointer<UInt8> = current + 1
+                let y:UnsafePointer<UInt8> = previous + 1
+                let count:Int = line.count - 1
+
+                //  the average and paeth kernels are generated separately for each delay,
+                //  so that the compiler can unroll the partial stores
+                switch (filter, delay)
+                {
+                case (0, _):    break
+                case (1, _):    Self.sub(x, count: count, delay: delay)
+                case (2, _):    Self.up(x, y, count: count)
+                case (3, 1):    Self.average(x, y, count: count, delay: 1)
+                case (3, 2):    Self.average(x, y, count: count, delay: 2)
+                case (3, 3):    Self.average(x, y, count: count, delay: 3)
+                case (3, 4):    Self.average(x, y, count: count, delay: 4)
+                case (3, 5):    Self.average(x, y, count: count, delay: 5)
+                case (3, 6):    Self.average(x, y, count: count, delay: 6)
+                case (3, 7):    Self.average(x, y, count: count, delay: 7)
+                case (3, 8):    Self.average(x, y, count: count, delay: 8)
+                case (4, 1):    Self.paeth(x, y, count: count, delay: 1)
+                case (4, 2):    Self.paeth(x, y, count: count, delay: 2)
+                case (4, 3):    Self.paeth(x, y, count: count, delay: 3)
+                case (4, 4):    Self.paeth(x, y, count: count, delay: 4)
+                case (4, 5):    Self.paeth(x, y, count: count, delay: 5)
+                case (4, 6):    Self.paeth(x, y, count: count, delay: 6)
+                case (4, 7):    Self.paeth(x, y, count: count, delay: 7)
+                case (4, 8):    Self.paeth(x, y, count: count, delay: 8)
+                default:        break // invalid
+                }
+            }
+        }
+        #endif
+    }
+
+    /// Reconstructs a scanline one byte at a time. This is the reference implementation
+    /// for the vectorized kernels used by ``defilter(_:last:delay:)``.
+    static
+    func defilterScalar(_ line:inout [UInt8], last:[UInt8], delay:Int)
     {
         let indices:Range<Int> = line.indices.dropFirst()
         switch line[line.startIndex]
@@ -195,3 +309,115 @@ extension PNG.Decoder
         }
     }
 }
+extension PNG.Decoder
+{
+    //  up has no dependencies between bytes, so it can be done 16 bytes at a time.
+    //  sub is a prefix sum with a stride of `delay`, which can be done 8 bytes at a time
+    //  with shifts. average and paeth depend on the reconstructed pixel to the left, so
+    //  they can only process one pixel at a time, with one lane per byte.
+    //
+    //  all of the kernels finish the last few bytes of the scanline one byte at a time,
+    //  so that they never read past the end of the scanline.
+
+    @inline(__always)
+    private static
+    func up(_ x:UnsafeMutablePointer<UInt8>, _ y:UnsafePointer<UInt8>, count:Int)
+    {
+        var i:Int = 0
+        while i + 16 <= count
+        {
+            let a:SIMD16<UInt8> = UnsafeRawPointer.init(x + i).loadUnaligned(
+                as: SIMD16<UInt8>.self)
+            let b:SIMD16<UInt8> = UnsafeRawPointer.init(y + i).loadUnaligned(
+                as: SIMD16<UInt8>.self)
+            UnsafeMutableRawPointer.init(x + i).storeBytes(of: a &+ b,
+                as: SIMD16<UInt8>.self)
+            i += 16
+        }
+        while i < count
+        {
+            x[i] &+= y[i]
+            i += 1
+        }
+    }
+
+    @inline(__always)
+    private static
+    func sub(_ x:UnsafeMutablePointer<UInt8>, count:Int, delay:Int)
+    {
+        // the reconstructed pixel that precedes the current group, in the low lanes
+        var carry:SIMD8<UInt8> = .zero
+        var i:Int = 0
+        while i + 8 <= count
+        {
+            var s:SIMD8<UInt8> = .init(loading: x + i) &+ carry
+            var k:Int = delay
+            while k < 8
+            {
+                s &+= s.shifted(up: k)
+                k <<= 1
+            }
+            s.store(to: x + i)
+            carry = s.shifted(down: 8 - delay)
+            i += 8
+        }
+        while i < count
+        {
+            if  i >= delay
+            {
+                x[i] &+= x[i &- delay]
+            }
+            i += 1
+        }
+    }
+
+    @inline(__always)
+    private static
+    func average(_ x:UnsafeMutablePointer<UInt8>, _ y:UnsafePointer<UInt8>, count:Int,
+        delay:Int)
+    {
+        // only the first `delay` lanes of `a` are meaningful
+        var a:SIMD8<UInt8> = .zero
+        var i:Int = 0
+        while i + 8 <= count
+        {
+            let b:SIMD8<UInt8> = .init(loading: y + i)
+            // (a + b) >> 1, without widening
+            a = SIMD8<UInt8>.init(loading: x + i) &+ ((a & b) &+ ((a ^ b) &>> 1))
+            a.store(to: x + i, count: delay)
+            i += delay
+        }
+        while i < count
+        {
+            let total:UInt16 = .init(i >= delay ? x[i &- delay] : 0) &+ .init(y[i])
+            x[i] &+= .init(total >> 1)
+            i += 1
+        }
+    }
+
+    @inline(__always)
+    private static
+    func paeth(_ x:UnsafeMutablePointer<UInt8>, _ y:UnsafePointer<UInt8>, count:Int,
+        delay:Int)
+    {
+        // only the first `delay` lanes of `a` and `c` are meaningful
+        var a:SIMD8<UInt8> = .zero,
+            c:SIMD8<UInt8> = .zero
+        var i:Int = 0
+        while i + 8 <= count
+        {
+            let b:SIMD8<UInt8> = .init(loading: y + i)
+            a = SIMD8<UInt8>.init(loading: x + i) &+ PNG.paeth(a, b, c)
+            a.store(to: x + i, count: delay)
+            c = b
+            i += delay
+        }
+        while i < count
+        {
+            x[i] &+= i >= delay ?
+                PNG.paeth(x[i &- delay], y[i], y[i &- delay]) :
+                PNG.paeth(0,             y[i], 0)
+            i += 1
+        }
+    }
+}
@@ -0,0 +1,26 @@
+extension PNG
+{
+    /// A set of decompression buffers that can be reused across many images.
+    ///
+    /// Decoding an image with ``Image/decompress(stream:)`` allocates a new decoder
+    /// every time it is called, including its inflator and its scanline buffers, which
+    /// is a significant part of the cost of decoding small images. Passing the same
+    /// instance of this type to ``Image/decompress(stream:reusing:)`` resets the decoder
+    /// from the previous image instead of reallocating it.
+    ///
+    /// Each instance of this type should only be used by one thread at a time.
+    @frozen public
+    struct DecodingBuffers
+    {
+        @usableFromInline
+        var decoder:PNG.Decoder?
+
+        /// Creates an empty set of decompression buffers. The buffers are allocated
+        /// when they are first used.
+        @inlinable public
+        init()
+        {
+            self.decoder = nil
+        }
+    }
+}
@@ -7,13 +7,27 @@ extension PNG
         private
         var row:(index:Int, reference:[UInt8])?,
             pass:Pass?
+        // exactly one of these is non-nil
+        private(set)
+        var deflator:LZ77.Deflator?
         private
-        var deflator:LZ77.Deflator
+        var parallel:LZ77.ParallelDeflator?
     }
 }
 extension PNG.Encoder
 {
-    init(standard:PNG.Standard, interlaced:Bool, level:Int, hint:Int)
+    init(standard:PNG.Standard, interlaced:Bool, level:Int, hint:Int, threads:Int = 1)
+    {
+        self.init(standard: standard, interlaced: interlaced, search: .init(level: level),
+            hint: hint,
+            threads: threads)
+    }
+    /// Creates an encoder. If `deflator` is not nil, and `threads` is `1`, the encoder
+    /// resets and reuses it instead of allocating a new one. The `deflator` must have
+    /// been created with the same search parameters and size hint.
+    init(standard:PNG.Standard, interlaced:Bool, search:LZ77.DeflatorSearch, hint:Int,
+        threads:Int = 1,
+        deflator:LZ77.Deflator? = nil)
     {
         self.row        = nil
         self.pass       = interlaced ? .subimage(0) : .image
@@ -25,8 +39,58 @@ extension PNG.Encoder
         case .ios:      format = .ios
         }
 
-        self.deflator   = .init(format: format, level: level,
-            hint: max(1, min(hint, 0x7f_ff_ff_ff)))
+        let hint:Int = max(1, min(hint, 0x7f_ff_ff_ff))
+        if  threads > 1
+        {
+            self.deflator = nil
+            self.parallel = .init(format: format, search: search, hint: hint,
+                threads: threads)
+        }
+        else if
+            var deflator:LZ77.Deflator = deflator
+        {
+            deflator.reset(format: format)
+            self.deflator = deflator
+            self.parallel = nil
+        }
+        else
+        {
+            self.deflator = .init(format: format, search: search, hint: hint)
+            self.parallel = nil
+        }
+    }
+
+    private mutating
+    func push(_ data:ArraySlice<UInt8>, last:Bool = false)
+    {
+        self.deflator?.push(data, last: last)
+        self.parallel?.push(data, last: last)
+    }
+
+    mutating
+    func pop() -> [UInt8]?
+    {
+        if  let data:[UInt8] = self.deflator?.pop()
+        {
+            return data
+        }
+        else
+        {
+            return self.parallel?.pop()
+        }
+    }
+
+    mutating
+    func pull() -> [UInt8]?
+    {
+        if  let data:[UInt8] = self.deflator?.pull()
+        {
+            return data
+        }
+        else
+        {
+            return self.parallel?.pull()
+        }
     }
 
     mutating
@@ -65,7 +129,7 @@ extension PNG.Encoder
                 self.row = nil
                 for y:Int in start ..< subimage.y
                 {
-                    if  let data:[UInt8] = self.deflator.pop()
+                    if  let data:[UInt8] = self.pop()
                     {
                         self.row  = (y, last)
                         self.pass = .subimage(z)
@@ -82,12 +146,12 @@ extension PNG.Encoder
                         $1 = last.count
                     }
 
-                    self.deflator.push(Self.filter(scanline, last: last, delay: delay)[...])
+                    self.push(Self.filter(scanline, last: last, delay: delay)[...])
                     last = scanline
                 }
             }
 
-            self.deflator.push([], last: true)
+            self.push([], last: true)
             self.pass = nil
 
         case .image?:
@@ -98,7 +162,7 @@ extension PNG.Encoder
             self.row = nil
             for y:Int in start ..< size.y
             {
-                if  let data:[UInt8] = self.deflator.pop()
+                if  let data:[UInt8] = self.pop()
                 {
                     self.row  = (y, last)
                     return data
@@ -114,18 +178,74 @@ extension PNG.Encoder
                     $1 = last.count
                 }
 
-                self.deflator.push(Self.filter(scanline, last: last, delay: delay)[...])
+                self.push(Self.filter(scanline, last: last, delay: delay)[...])
                 last = scanline
             }
 
-            self.deflator.push([], last: true)
+            self.push([], last: true)
             self.pass = nil
 
         case nil:
             break
         }
 
-        return self.deflator.pull()
+        return self.pull()
+    }
+
+    /// Filters and compresses the next `count` rows of a non-interlaced image that is
+    /// `width` pixels wide. Unlike ``pull(size:pixel:delegate:)``, this method does not
+    /// need access to the rows that come before or after the ones it compresses, except
+    /// for the last row it compressed, which it keeps for filtering.
+    ///
+    /// The `delegate` receives row coordinates relative to the first row passed to this
+    /// call. Call ``pop`` to remove compressed data from the encoder, and ``finish`` once
+    /// every row of the image has been pushed.
+    mutating
+    func push(rows count:Int, width:Int, pixel:PNG.Format.Pixel,
+        delegate:(inout UnsafeMutableBufferPointer<UInt8>, (x:Int, y:Int), Int) throws -> ())
+        rethrows
+    {
+        guard case .image? = self.pass
+        else
+        {
+            fatalError("cannot push rows of an interlaced or finished image")
+        }
+
+        let delay:Int   = (pixel.volume + 7) >> 3
+        let pitch:Int   = (width * pixel.volume + 7) >> 3
+
+        var (start, last):(Int, [UInt8]) = self.row ??
+            (0, .init(repeating: 0, count: pitch + 1))
+        self.row = nil
+        for y:Int in 0 ..< count
+        {
+            let scanline:[UInt8] =
+                try .init(unsafeUninitializedCapacity: last.count)
+            {
+                $0.baseAddress?.initialize(to: 0)
+                var tail:UnsafeMutableBufferPointer<UInt8> =
+                    .init(rebasing: $0.dropFirst())
+                try delegate(&tail, (0, y), 1)
+                $1 = last.count
+            }
+
+            self.push(Self.filter(scanline, last: last, delay: delay)[...])
+            last = scanline
+        }
+
+        start += count
+        self.row = (start, last)
+    }
+
+    /// Flushes the compressed data for a non-interlaced image whose rows were
+    /// provided through ``push(rows:width:pixel:delegate:)``. Call ``pull`` afterwards
+    /// to remove the remaining compressed data from the encoder.
+    mutating
+    func finish()
+    {
+        self.push([], last: true)
+        self.row  = nil
+        self.pass = nil
     }
 
     static
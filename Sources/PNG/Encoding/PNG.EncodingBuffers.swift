@@ -0,0 +1,37 @@
+import LZ77
+
+extension PNG
+{
+    /// A set of compression buffers that can be reused across many images.
+    ///
+    /// Encoding an image with ``Image/compress(stream:level:hint:)`` allocates a new
+    /// deflator every time it is called, including its match window, hash table, and match
+    /// buffer, which is a significant part of the cost of encoding small images. Passing
+    /// the same instance of this type to ``Image/compress(stream:level:hint:reusing:)``
+    /// resets the buffers from the previous image instead of reallocating them.
+    ///
+    /// The buffers are only reused if the compression level and size hint are the same as
+    /// they were for the previous image. Otherwise, they are reallocated.
+    ///
+    /// Only the deflator is reused. The rest of the encoder state is small and is created
+    /// again for each image. The encoder still allocates its filtered scanlines row by
+    /// row, because the filter heuristic builds a new candidate row for each of the five
+    /// filter types. Keeping a single row buffer between images would not remove those
+    /// allocations.
+    ///
+    /// Each instance of this type should only be used by one thread at a time.
+    @frozen public
+    struct EncodingBuffers
+    {
+        @usableFromInline
+        var deflator:(search:LZ77.DeflatorSearch, hint:Int, deflator:LZ77.Deflator)?
+
+        /// Creates an empty set of compression buffers. The buffers are allocated
+        /// when they are first used.
+        @inlinable public
+        init()
+        {
+            self.deflator = nil
+        }
+    }
+}
@@ -0,0 +1,142 @@
+import LZ77
+
+extension PNG
+{
+    /// An encoding context.
+    ///
+    /// This type encodes an image one strip of rows at a time, so that the image never
+    /// needs to be in memory all at once. It filters and compresses each strip as soon as
+    /// it is pushed, and writes the completed ``Chunk/IDAT`` chunks to the destination
+    /// bytestream right away. The memory it uses depends on the width of the image and on
+    /// the height of the strips, but not on the height of the image.
+    ///
+    /// Encoding contexts can only encode non-interlaced images, because every pass of an
+    /// ``Layout/interlaced`` image contains rows from the entire image.
+    public
+    struct EncodingContext
+    {
+        /// The size of the image being encoded, measured in pixels.
+        public
+        let size:(x:Int, y:Int)
+        /// The layout of the image being encoded.
+        public
+        let layout:PNG.Layout
+        /// The number of rows that have been encoded so far.
+        public private(set)
+        var rows:Int
+
+        private
+        var encoder:PNG.Encoder
+    }
+}
+extension PNG.EncodingContext
+{
+    /// Creates an encoding context, and writes the PNG signature, along with all of the
+    /// chunks that come before the image data, to the given bytestream.
+    /// -   Parameter stream:
+    ///     A bytestream receiving the contents of a PNG file.
+    /// -   Parameter size:
+    ///     The size of the image. Both dimensions must be greater than zero.
+    /// -   Parameter layout:
+    ///     The layout of the image. It must not be ``Layout/interlaced``.
+    /// -   Parameter metadata:
+    ///     A metadata structure. The default value is an empty metadata structure.
+    /// -   Parameter level:
+    ///     The compression level to use. See ``Image/compress(stream:level:hint:)``
+    ///     for details.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``Image/compress(stream:level:hint:)`` for details.
+    public
+    init<Destination>(stream:inout Destination, size:(x:Int, y:Int), layout:PNG.Layout,
+        metadata:PNG.Metadata = .init(),
+        level:Int = 9,
+        hint:Int = 1 << 15) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        try self.init(stream: &stream, size: size, layout: layout,
+            metadata: metadata,
+            search: .init(level: level),
+            hint: hint)
+    }
+    /// Creates an encoding context that uses explicit match search parameters instead of
+    /// a predefined compression level.
+    ///
+    /// This initializer is intended for evaluating compression settings. Most applications
+    /// should use ``init(stream:size:layout:metadata:level:hint:)`` instead.
+    public
+    init<Destination>(stream:inout Destination, size:(x:Int, y:Int), layout:PNG.Layout,
+        metadata:PNG.Metadata = .init(),
+        search:LZ77.DeflatorSearch,
+        hint:Int = 1 << 15) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        precondition(size.x > 0 && size.y > 0,
+            "image dimensions must be greater than zero")
+        precondition(!layout.interlaced,
+            "encoding contexts cannot encode interlaced images")
+
+        let standard:PNG.Standard = try PNG.Image.format(prefix: &stream,
+            size:       size,
+            layout:     layout,
+            metadata:   metadata)
+
+        self.size       = size
+        self.layout     = layout
+        self.rows       = 0
+        self.encoder    = .init(standard: standard, interlaced: false, search: search,
+            hint: hint)
+    }
+
+    /// Filters and compresses the next strip of rows in the image, and writes any
+    /// ``Chunk/IDAT`` chunks that are complete to the given bytestream.
+    /// -   Parameter strip:
+    ///     An image containing the next rows of the image being encoded. Its width and
+    ///     pixel format must match the image being encoded, and it must not contain
+    ///     more rows than the image has left. Its palette and interlacing are ignored.
+    /// -   Parameter stream:
+    ///     The bytestream that was passed to ``init(stream:size:layout:metadata:level:hint:)``.
+    public mutating
+    func push<Destination>(strip:PNG.Image, stream:inout Destination) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        precondition(strip.size.x == self.size.x,
+            "strip width (\(strip.size.x)) must match image width (\(self.size.x))")
+        precondition(strip.layout.format.pixel == self.layout.format.pixel,
+            "strip pixel format (\(strip.layout.format.pixel)) must match image pixel format (\(self.layout.format.pixel))")
+        precondition(self.rows + strip.size.y <= self.size.y,
+            "strip height (\(strip.size.y)) exceeds the number of rows left in the image (\(self.size.y - self.rows))")
+
+        self.encoder.push(rows: strip.size.y, width: self.size.x,
+            pixel:      self.layout.format.pixel,
+            delegate:   strip.collect(scanline:at:stride:))
+        self.rows += strip.size.y
+
+        while let data:[UInt8] = self.encoder.pop()
+        {
+            try stream.format(type: .IDAT, data: data)
+        }
+    }
+    /// Flushes the remaining image data to the given bytestream, and terminates it with
+    /// an ``Chunk/IEND`` chunk.
+    ///
+    /// Every row of the image must have been pushed before calling this method, and no
+    /// more rows can be pushed afterwards.
+    /// -   Parameter stream:
+    ///     The bytestream that was passed to ``init(stream:size:layout:metadata:level:hint:)``.
+    public mutating
+    func finish<Destination>(stream:inout Destination) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        precondition(self.rows == self.size.y,
+            "image is missing \(self.size.y - self.rows) rows")
+
+        self.encoder.finish()
+        while let data:[UInt8] = self.encoder.pull()
+        {
+            try stream.format(type: .IDAT, data: data)
+        }
+
+        try stream.format(type: .IEND)
+    }
+}
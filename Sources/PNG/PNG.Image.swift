@@ -1,3 +1,5 @@
+import LZ77
+
 extension PNG
 {
     /// A namespace containing the ``Image`` type.
@@ -297,6 +299,27 @@ extension PNG.Image
     public static
     func decompress<Source>(stream:inout Source) throws -> Self
         where Source:PNG.BytestreamSource
+    {
+        var buffers:PNG.DecodingBuffers = .init()
+        return try .decompress(stream: &stream, reusing: &buffers)
+    }
+    /// Decompresses and decodes a PNG from the given bytestream, reusing the given
+    /// decompression buffers.
+    ///
+    /// This function is equivalent to ``decompress(stream:)``, but it resets and reuses
+    /// the buffers allocated for the previous image decoded with the same `buffers`,
+    /// which makes decoding many small images faster.
+    /// -   Parameter stream:
+    ///     A bytestream providing the contents of a PNG file.
+    /// -   Parameter buffers:
+    ///     The decompression buffers to use. If decoding fails, the buffers are discarded,
+    ///     and will be reallocated for the next image.
+    /// -   Returns:
+    ///     The decoded image.
+    public static
+    func decompress<Source>(stream:inout Source, reusing buffers:inout PNG.DecodingBuffers)
+        throws -> Self
+        where Source:PNG.BytestreamSource
     {
         try stream.signature()
         let (standard, header):(PNG.Standard, PNG.Header) = try
@@ -361,11 +384,15 @@ extension PNG.Image
                         palette:        palette,
                         background:     background,
                         transparency:   transparency,
-                        metadata:       metadata)
+                        metadata:       metadata,
+                        decoder:        buffers.decoder)
                     else
                     {
                         throw PNG.DecodingError.required(chunk: .PLTE, before: .IDAT)
                     }
+                    // the context now owns the decoder, and it should be the only
+                    // reference to it, or its buffers will be copied on write
+                    buffers.decoder = nil
                     return context
 
                 case .IEND:
@@ -394,6 +421,7 @@ extension PNG.Image
             guard chunk.type != .IEND
             else
             {
+                buffers.decoder = context.decoder
                 return context.image
             }
             chunk = try stream.chunk()
@@ -404,7 +432,8 @@ extension PNG.Image
 // encoding
 extension PNG.Image
 {
-    func encode() ->
+    static
+    func encode(size:(x:Int, y:Int), layout:PNG.Layout) ->
     (
         header:PNG.Header,
         palette:PNG.Palette?,
@@ -415,17 +444,110 @@ extension PNG.Image
     {
         let cgbi:[UInt8]?,
             standard:PNG.Standard
-        switch self.layout.format
+        switch layout.format
         {
         case .bgr8:     cgbi = [48, 0, 32, 6]   ; standard = .ios
         case .bgra8:    cgbi = [48, 0, 32, 2]   ; standard = .ios
         default:        cgbi = nil              ; standard = .common
         }
-        let header:PNG.Header = .init(size: self.size,
-            pixel:      self.layout.format.pixel,
-            interlaced: self.layout.interlaced,
+        let header:PNG.Header = .init(size: size,
+            pixel:      layout.format.pixel,
+            interlaced: layout.interlaced,
             standard:   standard)
-        return (header, self.layout.palette, self.layout.background, self.layout.transparency, cgbi)
+        return (header, layout.palette, layout.background, layout.transparency, cgbi)
+    }
+
+    /// Writes the PNG signature, and all of the chunks that come before the image data,
+    /// for an image with the given size, layout, and metadata.
+    /// -   Returns:
+    ///     The standard the image data should be compressed with.
+    static
+    func format<Destination>(prefix stream:inout Destination,
+        size:(x:Int, y:Int),
+        layout:PNG.Layout,
+        metadata:PNG.Metadata) throws -> PNG.Standard
+        where Destination:PNG.BytestreamDestination
+    {
+        try stream.signature()
+
+        let header:PNG.Header,
+            palette:PNG.Palette?,
+            background:PNG.Background?,
+            transparency:PNG.Transparency?,
+            cgbi:[UInt8]?
+        (header, palette, background, transparency, cgbi) = Self.encode(size: size,
+            layout: layout)
+
+        if let cgbi:[UInt8] = cgbi
+        {
+            try stream.format(type: .CgBI, data: cgbi)
+        }
+
+        try stream.format(type: .IHDR, data: header.serialized)
+
+        if let chromaticity:PNG.Chromaticity        = metadata.chromaticity
+        {
+            try stream.format(type: .cHRM, data: chromaticity.serialized)
+        }
+        if let gamma:PNG.Gamma                      = metadata.gamma
+        {
+            try stream.format(type: .gAMA, data: gamma.serialized)
+        }
+        if let colorRendering:PNG.ColorRendering    = metadata.colorRendering
+        {
+            try stream.format(type: .sRGB, data: colorRendering.serialized)
+        }
+        if let colorProfile:PNG.ColorProfile        = metadata.colorProfile
+        {
+            try stream.format(type: .iCCP, data: colorProfile.serialized)
+        }
+        if let significantBits:PNG.SignificantBits  = metadata.significantBits
+        {
+            try stream.format(type: .sBIT, data: significantBits.serialized)
+        }
+
+
+        if let palette:PNG.Palette                  = palette
+        {
+            try stream.format(type: .PLTE, data: palette.serialized)
+        }
+        if let background:PNG.Background            = background
+        {
+            try stream.format(type: .bKGD, data: background.serialized)
+        }
+        if let transparency:PNG.Transparency        = transparency
+        {
+            try stream.format(type: .tRNS, data: transparency.serialized)
+        }
+        if let histogram:PNG.Histogram              = metadata.histogram
+        {
+            try stream.format(type: .hIST, data: histogram.serialized)
+        }
+
+
+        if let dimensions:PNG.PhysicalDimensions    = metadata.physicalDimensions
+        {
+            try stream.format(type: .pHYs, data: dimensions.serialized)
+        }
+        if let time:PNG.TimeModified                = metadata.time
+        {
+            try stream.format(type: .tIME, data: time.serialized)
+        }
+
+        for text:PNG.Text in metadata.text
+        {
+            try stream.format(type: .iTXt, data: text.serialized)
+        }
+        for palette:PNG.SuggestedPalette in metadata.suggestedPalettes
+        {
+            try stream.format(type: .sPLT, data: palette.serialized)
+        }
+        for (type, data):(PNG.Chunk, [UInt8]) in metadata.application
+        {
+            try stream.format(type: type, data: data)
+        }
+
+        return cgbi == nil ? .common : .ios
     }
 
     func collect<C>(scanline:inout C, at base:(x:Int, y:Int), stride:Int)
@@ -577,86 +699,142 @@ extension PNG.Image
         throws
         where Destination:PNG.BytestreamDestination
     {
-        try stream.signature()
-
-        let header:PNG.Header,
-            palette:PNG.Palette?,
-            background:PNG.Background?,
-            transparency:PNG.Transparency?,
-            cgbi:[UInt8]?
-        (header, palette, background, transparency, cgbi) = self.encode()
-
-        if let cgbi:[UInt8] = cgbi
-        {
-            try stream.format(type: .CgBI, data: cgbi)
-        }
-
-        try stream.format(type: .IHDR, data: header.serialized)
-
-        if let chromaticity:PNG.Chromaticity        = self.metadata.chromaticity
-        {
-            try stream.format(type: .cHRM, data: chromaticity.serialized)
-        }
-        if let gamma:PNG.Gamma                      = self.metadata.gamma
-        {
-            try stream.format(type: .gAMA, data: gamma.serialized)
-        }
-        if let colorRendering:PNG.ColorRendering    = self.metadata.colorRendering
-        {
-            try stream.format(type: .sRGB, data: colorRendering.serialized)
-        }
-        if let colorProfile:PNG.ColorProfile        = self.metadata.colorProfile
-        {
-            try stream.format(type: .iCCP, data: colorProfile.serialized)
-        }
-        if let significantBits:PNG.SignificantBits  = self.metadata.significantBits
-        {
-            try stream.format(type: .sBIT, data: significantBits.serialized)
-        }
-
-
-        if let palette:PNG.Palette                  = palette
-        {
-            try stream.format(type: .PLTE, data: palette.serialized)
-        }
-        if let background:PNG.Background            = background
-        {
-            try stream.format(type: .bKGD, data: background.serialized)
-        }
-        if let transparency:PNG.Transparency        = transparency
-        {
-            try stream.format(type: .tRNS, data: transparency.serialized)
-        }
-        if let histogram:PNG.Histogram              = self.metadata.histogram
-        {
-            try stream.format(type: .hIST, data: histogram.serialized)
-        }
-
+        try self.compress(stream: &stream, search: .init(level: level), hint: hint)
+    }
+    /// Encodes and compresses a PNG to the given bytestream, compressing the image data
+    /// on multiple threads.
+    ///
+    /// The image data is split into segments of 128&nbsp;KiB, which are compressed
+    /// concurrently and then joined into a single compressed stream. This makes the
+    /// output slightly larger than the output of ``compress(stream:level:hint:)``,
+    /// and it only speeds up encoding for images with more than one segment of data.
+    /// -   Parameter stream:
+    ///     A bytestream receiving the contents of a PNG file.
+    /// -   Parameter level:
+    ///     The compression level to use. See ``compress(stream:level:hint:)``
+    ///     for details.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(stream:level:hint:)`` for details.
+    /// -   Parameter threads:
+    ///     The number of segments to compress at the same time. Setting this parameter
+    ///     to `1` (or less) is the same as calling ``compress(stream:level:hint:)``.
+    public
+    func compress<Destination>(stream:inout Destination, level:Int = 9, hint:Int = 1 << 15,
+        threads:Int) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        try self.compress(stream: &stream, search: .init(level: level), hint: hint,
+            threads: threads)
+    }
+    /// Encodes and compresses a PNG to the given bytestream, using explicit match search
+    /// parameters instead of a predefined compression level.
+    ///
+    /// This function is intended for evaluating compression settings. Most applications
+    /// should use ``compress(stream:level:hint:)`` instead.
+    /// -   Parameter stream:
+    ///     A bytestream receiving the contents of a PNG file.
+    /// -   Parameter search:
+    ///     The match search parameters to use.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(stream:level:hint:)`` for details.
+    /// -   Parameter threads:
+    ///     The number of segments to compress at the same time. See
+    ///     ``compress(stream:level:hint:threads:)`` for details. The default value
+    ///     is `1`.
+    public
+    func compress<Destination>(stream:inout Destination, search:LZ77.DeflatorSearch,
+        hint:Int = 1 << 15,
+        threads:Int = 1) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        var buffers:PNG.EncodingBuffers = .init()
+        try self.compress(stream: &stream, search: search, hint: hint, threads: threads,
+            buffers: &buffers)
+    }
+    /// Encodes and compresses a PNG to the given bytestream, reusing the given compression
+    /// buffers.
+    ///
+    /// This function is equivalent to ``compress(stream:level:hint:)``, but it resets and
+    /// reuses the buffers allocated for the previous image encoded with the same `buffers`,
+    /// which makes encoding many small images faster. The output is exactly the same as
+    /// the output of ``compress(stream:level:hint:)``.
+    /// -   Parameter stream:
+    ///     A bytestream receiving the contents of a PNG file.
+    /// -   Parameter level:
+    ///     The compression level to use. See ``compress(stream:level:hint:)``
+    ///     for details.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(stream:level:hint:)`` for details.
+    /// -   Parameter buffers:
+    ///     The compression buffers to use. They are only reused if the previous image
+    ///     was encoded with the same `level` and `hint`.
+    public
+    func compress<Destination>(stream:inout Destination, level:Int = 9, hint:Int = 1 << 15,
+        reusing buffers:inout PNG.EncodingBuffers) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        try self.compress(stream: &stream, search: .init(level: level), hint: hint,
+            reusing: &buffers)
+    }
+    /// Encodes and compresses a PNG to the given bytestream, using explicit match search
+    /// parameters, and reusing the given compression buffers.
+    ///
+    /// This function is intended for evaluating compression settings. Most applications
+    /// should use ``compress(stream:level:hint:reusing:)`` instead.
+    /// -   Parameter stream:
+    ///     A bytestream receiving the contents of a PNG file.
+    /// -   Parameter search:
+    ///     The match search parameters to use.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(stream:level:hint:)`` for details.
+    /// -   Parameter buffers:
+    ///     The compression buffers to use. They are only reused if the previous image
+    ///     was encoded with the same `search` parameters and `hint`.
+    public
+    func compress<Destination>(stream:inout Destination, search:LZ77.DeflatorSearch,
+        hint:Int = 1 << 15,
+        reusing buffers:inout PNG.EncodingBuffers) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        try self.compress(stream: &stream, search: search, hint: hint,
+            threads: 1,
+            buffers: &buffers)
+    }
 
-        if let dimensions:PNG.PhysicalDimensions    = self.metadata.physicalDimensions
-        {
-            try stream.format(type: .pHYs, data: dimensions.serialized)
-        }
-        if let time:PNG.TimeModified                = self.metadata.time
-        {
-            try stream.format(type: .tIME, data: time.serialized)
-        }
+    private
+    func compress<Destination>(stream:inout Destination, search:LZ77.DeflatorSearch,
+        hint:Int,
+        threads:Int,
+        buffers:inout PNG.EncodingBuffers) throws
+        where Destination:PNG.BytestreamDestination
+    {
+        let standard:PNG.Standard = try Self.format(prefix: &stream,
+            size:       self.size,
+            layout:     self.layout,
+            metadata:   self.metadata)
 
-        for text:PNG.Text in self.metadata.text
-        {
-            try stream.format(type: .iTXt, data: text.serialized)
-        }
-        for palette:PNG.SuggestedPalette in self.metadata.suggestedPalettes
+        let reused:LZ77.Deflator?
+        if  let buffered:(search:LZ77.DeflatorSearch, hint:Int, deflator:LZ77.Deflator) =
+                buffers.deflator,
+                buffered.search == search,
+                buffered.hint == hint
         {
-            try stream.format(type: .sPLT, data: palette.serialized)
+            reused = buffered.deflator
         }
-        for (type, data):(PNG.Chunk, [UInt8]) in self.metadata.application
+        else
         {
-            try stream.format(type: type, data: data)
+            reused = nil
         }
+        buffers.deflator = nil
 
-        var encoder:PNG.Encoder = .init(standard: cgbi == nil ? .common : .ios,
-            interlaced: self.layout.interlaced, level: level, hint: hint)
+        var encoder:PNG.Encoder = .init(standard: standard,
+            interlaced: self.layout.interlaced, search: search, hint: hint,
+            threads: threads,
+            deflator: reused)
         while let data:[UInt8] = encoder.pull(size: self.size,
             pixel:      self.layout.format.pixel,
             delegate:   self.collect(scanline:at:stride:))
@@ -664,6 +842,11 @@ extension PNG.Image
             try stream.format(type: .IDAT, data: data)
         }
 
+        if  let deflator:LZ77.Deflator = encoder.deflator
+        {
+            buffers.deflator = (search, hint, deflator)
+        }
+
         try stream.format(type: .IEND)
     }
 }
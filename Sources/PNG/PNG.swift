@@ -145,6 +145,31 @@ extension PNG
         return ~(p.0 | p.1) &  a        |
                 (p.0 | p.1) & (b & ~p.2 | c & p.2)
     }
+    /// Returns the value of the paeth filter function for each lane of the given
+    /// parameters.
+    @inline(__always)
+    static
+    func paeth(_ a:SIMD8<UInt8>, _ b:SIMD8<UInt8>, _ c:SIMD8<UInt8>) -> SIMD8<UInt8>
+    {
+        func abs(_ x:SIMD8<Int16>) -> SIMD8<Int16>
+        {
+            pointwiseMax(x, .zero &- x)
+        }
+
+        let v:(SIMD8<Int16>, SIMD8<Int16>, SIMD8<Int16>) =
+        (
+            .init(truncatingIfNeeded: a),
+            .init(truncatingIfNeeded: b),
+            .init(truncatingIfNeeded: c)
+        )
+        let d:(SIMD8<Int16>, SIMD8<Int16>)  = (v.1 &- v.2, v.0 &- v.2)
+        let f:(SIMD8<Int16>, SIMD8<Int16>, SIMD8<Int16>) = (abs(d.0), abs(d.1), abs(d.0 &+ d.1))
+
+        var p:SIMD8<Int16> = v.2
+        p.replace(with: v.1, where: f.1 .<= f.2)
+        p.replace(with: v.0, where: (f.0 .<= f.1) .& (f.0 .<= f.2))
+        return .init(truncatingIfNeeded: p)
+    }
 }
 extension PNG
 {
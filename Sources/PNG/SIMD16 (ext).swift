@@ -0,0 +1,38 @@
+extension SIMD16<UInt16>
+{
+    /// Loads four RGB or RGBA pixels with 8 or 16 bits per big-endian sample, and widens
+    /// them to 16-bit RGBA lanes. The alpha lanes of RGB pixels are set to `UInt16.max`.
+    ///
+    /// This reads 16 bytes if `depth` is 8, and 32 bytes if `depth` is 16, even though
+    /// four RGB pixels are shorter than that.
+    @inline(__always)
+    init(rgba pointer:UnsafeRawPointer, depth:Int, components:Int)
+    {
+        let samples:Self
+        if  depth == 8
+        {
+            let bytes:SIMD16<UInt8> = pointer.loadUnaligned(as: SIMD16<UInt8>.self)
+            // x * 257 == x << 8 | x
+            samples = .init(truncatingIfNeeded: bytes) &* 257
+        }
+        else
+        {
+            let bytes:SIMD32<UInt8> = pointer.loadUnaligned(as: SIMD32<UInt8>.self)
+            samples = .init(truncatingIfNeeded: bytes.evenHalf) &<< 8 |
+                .init(truncatingIfNeeded: bytes.oddHalf)
+        }
+
+        if  components == 4
+        {
+            self = samples
+        }
+        else
+        {
+            self = .init(
+                samples[ 0], samples[ 1], samples[ 2], .max,
+                samples[ 3], samples[ 4], samples[ 5], .max,
+                samples[ 6], samples[ 7], samples[ 8], .max,
+                samples[ 9], samples[10], samples[11], .max)
+        }
+    }
+}
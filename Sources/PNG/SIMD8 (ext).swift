@@ -0,0 +1,48 @@
+extension SIMD8<UInt8>
+{
+    @inline(__always)
+    init(loading pointer:UnsafeRawPointer)
+    {
+        self = pointer.loadUnaligned(as: Self.self)
+    }
+
+    @inline(__always)
+    func store(to pointer:UnsafeMutableRawPointer)
+    {
+        pointer.storeBytes(of: self, as: Self.self)
+    }
+    /// Stores the first `count` lanes of this vector, leaving the bytes after them
+    /// untouched.
+    @inline(__always)
+    func store(to pointer:UnsafeMutableRawPointer, count:Int)
+    {
+        withUnsafeBytes(of: self)
+        {
+            guard let base:UnsafeRawPointer = $0.baseAddress
+            else
+            {
+                return
+            }
+            pointer.copyMemory(from: base, byteCount: count)
+        }
+    }
+}
+extension SIMD8<UInt8>
+{
+    /// Moves every lane of this vector `lanes` places towards the end of the vector,
+    /// and fills the vacated lanes with zero.
+    @inline(__always)
+    func shifted(up lanes:Int) -> Self
+    {
+        let word:UInt64 = .init(littleEndian: unsafeBitCast(self, to: UInt64.self))
+        return unsafeBitCast((word << (lanes << 3)).littleEndian, to: Self.self)
+    }
+    /// Moves every lane of this vector `lanes` places towards the start of the vector,
+    /// and fills the vacated lanes with zero.
+    @inline(__always)
+    func shifted(down lanes:Int) -> Self
+    {
+        let word:UInt64 = .init(littleEndian: unsafeBitCast(self, to: UInt64.self))
+        return unsafeBitCast((word >> (lanes << 3)).littleEndian, to: Self.self)
+    }
+}
@@ -2,6 +2,8 @@
 //  License, v. 2.0. If a copy of the MPL was not distributed with this
 //  file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import LZ77
+
 #if canImport(Darwin)
     import Darwin
 #elseif canImport(Glibc)
@@ -51,6 +53,65 @@ enum System
             private
             let descriptor:Descriptor
         }
+
+        #if !os(Windows)
+        /// A type for reading data from memory-mapped files on disk.
+        ///
+        /// Unlike ``Source``, this type does not read the file through a buffered
+        /// stream. Instead, it maps the entire file into the address space of the
+        /// process, and copies bytes out of the mapping on demand.
+        public
+        struct Map
+        {
+            private
+            let buffer:UnsafeRawBufferPointer
+            private
+            var index:Int
+        }
+        #endif
+    }
+}
+extension System.File
+{
+    /// Returns the size of the file with the given descriptor, in bytes, or `nil` if the
+    /// file is not a regular file or a link to a file.
+    static
+    func count(descriptor:Int32) -> Int?
+    {
+        guard let status:stat =
+        ({
+            var status:stat = .init()
+            guard fstat(descriptor, &status) == 0
+            else
+            {
+                return nil
+            }
+            return status
+        }())
+        else
+        {
+            return nil
+        }
+
+        #if os(Windows)
+        switch Int32.init(status.st_mode) & S_IFMT
+        {
+        case S_IFREG:
+            break
+        default:
+            return nil
+        }
+        #else
+        switch status.st_mode & S_IFMT
+        {
+        case S_IFREG, S_IFLNK:
+            break
+        default:
+            return nil
+        }
+        #endif
+
+        return Int.init(status.st_size)
     }
 }
 extension System.File.Source
@@ -137,40 +198,7 @@ extension System.File.Source
             return nil
         }
 
-        guard let status:stat =
-        ({
-            var status:stat = .init()
-            guard fstat(descriptor, &status) == 0
-            else
-            {
-                return nil
-            }
-            return status
-        }())
-        else
-        {
-            return nil
-        }
-
-        #if os(Windows)
-        switch Int32.init(status.st_mode) & S_IFMT
-        {
-        case S_IFREG:
-            break
-        default:
-            return nil
-        }
-        #else
-        switch status.st_mode & S_IFMT
-        {
-        case S_IFREG, S_IFLNK:
-            break
-        default:
-            return nil
-        }
-        #endif
-
-        return Int.init(status.st_size)
+        return System.File.count(descriptor: descriptor)
     }
 }
 extension System.File.Destination
@@ -243,6 +271,104 @@ extension System.File.Destination
     }
 }
 
+#if !os(Windows)
+extension System.File.Map
+{
+    /// Calls a closure with an interface for reading from the specified file, mapped
+    /// into memory.
+    ///
+    /// This method automatically unmaps and closes the file when its closure argument
+    /// returns.
+    /// -   Parameter path:
+    ///     The path to the file to map.
+    /// -   Parameter body:
+    ///     A closure with a ``Map`` parameter from which data in
+    ///     the specified file can be read. This interface is only valid
+    ///     for the duration of the method’s execution. The closure is
+    ///     only executed if the specified file could be successfully
+    ///     opened and mapped, otherwise this method will return `nil`. If `body`
+    ///     has a return value and the specified file could be mapped, this method
+    ///     returns the return value of the closure.
+    /// -   Returns:
+    ///     The return value of the closure argument, or `nil` if the specified
+    ///     file could not be opened or mapped.
+    public static
+    func open<R>(path:String, _ body:(inout Self) throws -> R)
+        rethrows -> R?
+    {
+        guard let file:System.File.Descriptor = fopen(path, "rb")
+        else
+        {
+            return nil
+        }
+        defer
+        {
+            fclose(file)
+        }
+
+        let descriptor:Int32 = fileno(file)
+        guard   descriptor != -1,
+                let count:Int = System.File.count(descriptor: descriptor)
+        else
+        {
+            return nil
+        }
+
+        // `mmap` does not accept empty mappings
+        guard count > 0
+        else
+        {
+            var map:Self = .init(buffer: .init(start: nil, count: 0), index: 0)
+            return try body(&map)
+        }
+
+        guard   let base:UnsafeMutableRawPointer = mmap(nil, count,
+                    PROT_READ, MAP_PRIVATE, descriptor, 0),
+                base != UnsafeMutableRawPointer.init(bitPattern: -1)
+        else
+        {
+            return nil
+        }
+        defer
+        {
+            munmap(base, count)
+        }
+
+        var map:Self = .init(buffer: .init(start: base, count: count), index: 0)
+        return try body(&map)
+    }
+
+    /// Reads the specified number of bytes from this file interface.
+    ///
+    /// This method only returns an array if the exact number of bytes
+    /// specified could be read. This method advances the read position.
+    /// -   Parameter count:
+    ///     The number of bytes to read.
+    /// -   Returns:
+    ///     An array containing the read data, or `nil` if the specified
+    ///     number of bytes could not be read.
+    public mutating
+    func read(count:Int) -> [UInt8]?
+    {
+        guard count <= self.buffer.count - self.index
+        else
+        {
+            return nil
+        }
+
+        let data:[UInt8] = .init(self.buffer[self.index ..< self.index + count])
+        self.index += count
+        return data
+    }
+    /// The size of the mapped file, in bytes.
+    public
+    var count:Int
+    {
+        self.buffer.count
+    }
+}
+#endif
+
 // declare conformance (as a formality)
 extension System.File.Source:PNG.BytestreamSource
 {
@@ -250,6 +376,11 @@ extension System.File.Source:PNG.BytestreamSource
 extension System.File.Destination:PNG.BytestreamDestination
 {
 }
+#if !os(Windows)
+extension System.File.Map:PNG.BytestreamSource
+{
+}
+#endif
 
 extension PNG.Image
 {
@@ -271,6 +402,28 @@ extension PNG.Image
             try .decompress(stream: &$0)
         }
     }
+    /// Decompresses and decodes a PNG from a file at the given file path, reusing the
+    /// given decompression buffers.
+    ///
+    /// This interface is only available on MacOS and Linux. The
+    /// ``decompress(stream:reusing:)`` function provides a platform-independent
+    /// decoding interface.
+    /// -   Parameter path:
+    ///     A path to a PNG file.
+    /// -   Parameter buffers:
+    ///     The decompression buffers to use. See ``decompress(stream:reusing:)``
+    ///     for details.
+    /// -   Returns:
+    ///     The decoded image, or `nil` if the file at the given `path` could
+    ///     not be opened.
+    public static
+    func decompress(path:String, reusing buffers:inout PNG.DecodingBuffers) throws -> Self?
+    {
+        try System.File.Source.open(path: path)
+        {
+            try .decompress(stream: &$0, reusing: &buffers)
+        }
+    }
     /// Encodes and compresses a PNG to a file at the given file path.
     ///
     /// Compression `level` `9` is roughly equivalent to *libpng*’s maximum
@@ -313,5 +466,91 @@ extension PNG.Image
             try self.compress(stream: &$0, level: level, hint: hint)
         }
     }
+    /// Encodes and compresses a PNG to a file at the given file path, reusing the given
+    /// compression buffers.
+    ///
+    /// This interface is only available on MacOS and Linux. The
+    /// ``compress(stream:level:hint:reusing:)`` function provides a
+    /// platform-independent encoding interface.
+    /// -   Parameter path:
+    ///     A path to save the PNG file at.
+    /// -   Parameter level:
+    ///     The compression level to use. See ``compress(path:level:hint:)``
+    ///     for details.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(path:level:hint:)`` for details.
+    /// -   Parameter buffers:
+    ///     The compression buffers to use. See ``compress(stream:level:hint:reusing:)``
+    ///     for details.
+    /// -   Returns:
+    ///     A ``Void`` tuple if the destination file could be opened
+    ///     successfully, or `nil` otherwise.
+    public
+    func compress(path:String, level:Int = 9, hint:Int = 1 << 15,
+        reusing buffers:inout PNG.EncodingBuffers) throws -> Void?
+    {
+        try System.File.Destination.open(path: path)
+        {
+            try self.compress(stream: &$0, level: level, hint: hint, reusing: &buffers)
+        }
+    }
+    /// Encodes and compresses a PNG to a file at the given file path, compressing the
+    /// image data on multiple threads.
+    ///
+    /// This interface is only available on MacOS and Linux. The
+    /// ``compress(stream:level:hint:threads:)`` function provides a
+    /// platform-independent encoding interface.
+    /// -   Parameter path:
+    ///     A path to save the PNG file at.
+    /// -   Parameter level:
+    ///     The compression level to use. See ``compress(path:level:hint:)``
+    ///     for details.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(path:level:hint:)`` for details.
+    /// -   Parameter threads:
+    ///     The number of segments to compress at the same time. See
+    ///     ``compress(stream:level:hint:threads:)`` for details.
+    /// -   Returns:
+    ///     A ``Void`` tuple if the destination file could be opened
+    ///     successfully, or `nil` otherwise.
+    public
+    func compress(path:String, level:Int = 9, hint:Int = 1 << 15, threads:Int) throws -> Void?
+    {
+        try System.File.Destination.open(path: path)
+        {
+            try self.compress(stream: &$0, level: level, hint: hint, threads: threads)
+        }
+    }
+    /// Encodes and compresses a PNG to a file at the given file path, using explicit
+    /// match search parameters instead of a predefined compression level.
+    ///
+    /// This interface is only available on MacOS and Linux. The
+    /// ``compress(stream:search:hint:threads:)`` function provides a
+    /// platform-independent encoding interface.
+    /// -   Parameter path:
+    ///     A path to save the PNG file at.
+    /// -   Parameter search:
+    ///     The match search parameters to use.
+    /// -   Parameter hint:
+    ///     A size hint for the emitted ``Chunk/IDAT`` chunks. See
+    ///     ``compress(path:level:hint:)`` for details.
+    /// -   Parameter threads:
+    ///     The number of segments to compress at the same time. See
+    ///     ``compress(stream:level:hint:threads:)`` for details. The default value
+    ///     is `1`.
+    /// -   Returns:
+    ///     A ``Void`` tuple if the destination file could be opened
+    ///     successfully, or `nil` otherwise.
+    public
+    func compress(path:String, search:LZ77.DeflatorSearch, hint:Int = 1 << 15,
+        threads:Int = 1) throws -> Void?
+    {
+        try System.File.Destination.open(path: path)
+        {
+            try self.compress(stream: &$0, search: search, hint: hint, threads: threads)
+        }
+    }
 }
 #endif
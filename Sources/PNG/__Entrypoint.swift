@@ -4,6 +4,8 @@
 
 #if INTERNAL_BENCHMARKS
 
+import LZ77
+
 #if os(macOS)
 import func Darwin.nanosleep
 import struct Darwin.timespec
@@ -24,6 +26,18 @@ func clock() -> Int
     Glibc.clock()
 }
 
+#endif
+
+#if os(macOS) || os(Linux)
+import struct Dispatch.DispatchTime
+
+/// Returns the current wall-clock time, in the same units as ``clock``.
+func wall() -> Int
+{
+    let ticks:UInt64 = .init(CLOCKS_PER_SEC)
+    return .init(DispatchTime.now().uptimeNanoseconds / (1_000_000_000 / ticks))
+}
+
 #else
     #warning("clock() function not imported for this platform, internal benchmarks not built (please open an issue at https://github.com/tayloraswift/swift-png/issues)")
 #endif
@@ -47,6 +61,18 @@ extension __Entrypoint
         public
         enum Decode
         {
+            /// Where the benchmark reads the encoded image from.
+            public
+            enum Source:String
+            {
+                /// A buffer that is loaded into memory before the timer starts.
+                case blob
+                /// A file path, read with ``System.File.Source``.
+                case path
+                /// A file path, mapped into memory with ``System.File.Map``.
+                case map
+            }
+
             struct Blob
             {
                 private
@@ -63,6 +89,14 @@ extension __Entrypoint
                 private(set)
                 var buffer:[UInt8] = []
             }
+            /// A destination that discards everything written to it, so that the encoded
+            /// image does not count towards the memory usage of the benchmark.
+            struct Sink
+            {
+                private(set)
+                var count:Int = 0,
+                    last:UInt8 = 0
+            }
         }
     }
 }
@@ -112,10 +146,21 @@ extension __Entrypoint.Benchmark.Encode.Blob:PNG.BytestreamDestination
         return ()
     }
 }
+extension __Entrypoint.Benchmark.Encode.Sink:PNG.BytestreamDestination
+{
+    mutating
+    func write(_ data:[UInt8]) -> Void?
+    {
+        self.count += data.count
+        self.last = data.last ?? self.last
+        return ()
+    }
+}
 extension __Entrypoint.Benchmark.Decode
 {
     public static
-    func rgba8(path:String, trials:Int) -> [(time:Int, hash:Int)]
+    func rgba8(path:String, trials:Int, source:Source = .blob,
+        wallclock:Bool = false) -> [(time:Int, hash:Int)]
     {
         guard var blob:Blob = .load(path: path)
         else
@@ -123,6 +168,9 @@ extension __Entrypoint.Benchmark.Decode
             fatalError("could not read file '\(path)'")
         }
 
+        //  processor time does not include time spent waiting for the file system, so
+        //  the modes that read from a file are always measured in wall-clock time
+        let now:() -> Int = wallclock || source != .blob ? wall : clock
         return (0 ..< trials).map
         {
             _ in
@@ -132,12 +180,34 @@ extension __Entrypoint.Benchmark.Decode
 
             do
             {
-                let start:Int = clock()
+                let start:Int = now()
+
+                let image:PNG.Image
+                switch source
+                {
+                case .blob:
+                    image = try .decompress(stream: &blob)
+
+                case .path:
+                    guard let decoded:PNG.Image = try .decompress(path: path)
+                    else
+                    {
+                        fatalError("could not read file '\(path)'")
+                    }
+                    image = decoded
 
-                let image:PNG.Image  = try .decompress(stream: &blob)
+                case .map:
+                    guard let decoded:PNG.Image = try System.File.Map.open(path: path,
+                        { try PNG.Image.decompress(stream: &$0) })
+                    else
+                    {
+                        fatalError("could not map file '\(path)'")
+                    }
+                    image = decoded
+                }
                 let pixels:[PNG.RGBA<UInt8>]    = image.unpack(as: PNG.RGBA<UInt8>.self)
 
-                let stop:Int = clock()
+                let stop:Int = now()
                 return (stop - start, .init(pixels.last?.r ?? 0))
             }
             catch let error
@@ -150,7 +220,10 @@ extension __Entrypoint.Benchmark.Decode
 extension __Entrypoint.Benchmark.Encode
 {
     public static
-    func rgba8(level:Int, path:String, trials:Int) -> ([(time:Int, hash:Int)], Int)
+    func rgba8(search:LZ77.DeflatorSearch, path:String, trials:Int,
+        destination:String? = nil,
+        threads:Int? = nil,
+        wallclock:Bool = false) -> ([(time:Int, hash:Int)], Int)
     {
         guard let image:PNG.Image = try? .decompress(path: path)
         else
@@ -165,13 +238,221 @@ extension __Entrypoint.Benchmark.Encode
             nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
             var blob:Blob   = .init()
             do
+            {
+                // `clock()` adds up the processor time of every thread, and does not
+                // include time spent waiting for the file system, so multithreaded
+                // encoding and encoding to a file are measured in wall-clock time instead
+                let now:() -> Int = wallclock || threads != nil || destination != nil ?
+                    wall : clock
+                let start:Int = now()
+
+                if  let destination:String = destination
+                {
+                    guard let _:Void = try image.compress(path: destination, search: search,
+                        threads: threads ?? 1)
+                    else
+                    {
+                        fatalError("could not open file '\(destination)'")
+                    }
+                }
+                else
+                {
+                    try image.compress(stream: &blob, search: search, threads: threads ?? 1)
+                }
+
+                let stop:Int = now()
+
+                guard   let destination:String = destination
+                else
+                {
+                    return (stop - start, blob.buffer.count, .init(blob.buffer.last ?? 0))
+                }
+                guard   let size:Int = System.File.Source.open(path: destination,
+                            { $0.count }) ?? nil
+                else
+                {
+                    fatalError("could not read file '\(destination)'")
+                }
+                return (stop - start, size, 0)
+            }
+            catch let error
+            {
+                fatalError("\(error)")
+            }
+        }
+
+        return (results.map{ (time: $0.time, hash: $0.hash) }, results.map(\.size).min() ?? 0)
+    }
+}
+extension __Entrypoint.Benchmark.Decode
+{
+    /// Decodes the same image `count` times in a row, as if it were a batch of `count`
+    /// different images, and returns the total processor time of each trial. If
+    /// `reusing` is true, every image in the batch shares one set of
+    /// ``PNG.DecodingBuffers``.
+    public static
+    func batch(path:String, trials:Int, count:Int, reusing:Bool) -> [(time:Int, hash:Int)]
+    {
+        guard let blob:Blob = .load(path: path)
+        else
+        {
+            fatalError("could not read file '\(path)'")
+        }
+
+        return (0 ..< trials).map
+        {
+            _ in
+            // sleep for 0.1s between runs to emulate a “cold” start
+            nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
+            var buffers:PNG.DecodingBuffers = .init()
+            var blobs:[Blob] = .init(repeating: blob, count: count)
+            var hash:Int = 0
+            do
             {
                 let start:Int = clock()
+                for i:Int in blobs.indices
+                {
+                    let image:PNG.Image
+                    if  reusing
+                    {
+                        image = try .decompress(stream: &blobs[i], reusing: &buffers)
+                    }
+                    else
+                    {
+                        image = try .decompress(stream: &blobs[i])
+                    }
+                    let pixels:[PNG.RGBA<UInt8>] = image.unpack(as: PNG.RGBA<UInt8>.self)
+                    hash ^= .init(pixels.last?.r ?? 0)
+                }
+                let stop:Int = clock()
+                return (stop - start, hash)
+            }
+            catch let error
+            {
+                fatalError("\(error)")
+            }
+        }
+    }
+}
+extension __Entrypoint.Benchmark.Encode
+{
+    /// Encodes the same image `count` times in a row, as if it were a batch of `count`
+    /// different images, and returns the total processor time of each trial. If
+    /// `reusing` is true, every image in the batch shares one set of
+    /// ``PNG.EncodingBuffers``.
+    public static
+    func batch(search:LZ77.DeflatorSearch, path:String, trials:Int, count:Int,
+        reusing:Bool) -> ([(time:Int, hash:Int)], Int)
+    {
+        guard let image:PNG.Image = try? .decompress(path: path)
+        else
+        {
+            fatalError("failed to decode test image '\(path)'")
+        }
+
+        let results:[(time:Int, size:Int, hash:Int)] = (0 ..< trials).map
+        {
+            _ in
+            // sleep for 0.1s between runs to emulate a “cold” start
+            nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
+            var buffers:PNG.EncodingBuffers = .init()
+            var blobs:[Blob] = .init(repeating: .init(), count: count)
+            do
+            {
+                let start:Int = clock()
+                for i:Int in blobs.indices
+                {
+                    if  reusing
+                    {
+                        try image.compress(stream: &blobs[i], search: search,
+                            reusing: &buffers)
+                    }
+                    else
+                    {
+                        try image.compress(stream: &blobs[i], search: search)
+                    }
+                }
+                let stop:Int = clock()
 
-                try image.compress(stream: &blob, level: level)
+                let buffer:[UInt8] = blobs.last?.buffer ?? []
+                return (stop - start, buffer.count, .init(buffer.last ?? 0))
+            }
+            catch let error
+            {
+                fatalError("\(error)")
+            }
+        }
+
+        return (results.map{ (time: $0.time, hash: $0.hash) }, results.map(\.size).min() ?? 0)
+    }
+}
+extension __Entrypoint.Benchmark.Encode
+{
+    /// Encodes a tall image made of `tiles` copies of the image at `path`, stacked on top
+    /// of each other, and returns the processor time of each trial. If `strip` is nil, the
+    /// tall image is assembled in memory and encoded all at once. Otherwise, it is encoded
+    /// with a ``PNG.EncodingContext``, in strips of `strip` rows, and never exists in
+    /// memory all at once. The timings include assembling the image or the strips.
+    public static
+    func tiled(search:LZ77.DeflatorSearch, path:String, trials:Int, tiles:Int,
+        strip:Int?) -> ([(time:Int, hash:Int)], Int)
+    {
+        guard let image:PNG.Image = try? .decompress(path: path)
+        else
+        {
+            fatalError("failed to decode test image '\(path)'")
+        }
+
+        let layout:PNG.Layout = .init(format: image.layout.format)
+        let pixels:[PNG.RGBA<UInt16>] = image.unpack(as: PNG.RGBA<UInt16>.self)
+        let size:(x:Int, y:Int) = (image.size.x, image.size.y * tiles)
+
+        let results:[(time:Int, size:Int, hash:Int)] = (0 ..< trials).map
+        {
+            _ in
+            // sleep for 0.1s between runs to emulate a “cold” start
+            nanosleep([timespec.init(tv_sec: 0, tv_nsec: 100_000_000)], nil)
+            var sink:Sink = .init()
+            do
+            {
+                let start:Int = clock()
+
+                if  let strip:Int = strip
+                {
+                    var context:PNG.EncodingContext = try .init(stream: &sink,
+                        size: size,
+                        layout: layout,
+                        search: search)
+                    var rows:[PNG.RGBA<UInt16>] = []
+                    for y:Int in stride(from: 0, to: size.y, by: strip)
+                    {
+                        let count:Int = min(strip, size.y - y)
+                        rows.removeAll(keepingCapacity: true)
+                        for row:Int in y ..< y + count
+                        {
+                            let source:Int = row % image.size.y
+                            rows += pixels[source * size.x ..< (source + 1) * size.x]
+                        }
+
+                        try context.push(strip: .init(packing: rows,
+                                size: (x: size.x, y: count),
+                                layout: layout),
+                            stream: &sink)
+                    }
+                    try context.finish(stream: &sink)
+                }
+                else
+                {
+                    let tall:PNG.Image = .init(
+                        packing: [PNG.RGBA<UInt16>].init(
+                            repeatElement(pixels, count: tiles).joined()),
+                        size: size,
+                        layout: layout)
+                    try tall.compress(stream: &sink, search: search)
+                }
 
                 let stop:Int = clock()
-                return (stop - start, blob.buffer.count, .init(blob.buffer.last ?? 0))
+                return (stop - start, sink.count, .init(sink.last))
             }
             catch let error
             {
@@ -0,0 +1,38 @@
+import PNG
+
+struct Blob:PNG.BytestreamSource, PNG.BytestreamDestination
+{
+    private(set)
+    var data:[UInt8],
+        position:Int
+
+    init(_ data:[UInt8] = [])
+    {
+        self.data       = data
+        self.position   = data.startIndex
+    }
+
+    mutating
+    func read(count:Int) -> [UInt8]?
+    {
+        guard self.position + count <= self.data.endIndex
+        else
+        {
+            return nil
+        }
+
+        defer
+        {
+            self.position += count
+        }
+
+        return .init(self.data[self.position ..< self.position + count])
+    }
+
+    mutating
+    func write(_ bytes:[UInt8]) -> Void?
+    {
+        self.data.append(contentsOf: bytes)
+        return ()
+    }
+}
@@ -82,4 +82,37 @@ enum Compression
             #expect(pair.0 == pair.1, "mismatch in pixel \(i)")
         }
     }
+
+    @Test(arguments: [
+            "rgb8-color-photographic",
+            "rgba16-color-photographic",
+        ],
+        [2, 4])
+    static func EncodeParallel(_ name:String, _ threads:Int) throws
+    {
+        let path:(png:String, out:String) =
+        (
+            "Tests/Baselines/\(name).png",
+            "Tests/Outputs/\(name)@\(threads).png"
+        )
+
+        guard let baseline:PNG.Image = try .decompress(path: path.png)
+        else
+        {
+            Issue.record("failed to open file '\(path.png)'")
+            return
+        }
+
+        try baseline.compress(path: path.out, level: 9, threads: threads)
+
+        guard let output:PNG.Image = try .decompress(path: path.out)
+        else
+        {
+            Issue.record("failed to open file '\(path.out)'")
+            return
+        }
+
+        #expect(output.unpack(as: PNG.RGBA<UInt16>.self) ==
+            baseline.unpack(as: PNG.RGBA<UInt16>.self))
+    }
 }
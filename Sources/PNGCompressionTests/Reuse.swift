@@ -0,0 +1,52 @@
+import PNG
+import Testing
+
+@Suite
+enum Reuse
+{
+    @Test(arguments: [4, 9, 13])
+    static func Batch(_ level:Int) throws
+    {
+        //  images of different sizes, formats, and interlacing, so that the buffers have
+        //  to adapt
+        let names:[(String, Bool)] = [
+            ("rgba8-color-photographic", false),
+            ("v8-monochrome-nonphotographic", true),
+            ("indexed8-color-photographic", false),
+            ("rgb16-color-nonphotographic", true),
+            ("rgba8-color-photographic", false),
+        ]
+
+        var encoding:PNG.EncodingBuffers = .init()
+        var decoding:PNG.DecodingBuffers = .init()
+
+        for (name, interlaced):(String, Bool) in names
+        {
+            let path:String = "Tests/Baselines/\(name).png"
+            guard let original:PNG.Image = try .decompress(path: path)
+            else
+            {
+                Issue.record("failed to open file '\(path)'")
+                return
+            }
+
+            let baseline:PNG.Image = original.bindStorage(to: .init(
+                format: original.layout.format,
+                interlaced: interlaced))
+
+            var expected:Blob = .init()
+            try baseline.compress(stream: &expected, level: level)
+
+            var blob:Blob = .init()
+            try baseline.compress(stream: &blob, level: level, reusing: &encoding)
+
+            #expect(blob.data == expected.data, "mismatch in encoded '\(name)'")
+
+            var source:Blob = .init(blob.data)
+            let output:PNG.Image = try .decompress(stream: &source, reusing: &decoding)
+
+            #expect(output.unpack(as: PNG.RGBA<UInt16>.self) ==
+                baseline.unpack(as: PNG.RGBA<UInt16>.self), "mismatch in decoded '\(name)'")
+        }
+    }
+}
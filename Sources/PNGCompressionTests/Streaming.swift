@@ -0,0 +1,53 @@
+import PNG
+import Testing
+
+@Suite
+enum Streaming
+{
+    @Test(arguments: [
+            "rgba8-color-photographic",
+            "rgb16-color-nonphotographic",
+            "rgb8-monochrome-photographic",
+        ],
+        [1, 7, 64])
+    static func Strips(_ name:String, _ height:Int) throws
+    {
+        let path:String = "Tests/Baselines/\(name).png"
+        guard let baseline:PNG.Image = try .decompress(path: path)
+        else
+        {
+            Issue.record("failed to open file '\(path)'")
+            return
+        }
+
+        let layout:PNG.Layout = .init(format: baseline.layout.format)
+        let image:PNG.Image = baseline.bindStorage(to: layout)
+
+        var expected:Blob = .init()
+        try image.compress(stream: &expected, level: 7)
+
+        let pixels:[PNG.RGBA<UInt16>] = image.unpack(as: PNG.RGBA<UInt16>.self)
+
+        var blob:Blob = .init()
+        var context:PNG.EncodingContext = try .init(stream: &blob, size: image.size,
+            layout: layout,
+            metadata: image.metadata,
+            level: 7)
+        for y:Int in stride(from: 0, to: image.size.y, by: height)
+        {
+            let rows:Int = min(height, image.size.y - y)
+            let strip:PNG.Image = .init(
+                packing: [PNG.RGBA<UInt16>].init(
+                    pixels[y * image.size.x ..< (y + rows) * image.size.x]),
+                size: (x: image.size.x, y: rows),
+                layout: layout)
+
+            try context.push(strip: strip, stream: &blob)
+        }
+        try context.finish(stream: &blob)
+
+        #expect(context.rows == image.size.y)
+        //  the strips should be filtered and compressed exactly like the whole image
+        #expect(blob.data == expected.data)
+    }
+}
@@ -76,6 +76,23 @@ enum Roundtripping
         try Self.decode(name, subdirectory: "iOS")
     }
 
+    @Test(arguments: Self.basic)
+    static func DecodeMapped(_ name:String) throws
+    {
+        let path:String = "Sources/PNGIntegrationTests/Inputs/Common/\(name).png"
+        guard
+        let mapped:PNG.Image = try System.File.Map.open(path: path,
+            { try PNG.Image.decompress(stream: &$0) }),
+        let reference:PNG.Image = try .decompress(path: path)
+        else
+        {
+            Issue.record("failed to open file '\(path)'")
+            return
+        }
+
+        #expect(mapped.storage == reference.storage)
+    }
+
 
     @Test(arguments: Self.basic, [4, 7, 10])
     static func EncodeBasic(_ name:String, _ level:Int) throws
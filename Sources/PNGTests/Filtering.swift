@@ -62,5 +62,33 @@ enum Filtering
             #expect(a == b)
         }
     }
+
+    @Test(arguments: [1, 2, 3, 4, 5, 6, 7, 8])
+    static func Vectorized(_ delay:Int)
+    {
+        for filter:UInt8 in 0 ... 4
+        {
+            // include widths that are not a multiple of the vector length, to exercise
+            // the scalar tails of the kernels
+            for pixels:Int in [1, 2, 3, 5, 8, 17, 64, 101]
+            {
+                let last:[UInt8] = [0] + (0 ..< pixels * delay).map
+                {
+                    _ in UInt8.random(in: .min ... .max)
+                }
+                let line:[UInt8] = [filter] + (0 ..< pixels * delay).map
+                {
+                    _ in UInt8.random(in: .min ... .max)
+                }
+
+                var expected:[UInt8] = line
+                var actual:[UInt8] = line
+                PNG.Decoder.defilterScalar(&expected, last: last, delay: delay)
+                PNG.Decoder.defilter(&actual, last: last, delay: delay)
+
+                #expect(expected == actual, "filter \(filter), \(pixels) pixels")
+            }
+        }
+    }
 }
 #endif
@@ -0,0 +1,46 @@
+import PNG
+import Testing
+
+@Suite
+enum Unpacking
+{
+    @Test(arguments: [0, 1, 3, 4, 5, 17, 400])
+    static func RGBA(_ pixels:Int)
+    {
+        Self.test(UInt8.self, pixels: pixels)
+        Self.test(UInt16.self, pixels: pixels)
+        Self.test(UInt32.self, pixels: pixels)
+    }
+
+    /// Checks the built-in unpacking against a reference implementation built from the
+    /// generic ``PNG.convolve(_:of:depth:kernel:)`` functions.
+    private
+    static func test<T>(_:T.Type, pixels:Int) where T:FixedWidthInteger & UnsignedInteger
+    {
+        let rgb8:[UInt8] = (0 ..< pixels * 3).map { _ in .random(in: .min ... .max) }
+        let rgb16:[UInt8] = (0 ..< pixels * 6).map { _ in .random(in: .min ... .max) }
+        let rgba8:[UInt8] = (0 ..< pixels * 4).map { _ in .random(in: .min ... .max) }
+        let rgba16:[UInt8] = (0 ..< pixels * 8).map { _ in .random(in: .min ... .max) }
+
+        #expect(PNG.RGBA<T>.unpack(rgb8, of: .rgb8(palette: [], fill: nil, key: nil)) ==
+            PNG.convolve(rgb8, of: UInt8.self, depth: 8)
+            {
+                (c:(T, T, T), _) in PNG.RGBA<T>.init(c.0, c.1, c.2)
+            })
+        #expect(PNG.RGBA<T>.unpack(rgb16, of: .rgb16(palette: [], fill: nil, key: nil)) ==
+            PNG.convolve(rgb16, of: UInt16.self, depth: 16)
+            {
+                (c:(T, T, T), _) in PNG.RGBA<T>.init(c.0, c.1, c.2)
+            })
+        #expect(PNG.RGBA<T>.unpack(rgba8, of: .rgba8(palette: [], fill: nil)) ==
+            PNG.convolve(rgba8, of: UInt8.self, depth: 8)
+            {
+                (c:(T, T, T, T)) in PNG.RGBA<T>.init(c.0, c.1, c.2, c.3)
+            })
+        #expect(PNG.RGBA<T>.unpack(rgba16, of: .rgba16(palette: [], fill: nil)) ==
+            PNG.convolve(rgba16, of: UInt16.self, depth: 16)
+            {
+                (c:(T, T, T, T)) in PNG.RGBA<T>.init(c.0, c.1, c.2, c.3)
+            })
+    }
+}
@@ -0,0 +1,83 @@
+import sys, json, subprocess
+
+# an implementation that the benchmark harness can build and run. `build` and `invoke` map
+# each supported operation (`decode` or `encode`) to a command. invocation commands may
+# contain the placeholders `{path}`, `{trials}`, and (for `encode`) `{level}`.
+#
+# a decoder must print its run times (in milliseconds), separated by spaces. an encoder
+# must print its run times, followed by a comma, followed by the size of its output in
+# bytes.
+class adapter:
+    def __init__(self, name, label, colors, invoke, build = {}):
+        if '-' in name or ':' in name:
+            print('implementation name \'{0}\' cannot contain \'-\' or \':\''.format(name))
+            sys.exit(-1)
+
+        self.name   = name
+        self.label  = label
+        # the color of the aggregate curve, and the color of the per-image curves
+        self.colors = tuple(colors)
+        self.invoke = {operation: tuple(command) for operation, command in invoke.items()}
+        self.builds = {operation: tuple(command) for operation, command in build.items()}
+
+    def supports(self, operation):
+        return operation in self.invoke
+
+    def build(self, operation):
+        if operation not in self.builds:
+            return
+        invocation = self.builds[operation]
+        print(' '.join(invocation))
+        if subprocess.run(invocation).returncode != 0:
+            sys.exit(-1)
+
+    def invocation(self, operation, path, trials, level = None):
+        return tuple(argument.format(path = path, trials = trials, level = level)
+            for argument in self.invoke[operation])
+
+registry = {}
+
+def register(name, ** properties):
+    registry[name] = adapter(name, ** properties)
+
+def load(path):
+    # registers additional implementations from a json file, which maps implementation
+    # names to objects with the same fields as the arguments of `register`
+    with open(path, 'r') as file:
+        for name, properties in json.load(file).items():
+            register(name, ** properties)
+
+register('swift',
+    label   = 'swift png',
+    colors  = ('#ff694eff', '#ffbf9d80'),
+    build   = {
+        'decode': ('swift', 'build', '-c', 'release', '--product', 'decompression-benchmark'),
+        'encode': ('swift', 'build', '-c', 'release', '--product', 'compression-benchmark'),
+    },
+    invoke  = {
+        'decode': ('.build/release/decompression-benchmark', '{path}', '{trials}'),
+        'encode': ('.build/release/compression-benchmark', '{level}', '{path}', '{trials}'),
+    })
+
+register('libpng',
+    label   = 'libpng',
+    colors  = ('#888888ff', '#dddddd80'),
+    build   = {
+        'decode': ('clang', '-Wall', '-Wpedantic', '-lpng',
+            'Benchmarks/Decompression/C/main.c', '-o', 'Benchmarks/Decompression/C/main'),
+        'encode': ('clang', '-Wall', '-Wpedantic', '-lpng',
+            'Benchmarks/Compression/C/main.c', '-o', 'Benchmarks/Compression/C/main'),
+    },
+    invoke  = {
+        'decode': ('Benchmarks/Decompression/C/main', '{path}', '{trials}'),
+        'encode': ('Benchmarks/Compression/C/main', '{level}', '{path}', '{trials}'),
+    })
+
+# only measures the deflate stream, without chunk parsing, filtering, or pixel conversion
+register('zlib',
+    label   = 'zlib (deflate only)',
+    colors  = ('#4e8cffff', '#9dc1ff80'),
+    invoke  = {
+        'decode': (sys.executable, 'Benchmarks/Decompression/Python/main.py', '{path}', '{trials}'),
+        'encode': (sys.executable, 'Benchmarks/Compression/Python/main.py', '{level}', '{path}', '{trials}'),
+    })
@@ -0,0 +1,175 @@
+import os, sys, platform, subprocess, tempfile
+
+import differentialplot, adapters
+from benchmark_latest       import select_implementations, build_benchmarks
+from benchmark_breakdown    import geometric_mean
+
+metrics     = ('count', 'bytes', 'peak')
+titles      = {
+    'count':    'relative allocation count',
+    'bytes':    'relative bytes allocated',
+    'peak':     'relative peak heap size',
+}
+scopes      = {
+    'count':    'per trial',
+    'bytes':    'per trial',
+    'peak':     'single-trial process',
+}
+source      = 'Benchmarks/Allocations/interposer.c'
+interposer  = 'Benchmarks/Allocations/interposer.so'
+
+def supported():
+    # the interposer is loaded with `LD_PRELOAD` and forwards to the glibc allocator
+    return sys.platform.startswith('linux') and platform.libc_ver()[0] == 'glibc'
+
+def build():
+    invocation = 'clang', '-Wall', '-Wpedantic', '-O2', '-shared', '-fPIC', source, '-o', interposer
+    print(' '.join(invocation))
+    if subprocess.run(invocation).returncode != 0:
+        sys.exit(-1)
+
+def measure(implementation, operation, path, trials, level = None):
+    invocation  = implementation.invocation(operation,
+        path    = path,
+        trials  = trials,
+        level   = level)
+
+    print(' '.join(invocation))
+    with tempfile.TemporaryDirectory() as directory:
+        output      = os.path.join(directory, 'allocations')
+        environment = dict(os.environ,
+            LD_PRELOAD          = os.path.abspath(interposer),
+            ALLOCATIONS_OUTPUT  = output)
+        result      = subprocess.run(invocation, capture_output = True, env = environment)
+        if result.returncode != 0:
+            print(result.stderr.decode('utf-8'), end = '')
+            return None
+
+        # the benchmark process exits last, so its line comes last
+        with open(output, 'r') as file:
+            * _, line = (line for line in file.read().split('\n') if line)
+        return tuple(map(int, line.split()))
+
+def collect_series(implementation, operation, path, level = None):
+    # a benchmark process also allocates memory to load the test image (and, for the
+    # encoders, to decode it), so we run it once with one trial and once with two, and
+    # attribute the difference to a single trial. the peak heap size cannot be separated
+    # this way, so it covers the whole single-trial process.
+    one = measure(implementation, operation, path, trials = 1, level = level)
+    two = measure(implementation, operation, path, trials = 2, level = level)
+    if one is None or two is None:
+        return None
+
+    print('{0} allocations, {1} bytes, {2} bytes peak'.format(two[0] - one[0], two[1] - one[1], one[2]))
+    return two[0] - one[0], two[1] - one[1], one[2]
+
+def collect_data(images, paths, baselines, levels):
+    build()
+    data = {}
+    for operation, levels in (('decode', (None,)), ('encode', levels)):
+        implementations = select_implementations(operation, baselines)
+        build_benchmarks(operation, implementations)
+        for level in levels:
+            for name, implementation in implementations.items():
+                for image, path in zip(images, paths):
+                    result = collect_series(implementation, operation, path, level = level)
+                    if result is not None:
+                        data[operation, level, name, image] = result
+    return data
+
+def save_data(data):
+    return ''.join('{0}:{1}:{2}:{3}:{4} {5} {6}\n'.format(operation,
+            '' if level is None else level,
+            name,
+            image,
+            * values )
+        for (operation, level, name, image), values in data.items())
+
+def load_data(string):
+    return {(operation, int(level) if level else None, name, image): tuple(map(int, values.split()))
+        for operation, level, name, image, values in (tuple(line.split(':'))
+        for line in string.split('\n') if line)}
+
+def compare(data, operation, level, reference):
+    # one mapping of images to ratios for each metric. images that the reference does not
+    # allocate anything for have no ratio
+    return tuple({image: subject[metric] / baseline[metric]
+            for (o, l, name, image), subject in data.items()
+            if (o, l, name) == (operation, level, 'swift')
+            for baseline in (data.get((operation, level, reference, image)),)
+            if baseline is not None and baseline[metric] > 0}
+        for metric in range(len(metrics)))
+
+def scale(ratios):
+    # allocation counts can differ by orders of magnitude, so pick the smallest range
+    # from a fixed set of steps that still fits every ratio
+    largest = max(ratios.values(), default = 1)
+    for step in (0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000):
+        if step * 10 >= max(largest * 1.05, 2):
+            break
+    return (0, step * 10), step
+
+def relative(x):
+    return 'n/a' if x is None else '{0:.2f}x'.format(x)
+
+def generate_table(rows):
+    header      = '| Operation | Allocations | Bytes allocated | Peak heap |'
+    separator   = '| --------- | ----------- | --------------- | --------- |'
+    lines       = ('| {0} | {1} | {2} | {3} |'.format(name, * map(relative, ratios))
+        for name, ratios in rows)
+
+    return '\n'.join((header, separator, * lines ))
+
+def benchmark(images, save, load, prefix, pipeline, baselines = ('libpng',), levels = range(10), level = 9):
+    paths       = tuple('Tests/Baselines/{0}.png'.format(image) for image in images)
+    cache       = '{0}/allocations.data'.format(prefix)
+    reference   = baselines[0]
+
+    if load:
+        with open(cache, 'r') as file:
+            data    = load_data(file.read())
+        levels      = sorted({l for operation, l, name, image in data if operation == 'encode'})
+    else:
+        data        = collect_data(images, paths, baselines, levels)
+        if save:
+            with open(cache, 'w') as file:
+                file.write(save_data(data))
+
+    label   = adapters.registry[reference].label
+    colors  = {
+        'color_fill_worse':     adapters.registry[reference].colors[0],
+        'color_fill_better':    '#ff694eff',
+        'color_worse':          '#666666ff',
+        'color_better':         '#ff694eff',
+    }
+
+    decoding    = compare(data, 'decode', None, reference)
+    encoding    = {l: compare(data, 'encode', l, reference) for l in levels}
+
+    fields  = {
+        'allocations_level'     : level,
+        'allocations_reference' : label,
+    }
+    plotted = (
+        ('decode',  'decoding',                         decoding),
+        (level,     'encoding, level {0}'.format(level), encoding.get(level, ({},) * len(metrics))))
+    for key, operation, ratios in plotted:
+        for metric, series in zip(metrics, ratios):
+            output              = '{0}/allocations-{1}@{2}.svg'.format(prefix, metric, key)
+            range_x, major      = scale(series)
+            pipeline.plot(output, differentialplot.plot, ratios = series,
+                range_x     = range_x,
+                major       = major,
+                minor       = 5,
+                title       = '{0} ({1})'.format(titles[metric], operation),
+                subtitle    = 'swift png / {0}, {1}'.format(label, scopes[metric]),
+                colors      = colors)
+
+            fields['plot_allocations_{0}@{1}'.format(metric, key)]  = output
+            fields['allocations_{0}@{1}'.format(metric, key)]       = relative(geometric_mean(tuple(series.values())))
+
+    rows    = (('decode', decoding),) + tuple(('encode (level {0})'.format(l), encoding[l]) for l in levels)
+    fields['allocations_table'] = generate_table(tuple((name, tuple(geometric_mean(tuple(series.values()))
+            for series in ratios))
+        for name, ratios in rows))
+    return fields
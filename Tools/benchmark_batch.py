@@ -0,0 +1,105 @@
+import sys, subprocess
+
+from benchmark_latest import median, percent
+
+# the one-shot api comes first in each tuple, it is the reference for the reusing api
+modes = ('oneshot', 'reusing')
+
+def build(product):
+    invocation  = 'swift', 'build', '-c', 'release', '--product', product
+    print(' '.join(invocation))
+    if subprocess.run(invocation).returncode != 0:
+        sys.exit(-1)
+    return '.build/release/{0}'.format(product)
+
+def collect_series(invocation, trials):
+    remaining   = trials
+    series      = []
+    while remaining > 0:
+        count   = str(min(remaining, 10))
+        command = tuple(count if argument is None else argument for argument in invocation)
+
+        print(' '.join(command))
+        result  = subprocess.run(command, capture_output = True)
+        if result.returncode == 0:
+            string = result.stdout.decode('utf-8')
+            print(string, end = '')
+            # compression benchmarks also print a file size, which we do not need here
+            series.extend(map(float, string.split(',')[0].split()))
+        else:
+            print(result.stderr.decode('utf-8'), end = '')
+
+        remaining -= 10
+    return tuple(series)
+
+def collect_data(trials, images, paths, level, batch):
+    decoder = build('decompression-benchmark')
+    encoder = build('compression-benchmark')
+
+    series = {}
+    for image, path in zip(images, paths):
+        for mode in modes:
+            flags = ('-n', str(batch)) + (('-r',) if mode == 'reusing' else ())
+            series['decode-{0}'.format(mode), image] = collect_series(
+                (decoder, path, None) + flags, trials[0])
+            series['encode-{0}'.format(mode), image] = collect_series(
+                (encoder, str(level), path, None) + flags, trials[1])
+    return series
+
+def save_data(series):
+    return ''.join('{0}:{1}:{2}\n'.format(mode, image, ' '.join(map(str, series)))
+        for (mode, image), series in series.items())
+
+def load_data(string):
+    return {(mode, image): tuple(map(float, series.split()))
+        for mode, image, series in (tuple(line.split(':'))
+        for line in string.split('\n') if line)}
+
+def amortized(series, images, operation):
+    # median per-image time of each api, within a batch
+    return {mode: {image: median(series['{0}-{1}'.format(operation, mode), image])
+            for image in images}
+        for mode in modes}
+
+def generate_table(images, decode, encode):
+    header      = '| Test image | Decode | Decode (reusing) | Encode | Encode (reusing) |'
+    separator   = '| ---------- | ------ | ---------------- | ------ | ---------------- |'
+    rows        = ('| `{0}` | {1:.3f} ms | {2:.3f} ms ({3:+.1f}%) | {4:.3f} ms | {5:.3f} ms ({6:+.1f}%) |'.format(
+            image,
+            decode['oneshot'][image],
+            decode['reusing'][image],
+            100 * (decode['reusing'][image] / decode['oneshot'][image] - 1),
+            encode['oneshot'][image],
+            encode['reusing'][image],
+            100 * (encode['reusing'][image] / encode['oneshot'][image] - 1))
+        for image in images)
+
+    return '\n'.join((header, separator, * rows ))
+
+def benchmark(trials, images, save, load, prefix, level = 9, batch = 16):
+    paths = tuple('Tests/Baselines/{0}.png'.format(image) for image in images)
+    cache = '{0}/batch.data'.format(prefix)
+
+    if load:
+        with open(cache, 'r') as file:
+            series = load_data(file.read())
+    else:
+        series = collect_data(trials, images, paths, level, batch)
+        if save:
+            with open(cache, 'w') as file:
+                file.write(save_data(series))
+
+    decode = amortized(series, images, 'decode')
+    encode = amortized(series, images, 'encode')
+
+    def savings(times):
+        return median(tuple(1 - times['reusing'][image] / times['oneshot'][image]
+            for image in images))
+
+    return {
+        'batch_level'           : level,
+        'batch_size'            : batch,
+        'batch_table'           : generate_table(images, decode, encode),
+        'batch_decode_savings'  : percent(savings(decode)),
+        'batch_encode_savings'  : percent(savings(encode)),
+    }
@@ -0,0 +1,96 @@
+import math
+
+import heatmap, adapters
+
+def classify(image):
+    # test image names have the form `<format>-<color>-<content>`, for example
+    # `rgba16-color-photographic`, where the format includes the bit depth
+    return tuple(image.split('-'))
+
+def order(format):
+    # sort by color format, and then by bit depth
+    family = format.rstrip('0123456789')
+    return family, int(format[len(family):] or 0)
+
+def groups(images):
+    classes = tuple(map(classify, images))
+    formats = sorted({format for format, _, _ in classes}, key = order)
+    colors  = sorted({color for _, color, _ in classes})
+    content = sorted({content for _, _, content in classes})
+    # a group of `None` separates the formats from the content classes
+    return tuple((format, tuple(image for image, (f, _, _) in zip(images, classes) if f == format))
+            for format in formats) + ((None, ()),) + \
+        tuple((color, tuple(image for image, (_, c, _) in zip(images, classes) if c == color))
+            for color in colors) + ((None, ()),) + \
+        tuple((kind, tuple(image for image, (_, _, k) in zip(images, classes) if k == kind))
+            for kind in content)
+
+def geometric_mean(values):
+    return math.exp(sum(map(math.log, values)) / len(values)) if values else None
+
+def aggregate(groups, columns):
+    # each column maps images to ratios. images without a ratio do not count towards
+    # their group
+    return [[geometric_mean(tuple(column[image] for image in members if image in column))
+            for column in columns]
+        for name, members in groups]
+
+def plots(images, decoding, encoding, sizes, reference):
+    # `decoding` maps images to the median relative decoding time of each image, while
+    # `encoding` and `sizes` contain one such mapping for each compression level
+    rows    = groups(images)
+    label   = adapters.registry[reference].label
+    colors  = {
+        'color_neutral':    '#ffffffff',
+        'color_better':     '#ff694eff',
+        'color_worse':      adapters.registry[reference].colors[0],
+    }
+
+    speed   = aggregate(rows, (decoding, * encoding ))
+    size    = aggregate(rows, sizes)
+
+    def slowest(column):
+        # only rank the formats, which come before the first separator
+        formats = rows[:tuple(name for name, _ in rows).index(None)]
+        ranked  = sorted(((ratios[column], name) for (name, _), ratios in zip(formats, speed)
+                if ratios[column] is not None),
+            reverse = True)
+        return '`{0}` ({1:.2f}x)'.format(ranked[0][1], ranked[0][0]) if ranked else 'n/a'
+
+    return (
+        dict(values     = speed,
+            rows        = tuple(name for name, _ in rows),
+            columns     = ('decode', * map(str, range(len(encoding))) ),
+            spread      = 4.0,
+            title       = 'relative run time by image format',
+            subtitle    = 'swift png time / {0} time, geometric mean of per-image medians'.format(label),
+            label_x     = 'decoding, and encoding at each compression level',
+            colors      = colors),
+
+        dict(values     = size,
+            rows        = tuple(name for name, _ in rows),
+            columns     = tuple(map(str, range(len(sizes)))),
+            spread      = 1.5,
+            title       = 'relative file size by image format',
+            subtitle    = 'swift png size / {0} size, geometric mean across images'.format(label),
+            label_x     = 'compression level',
+            colors      = colors),
+
+        slowest(0),
+        slowest(len(encoding)))
+
+def benchmark(images, decoding, encoding, sizes, prefix, pipeline, reference = 'libpng'):
+    plot_speed, plot_size, slowest_decode, slowest_encode = plots(images,
+        decoding, encoding, sizes, reference)
+
+    fields = {
+        'plot_breakdown_speed'      : '{0}/breakdown-speed.svg'.format(prefix),
+        'plot_breakdown_size'       : '{0}/breakdown-size.svg'.format(prefix),
+        'breakdown_slowest_decode'  : slowest_decode,
+        'breakdown_slowest_encode'  : slowest_encode,
+        'breakdown_level'           : len(encoding) - 1,
+        'breakdown_reference'       : adapters.registry[reference].label,
+    }
+    pipeline.plot(fields['plot_breakdown_speed'], heatmap.plot, ** plot_speed)
+    pipeline.plot(fields['plot_breakdown_size'],  heatmap.plot, ** plot_size)
+    return fields
@@ -0,0 +1,209 @@
+import os, sys, math, json, subprocess, tempfile
+import xml.etree.ElementTree as xml
+
+import adapters
+
+# `time` is in milliseconds, `memory` is peak resident set size in kilobytes, and `size`
+# is the size of the encoded output in bytes
+metrics = ('time', 'memory', 'size')
+
+def operations(levels):
+    return ('decode', * ('encode@{0}'.format(level) for level in levels))
+
+def run(implementation, operation, path):
+    name, _, level  = operation.partition('@')
+    invocation      = implementation.invocation(name, path = path, trials = 1, level = level or None)
+
+    print(' '.join(invocation))
+    # `subprocess.run` (and `communicate`) reap the child process without reporting its
+    # resource usage, so we reap it ourselves with `wait4`. the output goes to temporary
+    # files rather than pipes, so that a child cannot block on a full pipe while we wait
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        process     = subprocess.Popen(invocation, stdout = out, stderr = err)
+        _, status, usage    = os.wait4(process.pid, 0)
+        process.returncode  = os.waitstatus_to_exitcode(status)
+
+        out.seek(0)
+        err.seek(0)
+        stdout      = out.read().decode('utf-8')
+        stderr      = err.read().decode('utf-8')
+
+    if process.returncode != 0:
+        print(stderr, end = '')
+        sys.exit(-1)
+
+    print(stdout, end = '')
+    times, * tail   = stdout.split(',')
+    # macOS reports `ru_maxrss` in bytes, linux reports it in kilobytes
+    memory          = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return float(times.split()[0]), memory, int(tail[0]) if tail else None
+
+def collect_data(implementation, images, levels, trials):
+    # every trial runs in its own process, so that each one yields a memory measurement
+    implementation.build('decode')
+    implementation.build('encode')
+
+    results = {}
+    for image in images:
+        path = 'Tests/Baselines/{0}.png'.format(image)
+        for operation in operations(levels):
+            samples = tuple(zip( * (run(implementation, operation, path) for _ in range(trials))))
+            for metric, series in zip(metrics, samples):
+                if all(value is not None for value in series):
+                    results[operation, image, metric] = series
+    return results
+
+def save_data(results):
+    return ''.join('{0}:{1}:{2}:{3}\n'.format(operation, image, metric, ' '.join(map(str, series)))
+        for (operation, image, metric), series in results.items())
+
+def load_data(string):
+    return {(operation, image, metric): tuple(map(float, series.split()))
+        for operation, image, metric, series in (tuple(line.split(':'))
+        for line in string.split('\n') if line)}
+
+def median(series):
+    series = sorted(series)
+    middle = len(series) // 2
+    return series[middle] if len(series) % 2 else (series[middle - 1] + series[middle]) / 2
+
+def mann_whitney(a, b):
+    # two-sided mann-whitney u test, using the normal approximation with a correction
+    # for ties. returns the u statistic of `b` relative to `a`, and the p-value
+    pooled  = sorted((value, group) for group, series in enumerate((a, b)) for value in series)
+    ranks   = [0.0] * len(pooled)
+    ties    = 0
+    i       = 0
+    while i < len(pooled):
+        j = i
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j):
+            ranks[k] = (i + j + 1) / 2
+        ties += (j - i) ** 3 - (j - i)
+        i = j
+
+    m, n    = len(a), len(b)
+    u       = sum(rank for rank, (value, group) in zip(ranks, pooled) if group == 1) - n * (n + 1) / 2
+    mean    = m * n / 2
+    var     = m * n / 12 * ((m + n + 1) - ties / ((m + n) * (m + n - 1)))
+    if var <= 0:
+        # every measurement is identical
+        return u, 1.0
+    z       = (abs(u - mean) - 0.5) / math.sqrt(var)
+    return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+def test(baseline, current, metric, tolerance, alpha):
+    before  = median(baseline)
+    after   = median(current)
+    change  = after / before - 1 if before else 0.0
+
+    if metric == 'size':
+        # encoder output is deterministic, so any change is significant
+        delta   = (after > before) - (after < before)
+        p       = 0.0 if after != before else 1.0
+    else:
+        u, p    = mann_whitney(baseline, current)
+        # cliff’s delta: the probability that a current sample is larger than a baseline
+        # sample, minus the probability that it is smaller
+        delta   = 2 * u / (len(baseline) * len(current)) - 1
+
+    if p < alpha and change > tolerance:
+        verdict = 'regression'
+    elif p < alpha and change < -tolerance:
+        verdict = 'improvement'
+    else:
+        verdict = 'unchanged'
+
+    return {
+        'baseline'  : before,
+        'current'   : after,
+        'change'    : change,
+        'delta'     : delta,
+        'p'         : p,
+        'verdict'   : verdict,
+    }
+
+def compare(baseline, current, tolerances, alpha):
+    results = []
+    for key in sorted(baseline.keys() | current.keys()):
+        operation, image, metric = key
+        if key in baseline and key in current:
+            result = test(baseline[key], current[key], metric, tolerances[metric], alpha)
+        else:
+            # a measurement that only one of the sets contains cannot be compared, but it
+            # must not disappear from the verdict either
+            result = {
+                'baseline'  : median(baseline[key]) if key in baseline else None,
+                'current'   : median(current[key]) if key in current else None,
+                'change'    : None,
+                'delta'     : None,
+                'p'         : None,
+                'verdict'   : 'missing' if key in baseline else 'added',
+            }
+        results.append({'operation': operation, 'image': image, 'metric': metric, ** result})
+    return results
+
+def count(results, verdict):
+    return sum(result['verdict'] == verdict for result in results)
+
+def describe(result):
+    if result['verdict'] == 'missing':
+        return '{0} only measured in the baseline ({1:g})'.format(result['metric'], result['baseline'])
+    if result['verdict'] == 'added':
+        return '{0} only measured in the current set ({1:g})'.format(result['metric'], result['current'])
+    return '{0} changed by {1:+.2%} ({2:g} -> {3:g}, delta = {4:+.3f}, p = {5:.4f})'.format(
+        result['metric'], result['change'], result['baseline'], result['current'],
+        result['delta'], result['p'])
+
+def generate_json(results, tolerances, alpha):
+    return json.dumps({
+        'alpha'         : alpha,
+        'tolerances'    : tolerances,
+        'regressions'   : count(results, 'regression'),
+        'improvements'  : count(results, 'improvement'),
+        'missing'       : count(results, 'missing'),
+        'added'         : count(results, 'added'),
+        'results'       : results,
+    }, indent = 4) + '\n'
+
+def generate_junit(results):
+    suite = xml.Element('testsuite',
+        name        = 'benchmark-regressions',
+        tests       = str(len(results)),
+        failures    = str(count(results, 'regression') + count(results, 'missing')))
+    for result in results:
+        case = xml.SubElement(suite, 'testcase',
+            classname   = '{0}.{1}'.format(result['operation'], result['metric']),
+            name        = result['image'])
+        message = describe(result)
+        if result['verdict'] in ('regression', 'missing'):
+            xml.SubElement(case, 'failure', message = message, type = result['verdict'])
+        else:
+            xml.SubElement(case, 'system-out').text = '{0}: {1}'.format(result['verdict'], message)
+    return xml.tostring(suite, encoding = 'unicode') + '\n'
+
+def report(results):
+    lines = []
+    headings = {
+        'regression'    : 'regressions:',
+        'missing'       : 'missing from the current set:',
+        'improvement'   : 'improvements:',
+        'added'         : 'missing from the baseline:',
+    }
+    for verdict, heading in headings.items():
+        selected = tuple(result for result in results if result['verdict'] == verdict)
+        if not selected:
+            continue
+        lines.extend((heading, ''))
+        lines.extend('-   `{0}` ({1}): {2}'.format(result['image'], result['operation'], describe(result))
+            for result in selected)
+        lines.append('')
+
+    lines.append('{0} comparisons, {1} regressions, {2} improvements, {3} missing, {4} added'.format(
+        len(results) - count(results, 'missing') - count(results, 'added'),
+        count(results, 'regression'),
+        count(results, 'improvement'),
+        count(results, 'missing'),
+        count(results, 'added')))
+    return '\n'.join(lines) + '\n'
@@ -1,5 +1,8 @@
 from differentialplot   import plot as differentialplot
-from toolchain          import toolchain, compression_benchmark
+from toolchain          import toolchain
+from benchmark_latest   import collect_series
+
+import adapters
 
 def percent(x):
     return '{0} percent'.format(round(x * 100, 2))
@@ -16,7 +19,7 @@ def load_data(string, images):
     return tuple({image: entries[level, image] for image in images}
         for level in range(10, 14))
 
-def benchmark(images, save, load, prefix):
+def benchmark(images, save, load, prefix, pipeline, reference = 'libpng'):
     paths   = tuple('Tests/Baselines/{0}.png'.format(image) for image in images)
     cache   = '{0}/crunch.data'.format(prefix)
 
@@ -24,8 +27,9 @@ def benchmark(images, save, load, prefix):
         with open(cache, 'r') as file:
             series = load_data(file.read(), images)
     else:
-        libpng      = compression_benchmark('c', '.build-historical/clang')
-        baseline    =       {image:   libpng.collect_data(path, level = 9,     trials = 1)['size']
+        implementation = adapters.registry[reference]
+        implementation.build('encode')
+        baseline    =       {image: collect_series(implementation, 'encode', path, level = 9, trials = 1)[1]
             for image, path in zip(images, paths)}
         with toolchain() as swiftpng:
             swift   = tuple({image: swiftpng.collect_data(path, level = level, trials = 1)['size']
@@ -39,23 +43,20 @@ def benchmark(images, save, load, prefix):
 
     fields = {}
     for level, series in zip(range(10, 14), series):
-        plot = differentialplot(series,
+        output = '{0}/compression-size@{1}.svg'.format(prefix, level)
+        pipeline.plot(output, differentialplot, ratios = series,
             range_x     = (0, 1.8),
             major       = 0.2,
             minor       = 4,
             title       = 'relative file size (level {0})'.format(level),
-            subtitle    = 'swift png size / best libpng size ',
+            subtitle    = 'swift png size / best {0} size '.format(adapters.registry[reference].label),
             colors      = {
-                'color_fill_worse':     '#888888ff',
+                'color_fill_worse':     adapters.registry[reference].colors[0],
                 'color_fill_better':    '#ff694eff',
                 'color_worse':          '#666666ff',
                 'color_better':         '#ff694eff',
             })
 
-        output = '{0}/compression-size@{1}.svg'.format(prefix, level)
-        with open(output, 'w') as file:
-            file.write(plot)
-
         fields['plot_compression_ratio@{0}'.format(level)] = output
         fields['rgb8_compression_ratio@{0}'.format(level)] = percent(series['rgb8-color-photographic'])
 
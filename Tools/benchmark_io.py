@@ -0,0 +1,113 @@
+import sys, subprocess
+
+from benchmark_latest import median, percent
+
+# the codec-only mode comes first in each tuple; the others include some form of file i/o
+decoders = ('blob', 'path', 'map')
+encoders = ('memory', 'path')
+
+def build(product):
+    invocation  = 'swift', 'build', '-c', 'release', '--product', product
+    print(' '.join(invocation))
+    if subprocess.run(invocation).returncode != 0:
+        sys.exit(-1)
+    return '.build/release/{0}'.format(product)
+
+def collect_series(invocation, trials):
+    remaining   = trials
+    series      = []
+    while remaining > 0:
+        count   = str(min(remaining, 10))
+        command = tuple(count if argument is None else argument for argument in invocation)
+
+        print(' '.join(command))
+        result  = subprocess.run(command, capture_output = True)
+        if result.returncode != 0:
+            print(result.stderr.decode('utf-8'), end = '')
+            sys.exit(-1)
+
+        string = result.stdout.decode('utf-8')
+        print(string, end = '')
+        # compression benchmarks also print a file size, which we do not need here
+        series.extend(map(float, string.split(',')[0].split()))
+
+        remaining -= 10
+    return tuple(series)
+
+def collect_data(trials, images, paths, level):
+    decoder     = build('decompression-benchmark')
+    encoder     = build('compression-benchmark')
+    # the file is overwritten by every trial, so it never grows past one image
+    destination = '.build/io-benchmark.png'
+
+    # processor time leaves out time spent waiting for the file system, so every mode,
+    # including the codec-only ones, is measured in wall-clock time (`-w`)
+    series = {}
+    for image, path in zip(images, paths):
+        for mode in decoders:
+            series['decode-{0}'.format(mode), image] = collect_series(
+                (decoder, path, None, mode, '-w'), trials[0])
+        for mode in encoders:
+            invocation = (encoder, str(level), path, None) + ((destination,) if mode == 'path' else ()) + ('-w',)
+            series['encode-{0}'.format(mode), image] = collect_series(invocation, trials[1])
+    return series
+
+def save_data(series):
+    return ''.join('{0}:{1}:{2}\n'.format(mode, image, ' '.join(map(str, series)))
+        for (mode, image), series in series.items())
+
+def load_data(string):
+    return {(mode, image): tuple(map(float, series.split()))
+        for mode, image, series in (tuple(line.split(':'))
+        for line in string.split('\n') if line)}
+
+def overheads(series, images, operation, modes):
+    # i/o overhead is the difference between the median run time of each file-based mode
+    # and the median run time of the codec-only mode, which never touches the file system
+    codec = {image: median(series['{0}-{1}'.format(operation, modes[0]), image])
+        for image in images}
+    return codec, {mode: {image: median(series['{0}-{1}'.format(operation, mode), image]) - codec[image]
+            for image in images}
+        for mode in modes[1:]}
+
+def generate_table(images, decode, encode):
+    (decode_codec, decode_io), (encode_codec, encode_io) = decode, encode
+    header      = '| Test image | Decode | `path` | `map` | Encode | `path` |'
+    separator   = '| ---------- | ------ | ------ | ----- | ------ | ------ |'
+    rows        = ('| `{0}` | {1:.3f} ms | {2:+.3f} ms | {3:+.3f} ms | {4:.3f} ms | {5:+.3f} ms |'.format(
+            image,
+            decode_codec[image],
+            decode_io['path'][image],
+            decode_io['map'][image],
+            encode_codec[image],
+            encode_io['path'][image])
+        for image in images)
+
+    return '\n'.join((header, separator, * rows ))
+
+def benchmark(trials, images, save, load, prefix, level = 9):
+    paths = tuple('Tests/Baselines/{0}.png'.format(image) for image in images)
+    cache = '{0}/io.data'.format(prefix)
+
+    if load:
+        with open(cache, 'r') as file:
+            series = load_data(file.read())
+    else:
+        series = collect_data(trials, images, paths, level)
+        if save:
+            with open(cache, 'w') as file:
+                file.write(save_data(series))
+
+    decode = overheads(series, images, 'decode', decoders)
+    encode = overheads(series, images, 'encode', encoders)
+
+    def relative(codec, io):
+        return median(tuple(io[image] / codec[image] for image in images))
+
+    return {
+        'io_level'                  : level,
+        'io_table'                  : generate_table(images, decode, encode),
+        'io_decode_path_overhead'   : percent(relative(decode[0], decode[1]['path'])),
+        'io_decode_map_overhead'    : percent(relative(decode[0], decode[1]['map'])),
+        'io_encode_path_overhead'   : percent(relative(encode[0], encode[1]['path'])),
+    }
@@ -1,27 +1,37 @@
 import sys, os, subprocess
 
-import densityplot, differentialplot
-
-def build_benchmarks(prefix, suffix):
-    baseline    = '{0}/C/main'.format(prefix)
-    swift       = '.build/release/{0}'.format(suffix)
-
-    build_c_invocation      = ('clang', '-Wall', '-Wpedantic', '-lpng',
-        '{0}.c'.format(baseline), '-o', baseline)
-    print(' '.join(build_c_invocation))
-    build_c                 = subprocess.run(build_c_invocation)
-
-    if build_c.returncode != 0:
-        sys.exit(-1)
-
-    build_swift_invocation  = 'swift', 'build', '-c', 'release', '--product', suffix
-
-    print(' '.join(build_swift_invocation))
-    build_swift             = subprocess.run(build_swift_invocation)
-    if build_swift.returncode != 0:
+import densityplot, differentialplot, adapters, benchmark_breakdown
+
+def build_benchmarks(operation, implementations):
+    for implementation in implementations.values():
+        implementation.build(operation)
+
+def select_implementations(operation, baselines):
+    # the subject of the benchmark always comes first, followed by the baselines in the
+    # order they were requested. the first baseline is the reference for normalization
+    selected    = {'swift': adapters.registry['swift']}
+    for name in baselines:
+        if name not in adapters.registry:
+            print('unknown implementation \'{0}\' (available: {1})'.format(name,
+                ', '.join(adapters.registry)))
+            sys.exit(-1)
+        if adapters.registry[name].supports(operation):
+            selected[name] = adapters.registry[name]
+    return selected
+
+def check_reference(baselines, operations = ('decode', 'encode')):
+    # everything is normalized to the reference, so it has to support every operation,
+    # which `select_implementations` would otherwise skip
+    reference, *_ = baselines
+    if reference not in adapters.registry:
+        print('unknown implementation \'{0}\' (available: {1})'.format(reference,
+            ', '.join(adapters.registry)))
         sys.exit(-1)
-
-    return baseline, swift
+    for operation in operations:
+        if not adapters.registry[reference].supports(operation):
+            print('reference implementation \'{0}\' does not support \'{1}\' (the first baseline must support: {2})'.format(
+                reference, operation, ', '.join(operations)))
+            sys.exit(-1)
 
 def generate_test_image_table(images, paths):
     header      =  '| Test image | Size |'
@@ -38,78 +48,74 @@ def median(series):
 def percent(x):
     return '{0} percent'.format(round(x * 100, 2))
 
-def assign_colors(images):
-    solid   = [('swift', '#ff694eff'), ('baseline', '#888888ff')]
+def assign_colors(images, implementations):
+    solid   = [(name, implementation.colors[0]) for name, implementation in implementations.items()]
     dashed  = []
-    for name in images:
-        name_baseline           = 'baseline-{0}'.format(name)
-        name_swift              = 'swift-{0}'.format(name)
+    for image in images:
+        # draw the swift curves on top of the baseline curves
+        for name, implementation in reversed(implementations.items()):
+            if name == 'swift' and image == 'rgb8-color-photographic':
+                dashed.append(('{0}-{1}'.format(name, image), implementation.colors[0]))
+            else:
+                solid.append(('{0}-{1}'.format(name, image), implementation.colors[1]))
 
-        solid.append((name_baseline, '#dddddd80'))
-        if name == 'rgb8-color-photographic':
-            dashed.append((name_swift, '#ff694eff'))
+    return tuple((name, color, 'dashed') for name, color in dashed) + tuple((name, color, 'solid') for name, color in solid)
+
+def assign_legend(implementations):
+    return tuple((name, implementation.label)
+        for name, implementation in reversed(implementations.items()))
+
+def collect_series(implementation, operation, path, trials, level = None):
+    remaining   = trials
+    series      = []
+    size        = None
+    while remaining > 0:
+        invocation  = implementation.invocation(operation,
+            path    = path,
+            trials  = min(remaining, 10),
+            level   = level)
+
+        print(' '.join(invocation))
+        result      = subprocess.run(invocation, capture_output = True)
+
+        if result.returncode == 0:
+            string = result.stdout.decode('utf-8')
+            print(string, end = '')
+
+            times, * tail   = string.split(',')
+            size            = int(tail[0]) if tail else None
+            series.extend(map(float, times.split()))
         else:
-            solid.append((name_swift, '#ffbf9d80'))
+            print(result.stderr.decode('utf-8'), end = '')
 
-    return tuple((name, color, 'dashed') for name, color in dashed) + tuple((name, color, 'solid') for name, color in solid)
+        remaining -= 10
+    return series, size
 
-def compression_collect_data_for_level(level, images, paths, baseline, swift, trials):
-    series  = {'baseline': [], 'swift': []}
+def collect_data(operation, images, paths, implementations, reference, trials, level = None):
+    series  = {name: [] for name in implementations}
     sizes   = {}
     for image, path in zip(images, paths):
-        name_baseline           = 'baseline-{0}'.format(image)
-        name_swift              = 'swift-{0}'.format(image)
-
-        remaining       = trials
-        series_baseline = []
-        series_swift    = []
-        while remaining > 0:
-            count               = min(remaining, 10)
-            baseline_invocation = baseline, str(level), path, str(count)
-            swift_invocation    = swift,    str(level), path, str(count)
-
-            print(' '.join(baseline_invocation))
-            baseline_result     = subprocess.run(baseline_invocation, capture_output = True)
-
-            if baseline_result.returncode == 0:
-                string = baseline_result.stdout.decode('utf-8')
-                print(string, end = '')
-
-                times, size             = string.split(',')
-                sizes[name_baseline]    = int(size)
-                series_baseline.extend(map(float, times.split()))
-            else:
-                print(baseline_result.stderr.decode('utf-8'), end = '')
-
-            print(' '.join(swift_invocation))
-            swift_result        = subprocess.run(swift_invocation, capture_output = True)
-
-            if swift_result.returncode == 0:
-                string = swift_result.stdout.decode('utf-8')
-                print(string, end = '')
-
-                times, size             = string.split(',')
-                sizes[name_swift]       = int(size)
-                series_swift.extend(map(float, times.split()))
-            else:
-                print(swift_result.stderr.decode('utf-8'), end = '')
-
-            remaining -= 10
-
-        # normalize to median of the baseline series
-        median                  = sorted(series_baseline)[len(series_baseline) // 2]
-        series[name_baseline]   = tuple(x / median for x in series_baseline)
-        series[name_swift]      = tuple(x / median for x in series_swift)
-
-        series['baseline'].extend(series[name_baseline])
-        series['swift'].extend(   series[name_swift])
-
-    return {key: (series, sizes[key] if key in sizes else None)
-        for key, series in series.items()}
-
-def compression_collect_data(images, paths, baseline, swift, trials):
-    return tuple(compression_collect_data_for_level(level, images, paths, baseline, swift, trials)
-        for level in range(10))
+        measured = {}
+        for name, implementation in implementations.items():
+            measured[name], size = collect_series(implementation, operation, path, trials,
+                level = level)
+            if size is not None:
+                sizes['{0}-{1}'.format(name, image)] = size
+
+        # normalize to median of the reference series
+        median = sorted(measured[reference])[len(measured[reference]) // 2]
+        for name in implementations:
+            series['{0}-{1}'.format(name, image)] = tuple(x / median for x in measured[name])
+            series[name].extend(series['{0}-{1}'.format(name, image)])
+
+    return series, sizes
+
+def compression_collect_data(images, paths, implementations, reference, trials):
+    return tuple({key: (series, sizes[key] if key in sizes else None)
+            for key, series in series.items()}
+        for series, sizes in (collect_data('encode', images, paths, implementations, reference, trials,
+            level = level)
+        for level in range(10)))
 
 def compression_save_data(series):
     return ''.join('{0}:{1}:{2}{3}\n'.format(
@@ -120,23 +126,30 @@ def compression_save_data(series):
         for level, series in enumerate(series)
         for name, (series, size) in series.items())
 
+def rename(name):
+    # data saved before the implementation registry existed called libpng `baseline`
+    return 'libpng' + name[len('baseline'):] if name.startswith('baseline') else name
+
 def compression_load_data(string):
-    combined = {(int(level), name): (tuple(map(float, series.split())), int(tail[0]) if tail else None)
+    combined = {(int(level), rename(name)): (tuple(map(float, series.split())), int(tail[0]) if tail else None)
         for level, name, series, * tail in ((level, name, * value.split(','))
         for level, name, value in (tuple(line.split(':'))
         for line in string.split('\n') if line))}
     return tuple({name: series for (level, name), series in combined.items() if level == i}
         for i in range(10))
 
-def compression_benchmark(trials, images, paths, cache_destination, cache_source):
-    prefix      = 'Benchmarks/Compression'
-    suffix      = 'compression-benchmark'
+def per_image(series, images, times = lambda series: series):
+    # median relative run time of swift png for each test image
+    return {image: median(times(series['swift-{0}'.format(image)]))
+        for image in images if 'swift-{0}'.format(image) in series}
 
-    baseline, swift = build_benchmarks(prefix, suffix)
-    colors          = assign_colors(images)
+def compression_benchmark(trials, images, paths, baselines, cache_destination, cache_source):
+    implementations = select_implementations('encode', baselines)
+    reference, *_   = baselines
 
     if cache_source is None:
-        series      = compression_collect_data(images, paths, baseline, swift, trials)
+        build_benchmarks('encode', implementations)
+        series      = compression_collect_data(images, paths, implementations, reference, trials)
         if cache_destination is not None:
             with open(cache_destination, 'w') as file:
                 file.write(compression_save_data(series))
@@ -150,16 +163,22 @@ def compression_benchmark(trials, images, paths, cache_destination, cache_source
                 cache_source, shortest, trials))
             sys.exit(-1)
 
-    # associates file sizes for swift benchmarks with corresponding libpng benchmarks
+        # only plot the implementations that were measured when the data was saved
+        implementations = {name: implementation for name, implementation in implementations.items()
+            if name in series[0]}
+
+    colors      = assign_colors(images, implementations)
+    legend      = assign_legend(implementations)
+
+    # associates file sizes for swift benchmarks with corresponding reference benchmarks
     def compare_filesizes(series):
-        baseline    = {'-'.join(name.split('-')[1:]): size
-            for name, (series, size) in series.items() if size is not None and name.startswith('baseline')}
-        swift       = {'-'.join(name.split('-')[1:]): size
-            for name, (series, size) in series.items() if size is not None and name.startswith('swift')}
-        return {common: swift[common] / baseline[common] for common in swift.keys() | baseline.keys()}
+        return {image: series['swift-{0}'.format(image)][1] / series['{0}-{1}'.format(reference, image)][1]
+            for image in images}
 
+    # plots are returned as arguments to their plotting functions, so that they can be
+    # rendered later, and only if their data changed
     return tuple((
-            densityplot.plot({name: series for name, (series, size) in series.items()},
+            dict(series     = {name: series for name, (series, size) in series.items()},
                 range_x     = (0, 5.0),
                 range_y     = (0, 0.6),
                 major       = (0.5, 0.1),
@@ -169,17 +188,17 @@ def compression_benchmark(trials, images, paths, cache_destination, cache_source
                 label_x     = 'relative run time',
                 label_y     = 'density',
                 smoothing   = 0.6,
-                legend      = (('baseline', 'libpng'), ('swift', 'swift png')),
+                legend      = legend,
                 colors      = tuple(reversed(colors))),
 
-            differentialplot.plot(size_ratios,
+            dict(ratios     = size_ratios,
                 range_x     = (0, 1.8),
                 major       = 0.2,
                 minor       = 4,
                 title       = 'relative file size (level {0})'.format(level),
-                subtitle    = 'swift png size / libpng size ',
+                subtitle    = 'swift png size / {0} size '.format(adapters.registry[reference].label),
                 colors      = {
-                    'color_fill_worse':     '#888888ff',
+                    'color_fill_worse':     adapters.registry[reference].colors[0],
                     'color_fill_better':    '#ff694eff',
                     'color_worse':          '#666666ff',
                     'color_better':         '#ff694eff',
@@ -187,75 +206,28 @@ def compression_benchmark(trials, images, paths, cache_destination, cache_source
 
             median(series['swift'][0]),
             median(series['swift-rgb8-color-photographic'][0]) if 'swift-rgb8-color-photographic' in series else None,
-            size_ratios['rgb8-color-photographic'])
+            size_ratios['rgb8-color-photographic'],
+            per_image(series, images, lambda series: series[0]),
+            size_ratios)
         for level, series, size_ratios in ((level, series, compare_filesizes(series))
         for level, series in enumerate(series)))
 
-
-def decompression_collect_data(images, paths, baseline, swift, trials):
-    series = {'baseline': [], 'swift': []}
-    for image, path in zip(images, paths):
-        name_baseline           = 'baseline-{0}'.format(image)
-        name_swift              = 'swift-{0}'.format(image)
-
-        remaining       = trials
-        series_baseline = []
-        series_swift    = []
-        while remaining > 0:
-            count               = min(remaining, 10)
-            baseline_invocation = baseline, path, str(count)
-            swift_invocation    = swift,    path, str(count)
-
-            print(' '.join(baseline_invocation))
-            baseline_result     = subprocess.run(baseline_invocation, capture_output = True)
-
-            if baseline_result.returncode == 0:
-                string = baseline_result.stdout.decode('utf-8')
-                print(string, end = '')
-                series_baseline.extend(map(float, string.split()))
-            else:
-                print(baseline_result.stderr.decode('utf-8'), end = '')
-
-            print(' '.join(swift_invocation))
-            swift_result        = subprocess.run(swift_invocation, capture_output = True)
-
-            if swift_result.returncode == 0:
-                string = swift_result.stdout.decode('utf-8')
-                print(string, end = '')
-                series_swift.extend(map(float, string.split()))
-            else:
-                print(swift_result.stderr.decode('utf-8'), end = '')
-
-            remaining -= 10
-
-        # normalize to median of the baseline series
-        median                  = sorted(series_baseline)[len(series_baseline) // 2]
-        series[name_baseline]   = tuple(x / median for x in series_baseline)
-        series[name_swift]      = tuple(x / median for x in series_swift)
-
-        series['baseline'].extend(series[name_baseline])
-        series['swift'].extend(   series[name_swift])
-
-    return series
-
 def decompression_save_data(series):
     return ''.join('{0}:{1}\n'.format(name, ' '.join(map(str,series)))
         for name, series in series.items())
 
 def decompression_load_data(string):
-    return {name: tuple(map(float, series.split()))
+    return {rename(name): tuple(map(float, series.split()))
         for name, series in (tuple(line.split(':'))
         for line in string.split('\n') if line)}
 
-def decompression_benchmark(trials, images, paths, cache_destination, cache_source):
-    prefix      = 'Benchmarks/Decompression'
-    suffix      = 'decompression-benchmark'
-
-    baseline, swift = build_benchmarks(prefix, suffix)
-    colors          = assign_colors(images)
+def decompression_benchmark(trials, images, paths, baselines, cache_destination, cache_source):
+    implementations = select_implementations('decode', baselines)
+    reference, *_   = baselines
 
     if cache_source is None:
-        series      = decompression_collect_data(images, paths, baseline, swift, trials)
+        build_benchmarks('decode', implementations)
+        series, _   = collect_data('decode', images, paths, implementations, reference, trials)
         if cache_destination is not None:
             with open(cache_destination, 'w') as file:
                 file.write(decompression_save_data(series))
@@ -263,13 +235,18 @@ def decompression_benchmark(trials, images, paths, cache_destination, cache_sour
         with open(cache_source, 'r') as file:
             series  = decompression_load_data(file.read())
 
+        # only plot the implementations that were measured when the data was saved
+        implementations = {name: implementation for name, implementation in implementations.items()
+            if name in series}
+
     shortest    = min(map(len, series.values()))
     if trials  != shortest:
         print('file \'{0}\' has {1} measurements per test case (expected {2})'.format(
             cache_source, shortest, trials))
         sys.exit(-1)
 
-    plot    = densityplot.plot(series,
+    colors  = assign_colors(images, implementations)
+    plot    = dict(series = series,
         range_x     = (0, 2.0),
         range_y     = (0, 0.6),
         major       = (0.2, 0.1),
@@ -279,36 +256,37 @@ def decompression_benchmark(trials, images, paths, cache_destination, cache_sour
         label_x     = 'relative run time',
         label_y     = 'density',
         smoothing   = 0.6,
-        legend      = (('baseline', 'libpng'), ('swift', 'swift png')),
+        legend      = assign_legend(implementations),
         colors      = tuple(reversed(colors)))
 
     median_ratio    = median(series['swift'])
     rgb8_ratio      = median(series['swift-rgb8-color-photographic']) if 'swift-rgb8-color-photographic' in series else None
 
-    return plot, median_ratio, rgb8_ratio
+    return plot, median_ratio, rgb8_ratio, per_image(series, images)
 
-def benchmark(trials, images, save, load, prefix):
+def benchmark(trials, images, save, load, prefix, pipeline, baselines = ('libpng',)):
     paths = tuple('Tests/Baselines/{0}.png'.format(image) for image in images)
+    check_reference(baselines)
 
-    plot, median_ratio, rgb8_ratio  = decompression_benchmark(trials[0], images, paths,
+    plot, median_ratio, rgb8_ratio, decoding = decompression_benchmark(trials[0], images, paths, baselines,
         cache_destination   = '{0}/decompression.data'.format(prefix) if save else None,
         cache_source        = '{0}/decompression.data'.format(prefix) if load else None)
-    levels                          =   compression_benchmark(trials[1], images, paths,
+    levels                          =   compression_benchmark(trials[1], images, paths, baselines,
         cache_destination   = '{0}/compression.data'.format(prefix) if save else None,
         cache_source        = '{0}/compression.data'.format(prefix) if load else None)
 
     fields = {
         'images'        : len(images),
         'image_table'   : generate_test_image_table(images, paths),
+        'baselines'     : ', '.join('*{0}*'.format(adapters.registry[name].label) for name in baselines),
     }
 
     fields['median_decompression_speed']    = percent(median_ratio)
     fields['rgb8_decompression_speed']      = percent(rgb8_ratio)
     fields['plot_decompression_speed']      = '{0}/decompression-speed.svg'.format(prefix)
-    with open(fields['plot_decompression_speed'], 'w') as file:
-        file.write(plot)
+    pipeline.plot(fields['plot_decompression_speed'], densityplot.plot, ** plot)
 
-    for i, (plot_speed, plot_size, median_ratio, rgb8_ratio_speed, rgb8_ratio_size) in enumerate(levels):
+    for i, (plot_speed, plot_size, median_ratio, rgb8_ratio_speed, rgb8_ratio_size, _, _) in enumerate(levels):
         plot_compression_speed  = '{0}/compression-speed@{1}.svg'.format(prefix, i)
         plot_compression_size   = '{0}/compression-size@{1}.svg'.format(prefix, i)
         fields['median_compression_speed@{0}'.format(i)]    = percent(median_ratio)
@@ -316,9 +294,15 @@ def benchmark(trials, images, save, load, prefix):
         fields['rgb8_compression_ratio@{0}'.format(i)]      = percent(rgb8_ratio_size)
         fields['plot_compression_speed@{0}'.format(i)]      = plot_compression_speed
         fields['plot_compression_ratio@{0}'.format(i)]      = plot_compression_size
-        with open(plot_compression_speed, 'w') as file:
-            file.write(plot_speed)
-        with open(plot_compression_size, 'w') as file:
-            file.write(plot_size)
+        pipeline.plot(plot_compression_speed, densityplot.plot, ** plot_speed)
+        pipeline.plot(plot_compression_size, differentialplot.plot, ** plot_size)
+
+    fields.update(benchmark_breakdown.benchmark(images,
+        decoding    = decoding,
+        encoding    = tuple(encoding for * _, encoding, sizes in levels),
+        sizes       = tuple(sizes    for * _, encoding, sizes in levels),
+        prefix      = prefix,
+        pipeline    = pipeline,
+        reference   = baselines[0]))
 
     return fields
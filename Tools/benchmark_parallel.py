@@ -0,0 +1,107 @@
+import os, sys, math, subprocess
+
+from benchmark_latest import median, percent
+
+def build(product):
+    invocation  = 'swift', 'build', '-c', 'release', '--product', product
+    print(' '.join(invocation))
+    if subprocess.run(invocation).returncode != 0:
+        sys.exit(-1)
+    return '.build/release/{0}'.format(product)
+
+def thread_counts(cores):
+    # powers of two, up to the number of available cores. the encoder always measures
+    # wall-clock time when it is given a thread count, so `1` is the serial baseline
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    return tuple(counts)
+
+def collect_series(invocation, trials):
+    remaining   = trials
+    series      = []
+    size        = None
+    while remaining > 0:
+        command = tuple(str(min(remaining, 10)) if argument is None else argument
+            for argument in invocation)
+
+        print(' '.join(command))
+        result  = subprocess.run(command, capture_output = True)
+        if result.returncode == 0:
+            string = result.stdout.decode('utf-8')
+            print(string, end = '')
+            times, size = string.split(',')
+            series.extend(map(float, times.split()))
+        else:
+            print(result.stderr.decode('utf-8'), end = '')
+
+        remaining -= 10
+    return tuple(series), int(size)
+
+def collect_data(trials, images, paths, level, counts):
+    encoder = build('compression-benchmark')
+    return {(threads, image): collect_series((encoder, str(level), path, None, '-j', str(threads)),
+            trials)
+        for image, path in zip(images, paths)
+        for threads in counts}
+
+def save_data(series):
+    return ''.join('{0}:{1}:{2}, {3}\n'.format(threads, image, ' '.join(map(str, series)), size)
+        for (threads, image), (series, size) in series.items())
+
+def load_data(string):
+    return {(int(threads), image): (tuple(map(float, series.split())), int(size))
+        for threads, image, series, size in ((threads, image, * value.split(','))
+        for threads, image, value in (tuple(line.split(':'))
+        for line in string.split('\n') if line))}
+
+def geometric_mean(values):
+    return math.exp(sum(map(math.log, values)) / len(values))
+
+def scaling(series, images, counts):
+    # speedup and size cost of each thread count, relative to the serial encoder, for
+    # each image, aggregated across the corpus with a geometric mean
+    def relative(threads):
+        return (
+            geometric_mean(tuple(median(series[1, image][0]) / median(series[threads, image][0])
+                for image in images)),
+            geometric_mean(tuple(series[threads, image][1] / series[1, image][1]
+                for image in images)))
+
+    return {threads: relative(threads) for threads in counts}
+
+def generate_table(scaling):
+    header      = '| Threads | Speedup | Efficiency | Relative file size |'
+    separator   = '| ------- | ------- | ---------- | ------------------ |'
+    rows        = ('| {0} | {1:.2f}x | {2} | {3} |'.format(threads,
+            speedup,
+            percent(speedup / threads),
+            percent(size))
+        for threads, (speedup, size) in scaling.items())
+
+    return '\n'.join((header, separator, * rows ))
+
+def benchmark(trials, images, save, load, prefix, level = 9, cores = None):
+    paths = tuple('Tests/Baselines/{0}.png'.format(image) for image in images)
+    cache = '{0}/parallel.data'.format(prefix)
+
+    if load:
+        with open(cache, 'r') as file:
+            series  = load_data(file.read())
+        counts      = tuple(sorted({threads for threads, image in series}))
+    else:
+        counts      = thread_counts(cores or os.cpu_count())
+        series      = collect_data(trials, images, paths, level, counts)
+        if save:
+            with open(cache, 'w') as file:
+                file.write(save_data(series))
+
+    results = scaling(series, images, counts)
+    speedup, size = results[counts[-1]]
+    return {
+        'parallel_level'    : level,
+        'parallel_threads'  : counts[-1],
+        'parallel_table'    : generate_table(results),
+        'parallel_speedup'  : '{0:.2f}x'.format(speedup),
+        'parallel_size_cost': percent(size - 1),
+    }
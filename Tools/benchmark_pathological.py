@@ -0,0 +1,187 @@
+import os, sys, math, random, struct, subprocess, zlib
+
+from benchmark_latest import median
+
+signature = b'\x89PNG\r\n\x1a\n'
+
+def chunk(type, data):
+    return struct.pack('>I', len(data)) + type + data + struct.pack('>I', zlib.crc32(type + data))
+
+def encode(width, height, pixels, channels = 1, idat = 1 << 15, flush = None):
+    # all scanlines use filter type 0, so that the pattern reaches the deflate stream as-is
+    pitch       = width * channels
+    filtered    = b''.join(b'\x00' + pixels[y * pitch : (y + 1) * pitch] for y in range(height))
+
+    if flush is None:
+        stream  = zlib.compress(filtered, 9)
+    else:
+        # emit a separate deflate block every `flush` bytes
+        compressor  = zlib.compressobj(9)
+        stream      = b''.join(compressor.compress(filtered[i : i + flush]) + compressor.flush(zlib.Z_FULL_FLUSH)
+            for i in range(0, len(filtered), flush)) + compressor.flush()
+
+    color   = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    header  = struct.pack('>IIBBBBB', width, height, 8, color, 0, 0, 0)
+    return b''.join((signature, chunk(b'IHDR', header),
+        * (chunk(b'IDAT', stream[i : i + idat]) for i in range(0, len(stream), idat)),
+        chunk(b'IEND', b'')))
+
+def repeat(pattern, count):
+    return (pattern * (count // len(pattern) + 1))[:count]
+
+# every generator returns the encoded png, given the number of raw pixel bytes
+def runs(count):
+    # one long run of identical bytes
+    return encode(1024, count // 1024, bytes(count))
+
+def collisions(count):
+    # every fifth position starts the same 4-byte hash key, followed by a random byte. a
+    # candidate only extends past 4 bytes when that byte happens to repeat, about 1 time
+    # in 256, so the match search walks long hash chains of mostly 4-byte matches
+    generator   = random.Random(count)
+    pixels      = b''.join(b'\xa5\x5a\xa5\x5a' + bytes((generator.randrange(256),))
+        for _ in range(count // 5))
+    return encode(1024, count // 1024, repeat(pixels, count))
+
+def periodic(count):
+    # a short period that matches everywhere, at many different distances
+    return encode(1024, count // 1024, repeat(b'\x01\x02\x03\x04\x05\x06\x07', count))
+
+def distant(count):
+    # random data that only matches itself at (nearly) the maximum window distance. zlib
+    # never matches further back than 32768 - 262 bytes, and every 1024-byte row gains a
+    # filter byte in the deflate stream, so the repeat distance there is the block size
+    # plus at most 32 filter bytes
+    generator   = random.Random(count)
+    block       = bytes(generator.randrange(256) for _ in range((32768 - 262 - 8) * 1024 // 1025))
+    png         = encode(1024, count // 1024, repeat(block, count))
+    assert len(png) < count // 2, 'the repeated block in `distant` is out of reach of the deflate window'
+    return png
+
+def chunks(count):
+    # a normal image, cut into one-byte IDAT chunks
+    generator   = random.Random(count)
+    pixels      = bytes(generator.randrange(16) for _ in range(count))
+    return encode(1024, count // 1024, pixels, idat = 1)
+
+def blocks(count):
+    # a normal image, compressed into a separate deflate block every 16 bytes
+    generator   = random.Random(count)
+    pixels      = bytes(generator.randrange(16) for _ in range(count))
+    return encode(1024, count // 1024, pixels, flush = 16)
+
+def wide(count):
+    # a single rgba8 scanline
+    generator   = random.Random(count)
+    pixels      = bytes(generator.randrange(16) for _ in range(count - count % 4))
+    return encode(count // 4, 1, pixels, channels = 4)
+
+generators = {
+    'runs':         runs,
+    'collisions':   collisions,
+    'periodic':     periodic,
+    'distant':      distant,
+    'chunks':       chunks,
+    'blocks':       blocks,
+    'wide':         wide,
+}
+
+def generate(cases, exponents, directory):
+    os.makedirs(directory, exist_ok = True)
+    paths = {}
+    for case in cases:
+        for exponent in exponents:
+            path = '{0}/{1}@{2}.png'.format(directory, case, exponent)
+            if not os.path.exists(path):
+                with open(path, 'wb') as file:
+                    file.write(generators[case](1 << exponent))
+            paths[case, exponent] = path
+    return paths
+
+def raw_size(path):
+    # number of unfiltered pixel bytes, read from the IHDR chunk
+    with open(path, 'rb') as file:
+        header = file.read(29)[16:]
+    width, height, depth, color = struct.unpack('>IIBB', header[:10])
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color]
+    return width * height * ((channels * depth + 7) // 8)
+
+def build(product):
+    invocation  = 'swift', 'build', '-c', 'release', '--product', product
+    print(' '.join(invocation))
+    if subprocess.run(invocation).returncode != 0:
+        sys.exit(-1)
+    return '.build/release/{0}'.format(product)
+
+def measure(invocation, trials):
+    print(' '.join(invocation + (str(trials),)))
+    result = subprocess.run(invocation + (str(trials),), capture_output = True)
+    if result.returncode != 0:
+        print(result.stderr.decode('utf-8'), end = '')
+        sys.exit(-1)
+    string = result.stdout.decode('utf-8')
+    print(string, end = '')
+    return median(tuple(map(float, string.split(',')[0].split())))
+
+def operations(levels, decoder, encoder):
+    return (('decode', lambda path: (decoder, path)),
+        * (('encode@{0}'.format(level), lambda path, level = level: (encoder, str(level), path))
+        for level in levels))
+
+def slope(points):
+    # least-squares slope of log(time) against log(size); 1 means linear scaling
+    xs      = tuple(math.log(size) for size, time in points)
+    ys      = tuple(math.log(max(time, 1e-3)) for size, time in points)
+    mx, my  = sum(xs) / len(xs), sum(ys) / len(ys)
+    d       = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / d if d else 1
+
+def benchmark(cases, exponents, levels, trials, bound, tolerance, corpus, directory):
+    decoder     = build('decompression-benchmark')
+    encoder     = build('compression-benchmark')
+    paths       = generate(cases, exponents, directory)
+    tasks       = operations(levels, decoder, encoder)
+
+    # reference cost per byte, from the normal corpus
+    reference = {name: median(tuple(measure(invocation(path), trials) / raw_size(path)
+            for path in corpus))
+        for name, invocation in tasks}
+
+    results     = {}
+    failures    = []
+    for case in cases:
+        for name, invocation in tasks:
+            points  = tuple((raw_size(paths[case, exponent]),
+                    measure(invocation(paths[case, exponent]), trials))
+                for exponent in exponents)
+            ratio   = max(time / size for size, time in points) / reference[name]
+            k       = slope(points) if len(points) > 1 else 1
+            results[case, name] = ratio, k
+
+            if ratio > bound:
+                failures.append('`{0}` ({1}) costs {2:.2f}x as much time per byte as the normal corpus'.format(
+                    case, name, ratio))
+            if k > 1 + tolerance:
+                failures.append('`{0}` ({1}) scales superlinearly, with exponent {2:.2f}'.format(
+                    case, name, k))
+
+    return report(cases, tasks, results, failures, bound, tolerance), not failures
+
+def report(cases, tasks, results, failures, bound, tolerance):
+    names   = tuple(name for name, invocation in tasks)
+    lines   = [
+        'worst-case time per byte relative to the normal corpus (bound: {0}x), and scaling exponent (bound: {1:.2f}):'.format(
+            bound, 1 + tolerance),
+        '',
+        '| Case | {0} |'.format(' | '.join('`{0}`'.format(name) for name in names)),
+        '| ---- | {0} |'.format(' | '.join('-' * (len(name) + 2) for name in names)),
+    ]
+    lines.extend('| `{0}` | {1} |'.format(case,
+            ' | '.join('{0:.2f}x, n^{1:.2f}'.format( * results[case, name]) for name in names))
+        for case in cases)
+
+    if failures:
+        lines.extend(('', 'failures:', ''))
+        lines.extend('-   {0}'.format(failure) for failure in failures)
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,96 @@
+import os, re, sys, json, string, hashlib, concurrent.futures
+
+import svg
+
+# renders the plots and the readme for a benchmark report. every plot remembers a digest
+# of the data and the plotting code it was rendered from, so that plots whose inputs have
+# not changed since the last run are not rendered again
+class pipeline:
+    def __init__(self, prefix):
+        self.manifest   = '{0}/plots.data'.format(prefix)
+        self.plots      = {}
+        try:
+            with open(self.manifest, 'r') as file:
+                self.digests = load_data(file.read())
+        except FileNotFoundError:
+            self.digests = {}
+
+    def plot(self, output, function, ** arguments):
+        # `function` must be a module-level function, so that it can be sent to a worker
+        # process. it receives `arguments`, and returns the contents of the svg file
+        self.plots[output] = function, arguments
+
+    def outdated(self):
+        digests = {output: digest(function, arguments)
+            for output, (function, arguments) in self.plots.items()}
+        return {output: digests[output] for output in self.plots
+            if self.digests.get(output) != digests[output] or not os.path.exists(output)}
+
+    def render(self, jobs = None):
+        outdated = self.outdated()
+        print('rendering {0} of {1} plots'.format(len(outdated), len(self.plots)))
+        if outdated:
+            with concurrent.futures.ProcessPoolExecutor(max_workers = jobs) as executor:
+                for output in executor.map(render, ((output, * self.plots[output])
+                        for output in outdated)):
+                    print(output)
+                    self.digests[output] = outdated[output]
+
+            with open(self.manifest, 'w') as file:
+                file.write(save_data(self.digests))
+
+    def write(self, output, template, fields):
+        # the readme depends on every template field, so compare the result instead
+        contents = fill(template, fields)
+        try:
+            with open(output, 'r') as file:
+                if file.read() == contents:
+                    return
+        except FileNotFoundError:
+            pass
+        with open(output, 'w') as file:
+            file.write(contents)
+
+def fill(template, fields):
+    # every `###` section of the template is optional, and runs until the next `##` or
+    # `###` heading. sections that refer to fields that no benchmark produced are left out
+    sections = []
+    for section in re.split(r'(?m)^(?=###? )', template):
+        missing = sorted({name for _, name, _, _ in string.Formatter().parse(section)
+            if name is not None and name not in fields})
+        if missing and section.startswith('### '):
+            print('omitting section \'{0}\' (missing {1})'.format(section.split('\n', 1)[0][4:],
+                ', '.join(missing)))
+            continue
+        sections.append(section)
+    return ''.join(sections).format( ** fields )
+
+def source(module):
+    with open(sys.modules[module].__file__, 'rb') as file:
+        return file.read()
+
+def digest(function, arguments):
+    checksum = hashlib.sha256()
+    # all of the plots are drawn with the `svg` module, so it counts as part of the
+    # plotting code
+    checksum.update(source(function.__module__))
+    checksum.update(source(svg.__name__))
+    checksum.update(function.__name__.encode('utf-8'))
+    # freshly-collected series are lists, while reloaded series are tuples
+    checksum.update(json.dumps(arguments, sort_keys = True).encode('utf-8'))
+    return checksum.hexdigest()
+
+def render(job):
+    output, function, arguments = job
+    with open(output, 'w') as file:
+        file.write(function( ** arguments ))
+    return output
+
+def save_data(digests):
+    return ''.join('{0}:{1}\n'.format(output, digest)
+        for output, digest in sorted(digests.items()))
+
+def load_data(string):
+    return {output: digest
+        for output, _, digest in (line.rpartition(':')
+        for line in string.split('\n') if line)}
@@ -0,0 +1,103 @@
+import sys, subprocess
+
+from benchmark_latest import median
+
+# the whole-image encoder comes first, it is the reference for the strip encoder
+modes = ('image', 'strips')
+
+def build(product):
+    invocation  = 'swift', 'build', '-c', 'release', '--product', product
+    print(' '.join(invocation))
+    if subprocess.run(invocation).returncode != 0:
+        sys.exit(-1)
+    return '.build/release/{0}'.format(product)
+
+def collect_series(invocation, trials):
+    # peak memory usage is measured per process, so every trial runs in a process of
+    # its own (with one trial each), and we keep the largest peak
+    series      = []
+    size        = None
+    peak        = 0
+    for _ in range(trials):
+        print(' '.join(invocation))
+        result  = subprocess.run(invocation, capture_output = True)
+        if result.returncode != 0:
+            print(result.stderr.decode('utf-8'), end = '')
+            sys.exit(-1)
+
+        string = result.stdout.decode('utf-8')
+        print(string, end = '')
+        times, size, rss = string.split(',')
+        series.extend(map(float, times.split()))
+        peak = max(peak, int(rss))
+
+    return tuple(series), int(size), peak
+
+def collect_data(trials, path, level, heights, strip):
+    encoder = build('compression-benchmark')
+    return {(mode, tiles): collect_series((encoder, str(level), path, '1', '-v', str(tiles))
+            + (('-s', str(strip)) if mode == 'strips' else ()),
+            trials)
+        for tiles in heights
+        for mode in modes}
+
+def save_data(series, strip):
+    # the first line records the strip height the strip encoder was measured with
+    return 'strip:{0}\n'.format(strip) + ''.join('{0}:{1}:{2}, {3}, {4}\n'.format(mode, tiles,
+            ' '.join(map(str, series)),
+            size,
+            peak)
+        for (mode, tiles), (series, size, peak) in series.items())
+
+def load_data(string):
+    header, _, body = string.partition('\n')
+    _, strip        = header.split(':')
+    return {(mode, int(tiles)): (tuple(map(float, series.split())), int(size), int(peak))
+        for mode, tiles, series, size, peak in ((mode, tiles, * value.split(','))
+        for mode, tiles, value in (tuple(line.split(':'))
+        for line in body.split('\n') if line))}, int(strip)
+
+def mib(kib):
+    return '{0:.1f} MiB'.format(kib / 1024)
+
+def generate_table(series, heights):
+    header      = '| Height | Whole image | Peak memory | Strips | Peak memory | Relative file size |'
+    separator   = '| ------ | ----------- | ----------- | ------ | ----------- | ------------------ |'
+    rows        = ('| {0}x | {1:.1f} ms | {2} | {3:.1f} ms | {4} | {5:.4f} |'.format(tiles,
+            median(series['image', tiles][0]),
+            mib(series['image', tiles][2]),
+            median(series['strips', tiles][0]),
+            mib(series['strips', tiles][2]),
+            series['strips', tiles][1] / series['image', tiles][1])
+        for tiles in heights)
+
+    return '\n'.join((header, separator, * rows ))
+
+def benchmark(trials, save, load, prefix, image = 'rgb8-color-photographic', level = 9,
+    heights = (1, 2, 4, 8, 16),
+    strip = 16):
+    path    = 'Tests/Baselines/{0}.png'.format(image)
+    cache   = '{0}/streaming.data'.format(prefix)
+
+    if load:
+        with open(cache, 'r') as file:
+            series, strip   = load_data(file.read())
+        heights     = tuple(sorted({tiles for mode, tiles in series}))
+    else:
+        series      = collect_data(trials, path, level, heights, strip)
+        if save:
+            with open(cache, 'w') as file:
+                file.write(save_data(series, strip))
+
+    def growth(mode):
+        return series[mode, heights[-1]][2] / series[mode, heights[0]][2]
+
+    return {
+        'streaming_image'           : image,
+        'streaming_level'           : level,
+        'streaming_strip'           : strip,
+        'streaming_height'          : heights[-1],
+        'streaming_table'           : generate_table(series, heights),
+        'streaming_image_growth'    : '{0:.2f}x'.format(growth('image')),
+        'streaming_strips_growth'   : '{0:.2f}x'.format(growth('strips')),
+    }
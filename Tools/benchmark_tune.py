@@ -0,0 +1,181 @@
+import os, math, hashlib, subprocess
+
+from toolchain import compression_benchmark
+
+# mirrors `LZ77.DeflatorSearch.init(level:)`
+levels = (
+    'greedy-1-6',
+    'greedy-2-8',
+    'greedy-4-10',
+    'greedy-40-24',
+    'lazy-20-32',
+    'lazy-40-54',
+    'lazy-64-80',
+    'lazy-100-160',
+    'full-14-20-1',
+    'full-20-32-2',
+    'full-30-50-3',
+    'full-60-80-4',
+    'full-100-133-5',
+    'full-max-258-6',
+)
+
+def median(series):
+    return sorted(series)[len(series) // 2]
+
+def geometric_mean(values):
+    return math.exp(sum(map(math.log, values)) / len(values))
+
+def specification(strategy, attempts, goal, iterations = None):
+    if strategy == 'full':
+        return '{0}-{1}-{2}-{3}'.format(strategy, attempts, goal, iterations)
+    else:
+        return '{0}-{1}-{2}'.format(strategy, attempts, goal)
+
+def candidates(strategies, attempts, goals, iterations):
+    grid = []
+    for strategy in strategies:
+        for a in attempts:
+            for g in goals:
+                if strategy == 'full':
+                    grid.extend(specification(strategy, a, g, i) for i in iterations)
+                else:
+                    grid.append(specification(strategy, a, g))
+    # always evaluate the predefined levels, so we can tell if they are on the frontier
+    return tuple(dict.fromkeys(levels + tuple(grid)))
+
+def build():
+    # identifies the library source the measurements were taken with: the current
+    # commit, plus a digest of any uncommitted changes to the sources
+    commit  = subprocess.run(('git', 'rev-parse', 'HEAD'), capture_output = True).stdout.decode('utf-8').rstrip()
+    diff    = subprocess.run(('git', 'diff', 'HEAD', '--', 'Sources', 'Package.swift'), capture_output = True).stdout
+    return '{0}+{1}'.format(commit, hashlib.sha1(diff).hexdigest()[:12]) if diff else commit
+
+def save_header(build):
+    return '# build {0}\n'.format(build)
+
+def save_entry(search, image, series, size):
+    return '{0}:{1}:{2}, {3}\n'.format(search, image, ' '.join(map(str, series)), size)
+
+def load_data(string, build):
+    # later entries supersede earlier ones, so an interrupted run can simply append.
+    # measurements taken with a different build of the library are discarded
+    header, _, body = string.partition('\n')
+    if header != save_header(build).rstrip('\n'):
+        return None
+    # images are paths, which may contain colons
+    return {(search, image): (tuple(map(float, series.split())), int(size))
+        for search, image, series, size in ((search, image, * value.split(','))
+        for search, (image, _, value) in ((search, rest.rpartition(':'))
+        for search, rest in (tuple(line.split(':', 1))
+        for line in body.split('\n') if line)))}
+
+def collect_data(searches, images, paths, trials, cache):
+    current = build()
+    try:
+        with open(cache, 'r') as file:
+            measurements = load_data(file.read(), current)
+    except FileNotFoundError:
+        measurements = None
+
+    if measurements is None:
+        print('starting new cache \'{0}\' for build \'{1}\''.format(cache, current))
+        measurements = {}
+        with open(cache, 'w') as file:
+            file.write(save_header(current))
+
+    pending = tuple((search, image, path)
+        for search in searches
+        for image, path in zip(images, paths)
+        if len(measurements.get((search, image), ((), 0))[0]) < trials)
+
+    print('{0} of {1} measurements cached in \'{2}\''.format(
+        len(searches) * len(images) - len(pending), len(searches) * len(images), cache))
+
+    if pending:
+        swiftpng = compression_benchmark('swift', '.build')
+        for search, image, path in pending:
+            result  = swiftpng.collect_data(path, level = search, trials = trials)
+            measurements[search, image] = tuple(result['series']), result['size']
+            # append immediately, so that tuning can resume if it is interrupted
+            with open(cache, 'a') as file:
+                file.write(save_entry(search, image, * measurements[search, image]))
+
+    return {search: {image: measurements[search, image] for image in images}
+        for search in searches}
+
+def summarize(measurements, reference):
+    # run times and file sizes are normalized to the reference search parameters for
+    # each image, and then aggregated across the corpus with a geometric mean
+    baseline = measurements[reference]
+    return {search: (
+            geometric_mean(tuple(median(series) / median(baseline[image][0])
+                for image, (series, size) in images.items())),
+            geometric_mean(tuple(size / baseline[image][1]
+                for image, (series, size) in images.items())))
+        for search, images in measurements.items()}
+
+def pareto(points):
+    frontier    = []
+    smallest    = math.inf
+    # sweep in order of increasing run time; a point is optimal if it is smaller than
+    # every faster point
+    for search, (time, size) in sorted(points.items(), key = lambda item: (item[1], item[0])):
+        if size < smallest:
+            smallest = size
+            frontier.append(search)
+    return frontier
+
+def dominator(search, points):
+    time, size = points[search]
+    better = tuple(other for other, (t, s) in points.items()
+        if t <= time and s <= size and (t, s) != (time, size))
+    return min(better, key = lambda other: points[other]) if better else None
+
+def equivalent(search, points):
+    # `pareto` keeps only the first (by name) of several points that tie exactly
+    return min(other for other, point in points.items()
+        if point == points[search] and other != search)
+
+def verdict(search, points):
+    other = dominator(search, points)
+    if other is not None:
+        return 'is dominated by `{0}`'.format(other)
+    else:
+        return 'is equivalent to `{0}`'.format(equivalent(search, points))
+
+def report(points, frontier, reference):
+    names   = {search: 'level {0}'.format(level) for level, search in enumerate(levels)}
+    lines   = [
+        'pareto-optimal search parameters (relative to \'{0}\'):'.format(reference),
+        '',
+        '| Search | Relative time | Relative size | Level |',
+        '| ------ | ------------- | ------------- | ----- |',
+    ]
+    lines.extend('| `{0}` | {1:.4f} | {2:.4f} | {3} |'.format(
+            search, * points[search], names.get(search, ''))
+        for search in frontier)
+
+    dominated = tuple((level, search) for level, search in enumerate(levels)
+        if search in points and search not in frontier)
+    if dominated:
+        lines.extend(('', 'predefined levels that are not pareto-optimal:', ''))
+        lines.extend('-   level {0} (`{1}`) {2}'.format(
+                level, search, verdict(search, points))
+            for level, search in dominated)
+
+    return '\n'.join(lines) + '\n'
+
+def tune(paths, trials, strategies, attempts, goals, iterations, cache, reference):
+    # images are keyed by path, since corpus directories may contain files with the same
+    # name, and the same file may be listed more than once
+    paths       = tuple(dict.fromkeys(os.path.relpath(path) for path in paths))
+    images      = paths
+    searches    = candidates(strategies, attempts, goals, iterations)
+    if reference not in searches:
+        searches += (reference,)
+
+    measurements    = collect_data(searches, images, paths, trials, cache)
+    points          = summarize(measurements, reference)
+    frontier        = pareto(points)
+    return report(points, frontier, reference)
@@ -0,0 +1,141 @@
+import math
+import svg
+
+def parse(color):
+    # colors are written as `#rrggbbaa`
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5, 7))
+
+def mix(a, b, t):
+    return '#{0:02x}{1:02x}{2:02x}{3:02x}'.format( * (round(x + (y - x) * t)
+        for x, y in zip(parse(a), parse(b))))
+
+def shade(value, spread, colors):
+    # ratios are compared on a log scale, so that 0.5 is as far from 1 as 2 is. ratios
+    # at or beyond `spread` (or 1 / `spread`) get the full color
+    t = max(-1, min(1, math.log(value) / math.log(spread)))
+    if t < 0:
+        return mix(colors['color_neutral'], colors['color_better'], -t)
+    else:
+        return mix(colors['color_neutral'], colors['color_worse'],   t)
+
+def plot(values, rows, columns,
+    spread      = 2.0,
+    title       = None,
+    subtitle    = None,
+    label_x     = None,
+    colors      = {}):
+    # `values` is a list of rows, each containing one ratio (or `None`) per column. a row
+    # label of `None` draws an empty row, which separates groups of rows
+    cell        = 64, 24
+    margin_x    = 160, 40
+    margin_y    =  40 + 20 * (label_x is not None), 60 + 10 * (subtitle is not None) + 20 * (title is not None)
+
+    display     = (margin_x[0] + cell[0] * len(columns) + margin_x[1],
+                   margin_y[1] + cell[1] * len(rows)    + margin_y[0])
+
+    labels  = []
+    cells   = []
+    for j, column in enumerate(columns):
+        labels.append(svg.text(column,
+            position    = (margin_x[0] + cell[0] * (j + 0.5), margin_y[1] - 10),
+            classes     = ('label-column',)))
+
+    for i, (row, ratios) in enumerate(zip(rows, values)):
+        if row is None:
+            continue
+
+        y = margin_y[1] + cell[1] * i
+        labels.append(svg.text(row,
+            position    = (margin_x[0] - 10, y + cell[1] * 0.5),
+            classes     = ('label-row',)))
+
+        for j, ratio in enumerate(ratios):
+            x = margin_x[0] + cell[0] * j
+            if ratio is None:
+                cells.append(svg.rect((x, y), cell, classes = ('cell', 'missing')))
+                continue
+
+            cells.append(svg.rect((x, y), cell, classes = ('cell',),
+                fill = shade(ratio, spread, colors)))
+            cells.append(svg.text('{0:.2f}'.format(ratio),
+                position    = (x + cell[0] * 0.5, y + cell[1] * 0.5),
+                classes     = ('label-numeric',) + (('unity',) if round(ratio, 2) == 1 else ())))
+
+    # title, subtitle, and axis label
+    center = margin_x[0] + cell[0] * len(columns) * 0.5
+    if type(title) is str:
+        labels.append(svg.text(title,
+            position    = (center, margin_y[1] - 30 - 20 * (subtitle is not None)),
+            classes     = ('title',)))
+    if type(subtitle) is str:
+        labels.append(svg.text(subtitle,
+            position    = (center, margin_y[1] - 30),
+            classes     = ('subtitle',)))
+    if type(label_x) is str:
+        labels.append(svg.text(label_x,
+            position    = (center, display[1] - margin_y[0] + 30),
+            classes     = ('label-axis',)))
+
+    style = '''
+    rect.background
+    {
+        fill:   white;
+    }
+
+    rect.cell
+    {
+        stroke: white;
+        stroke-width: 2px;
+    }
+    rect.cell.missing
+    {
+        fill:   #f5f5f5ff;
+    }
+
+    text
+    {
+        fill: #333333ff;
+        font-family: 'SF Mono';
+    }
+    text.label-numeric
+    {
+        font-size: 12px;
+        text-anchor: middle;
+        dominant-baseline: middle;
+    }
+    text.label-numeric.unity
+    {
+        font-weight: 700;
+    }
+    text.label-row
+    {
+        font-size: 12px;
+        text-anchor: end;
+        dominant-baseline: middle;
+    }
+    text.label-column
+    {
+        font-size: 12px;
+        text-anchor: middle;
+    }
+    text.label-axis
+    {
+        font-size: 12px;
+        text-anchor: middle;
+    }
+
+    text.title, text.subtitle
+    {
+        text-anchor: middle;
+    }
+    text.title
+    {
+        font-size: 20px;
+    }
+    text.subtitle
+    {
+        font-size: 12px;
+    }
+    '''
+
+    return svg.svg(display, style, tuple(cells + labels))
@@ -34,3 +34,9 @@ def text(text, position, classes = ()):
         classes = (classes,)
     return '<text x="{0}" y="{1}" class="{2}">{3}</text>'.format(
         * position , ' '.join(classes), text)
+
+def rect(position, size, classes = (), fill = None):
+    if type(classes) is str:
+        classes = (classes,)
+    return '<rect class="{0}" x="{1}" y="{2}" width="{3}" height="{4}"{5}/>'.format(
+        ' '.join(classes), * position , * size , '' if fill is None else ' fill="{0}"'.format(fill))